@@ -9,8 +9,10 @@ from quad_sim.bases.drone import DroneBase, StateVector, Setpoints
 from quad_sim.bases.integrator import IntegratorBase
 from quad_sim.bases.environment import EnvironmentBase, EnvironmentEffect
 from quad_sim.bases.constraint import StateConstraint, SetpointConstraint, ConstraintBase
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT
+from quad_sim.bases.state import STATE_LAYOUT
 
-from quad_sim.orientation.quaternion import from quad_sim.orientation.quaternion import Quaternion
+from quad_sim.orientation.quaternion import Quaternion
 
 
 
@@ -64,10 +66,7 @@ class DefaultController(ControllerBase):
 # ── Motors ─────────────────────────────────────────────────────────────
 class DefaultMotor(MotorBase):
     def __init__(self, id:str, spin_direction: int, position: BodyFixed, kf: float = 1e-6, km: float = 1e-7, propLength: float = 0.1, nProps: int = 2):
-        super().__init__(id, spin_direction, position)
-
-        self.spin_direction = spin_direction  # +1 for CCW, -1 for CW (NED-z)
-        self.position = position  # Position of the motor in the body-fixed frame
+        super().__init__(id, spin_direction, position)  # stores spin_direction and position
 
         self.rpm = 0.0  # Initialize rpm to zero
         self.theta = 0.0     # Initialize propeller angle to zero
@@ -95,16 +94,18 @@ class DefaultMotor(MotorBase):
     def _generate_propeller_tips(self, propLength:float, nProps:int) -> dict[str, BodyFixed]:
         # Generate propeller tip positions based on motor position and propeller length
         propTips = {}
+        x, y, z = self.position.vec[:, 0]
         for i in range(nProps):
             angle = (2 * np.pi / nProps) * i
-            tip_x = self.position.x + propLength * np.cos(angle)
-            tip_y = self.position.y + propLength * np.sin(angle)
-            tip_z = self.position.z  # Assuming the propeller lies in the plane parallel to the body frame
+            tip_x = x + propLength * np.cos(angle)
+            tip_y = y + propLength * np.sin(angle)
+            tip_z = z  # Assuming the propeller lies in the plane parallel to the body frame
             propTips[f"prop_{i}"] = BodyFixed(tip_x, tip_y, tip_z)
         return propTips
     
-    def locate_propeller_tips(self):
-        return self._generate_propeller_tips()
+    def locate_propeller_tips(self) -> dict[str, BodyFixed]:
+        # The tips are generated once in __init__ (they do not follow theta)
+        return self.propTips
     
     def update_theta(self, dt):
         return self.theta + (self.rpm / 60.0) * 2 * np.pi * dt  # Update theta based on RPM and time step
@@ -143,6 +144,9 @@ class DefaultIntegrator(IntegratorBase):
     
 # ── Environment ─────────────────────────────────────────────────────────────
 class WindEffect(EnvironmentEffect):
+    # The force is fixed in the body frame, so the environment computes it once
+    dependency = "constant"
+
     def __init__(self, dir: BodyFixed = BodyFixed(1.0, 0.0, 0.0), magnitude: float = 0.0):
         if np.linalg.norm(dir.vec) != 1:
             raise ValueError("Wind direction vector must be a unit vector.")
@@ -162,18 +166,26 @@ class DefaultEnvironment(EnvironmentBase):
 
 class GroundPlaneConstraint(SetpointConstraint):
     """Prevents the drone from falling below a minimum altitude (z >= floor)."""
+    vectorized = True
 
     def __init__(self, floor: float = 0.0):
         self.floor = floor
 
     def enforce(self, setpoint: Setpoints) -> StateVector:
-        if setpoint.z < self.floor:
+        if setpoint.z is not None and setpoint.z < self.floor:
             setpoint.z = self.floor
         return setpoint
 
+    def enforce_array(self, setpoints: np.ndarray) -> np.ndarray:
+        z = setpoints[:, SETPOINT_LAYOUT["z"]]
+        below = z < self.floor  # unset (NaN) altitudes compare False
+        z[below] = self.floor
+        return below
+
 
 class MaxVelocityConstraint(StateConstraint):
     """Clamps the linear velocity magnitude to a maximum value."""
+    vectorized = True
 
     def __init__(self, max_speed: float = 30.0):
         self.max_speed = max_speed
@@ -184,6 +196,13 @@ class MaxVelocityConstraint(StateConstraint):
             state.velocity.vec[:] = state.velocity.vec * (self.max_speed / speed)
         return state
 
+    def enforce_array(self, states: np.ndarray) -> np.ndarray:
+        velocity = states[:, STATE_LAYOUT["velocity"]]
+        speed = np.linalg.norm(velocity, axis=1)
+        fast = speed > self.max_speed
+        velocity[fast] *= (self.max_speed / speed[fast])[:, None]
+        return fast
+
 
 class DefaultConstraints(ConstraintBase):
     """Ships with the standard set of constraints."""
@@ -209,14 +228,15 @@ class DefaultDrone(DroneBase):
         for iD in self.controller.switches:
             self.switches[iD] = self.controller.get_switch_value(iD)
 
-        # Placeholder implementation: Return default setpoints based on controller input
-        return Setpoints(
+        # Placeholder implementation: Return default setpoints based on controller input,
+        # written into the reused record instead of building a new Setpoints every tick
+        return self.target.clear().update(
             x=0.0,
             y=0.0,
             z=0.0,
-            roll=0.0,
-            pitch=0.0,
-            yaw=0.0
+            roll_angle=0.0,
+            pitch_angle=0.0,
+            yaw_angle=0.0
         )
     
     
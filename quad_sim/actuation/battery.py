@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+# Open-circuit voltage of one LiPo cell against state of charge
+LIPO_CELL = (
+    (0.0, 3.27), (0.05, 3.50), (0.1, 3.61), (0.2, 3.69), (0.3, 3.73), (0.4, 3.77),
+    (0.5, 3.80), (0.6, 3.84), (0.7, 3.90), (0.8, 3.97), (0.9, 4.07), (1.0, 4.20),
+)
+
+
+class Battery:
+    """
+    Battery packs of N drones: open-circuit voltage from a state-of-charge table, sag over a series
+    resistance and coulomb counting.
+
+    State of charge, current and terminal voltage are (N,) arrays. ``advance`` is called by the motor
+    model with the current it draws, so the voltage seen by the motors lags the load by one step.
+    """
+
+    def __init__(
+        self,
+        n: int = 1,
+        cells: int = 4,
+        capacity: float = 5.0,
+        resistance: float = 0.05,
+        soc: float | Sequence[float] = 1.0,
+        cell_curve: Sequence[tuple[float, float]] = LIPO_CELL,
+    ):
+        """
+        :param n: Number of drones.
+        :type n: int
+        :param cells: Cells in series.
+        :type cells: int
+        :param capacity: Capacity in Ah.
+        :type capacity: float
+        :param resistance: Internal resistance of the pack in ohm.
+        :type resistance: float
+        :param soc: Initial state of charge in [0, 1], per drone.
+        :param cell_curve: (state of charge, volts) points of one cell, sorted by state of charge.
+        """
+        if n < 1 or cells < 1:
+            raise ValueError(f"n and cells must be at least 1, got {n} and {cells}")
+        if capacity <= 0 or resistance < 0:
+            raise ValueError("capacity must be positive and resistance non-negative")
+        curve = np.asarray(cell_curve, dtype=np.float64)
+        if curve.ndim != 2 or curve.shape[1] != 2 or np.any(np.diff(curve[:, 0]) <= 0):
+            raise ValueError("cell_curve must be (soc, volts) pairs with increasing soc")
+
+        self.n = n
+        self.cells = cells
+        self.capacity = capacity
+        self.resistance = resistance
+        self._soc_points = curve[:, 0]
+        self._volt_points = curve[:, 1] * cells
+
+        self.soc = np.zeros(n)
+        self.current = np.zeros(n)
+        self.voltage = np.zeros(n)
+        self.reset(soc)
+
+    def reset(self, soc: float | Sequence[float] = 1.0, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Recharges some packs to ``soc`` with no load.
+        """
+        soc = np.asarray(soc, dtype=np.float64)
+        if np.any((soc < 0) | (soc > 1)):
+            raise ValueError("soc must be within [0, 1]")
+        self.soc[rows] = soc
+        self.current[rows] = 0.0
+        self.voltage[rows] = self.open_circuit(self.soc[rows])
+
+    def open_circuit(self, soc: np.ndarray) -> np.ndarray:
+        """
+        Open-circuit pack voltage at the given states of charge.
+
+        :rtype: np.ndarray
+        """
+        return np.interp(soc, self._soc_points, self._volt_points)
+
+    def advance(self, current: np.ndarray, dt: float, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Drains some packs with ``current`` amperes for ``dt`` seconds and updates their terminal voltage.
+
+        :param current: Current drawn, shape (len(rows),).
+        :type current: np.ndarray
+        :param dt: Time step in seconds.
+        :type dt: float
+        :param rows: The packs to advance; all by default.
+        """
+        self.current[rows] = current
+        soc = np.clip(self.soc[rows] - current * dt / (3600.0 * self.capacity), 0.0, 1.0)
+        self.soc[rows] = soc
+        self.voltage[rows] = np.maximum(self.open_circuit(soc) - self.resistance * current, 0.0)
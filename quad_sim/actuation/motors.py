@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from quad_sim.actuation.battery import Battery
+from quad_sim.bases.actuator import ActuatorBase
+from quad_sim.bases.motor import MotorBase
+from quad_sim.control.allocation import _per_motor, mixing_matrix
+
+
+class MotorBank(ActuatorBase):
+    """
+    Motors and ESCs of N drones as a first-order lag with slew and speed limits.
+
+    Each rotor approaches its clamped command with time constant ``tau_up`` when spinning up and
+    ``tau_down`` when spinning down, and never changes faster than ``slew`` RPM/s. The lag is integrated
+    exactly over the step (the decay factors are computed once per time step), so it stays stable for
+    time steps longer than the time constants.
+
+    With a ``battery`` the top speed is also limited to ``kv`` times the pack voltage, and the shaft power
+    ``k_m * rpm^2 * omega / efficiency`` is drawn from the pack every step, so thrust fades as it sags.
+    """
+
+    def __init__(
+        self,
+        motors: List[MotorBase],
+        k_f: float | Sequence[float],
+        k_m: float | Sequence[float],
+        n: int = 1,
+        tau_up: float | Sequence[float] = 0.03,
+        tau_down: float | Sequence[float] = 0.06,
+        slew: float | Sequence[float] = np.inf,
+        rpm_min: float | Sequence[float] = 0.0,
+        rpm_max: float | Sequence[float] = 20000.0,
+        kv: float | Sequence[float] = np.inf,
+        efficiency: float = 0.8,
+        battery: Battery | None = None,
+    ):
+        """
+        :param motors: The motors of the airframe, in the order of the commands.
+        :type motors: List[MotorBase]
+        :param k_f: Thrust coefficients, thrust = k_f * rpm^2.
+        :param k_m: Reaction torque coefficients, torque = k_m * rpm^2.
+        :param n: Number of drones.
+        :type n: int
+        :param tau_up: Spin-up time constants in seconds.
+        :param tau_down: Spin-down time constants in seconds.
+        :param slew: Largest rate of change of the speed in RPM/s.
+        :param rpm_min: Lower rotor speed limits.
+        :param rpm_max: Upper rotor speed limits.
+        :param kv: Speed constants in RPM per volt; only used with a battery.
+        :param efficiency: Fraction of the electrical power that reaches the shaft.
+        :type efficiency: float
+        :param battery: Pack feeding the motors, with one row per drone.
+        :type battery: Battery | None
+        """
+        if not motors or not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a non-empty list of MotorBase instances")
+        if battery is not None and not isinstance(battery, Battery):
+            raise TypeError(f"battery must be a Battery, got {type(battery)}")
+        super().__init__(n, len(motors))
+        if battery is not None and battery.n != n:
+            raise ValueError(f"battery must have one row per drone ({n}), got {battery.n}")
+        if not 0 < efficiency <= 1:
+            raise ValueError(f"efficiency must be within (0, 1], got {efficiency}")
+
+        m = self.m
+        self.motors = motors
+        self.k_f = _per_motor(k_f, m, "k_f")
+        self.k_m = _per_motor(k_m, m, "k_m")
+        self.tau_up = _per_motor(tau_up, m, "tau_up")
+        self.tau_down = _per_motor(tau_down, m, "tau_down")
+        self.slew = _per_motor(slew, m, "slew")
+        self.rpm_min = _per_motor(rpm_min, m, "rpm_min")
+        self.rpm_max = _per_motor(rpm_max, m, "rpm_max")
+        if np.any(self.rpm_max <= self.rpm_min):
+            raise ValueError("rpm_max must be greater than rpm_min")
+        if np.any(self.tau_up <= 0) or np.any(self.tau_down <= 0):
+            raise ValueError("tau_up and tau_down must be positive")
+        self.kv = _per_motor(kv, m, "kv")
+        self.efficiency = efficiency
+        self.battery = battery
+
+        self.B = mixing_matrix(motors, self.k_f, self.k_m)
+        # Shaft power per rpm^3: k_m * rpm^2 * (rpm * 2 pi / 60)
+        self._power = self.k_m * np.pi / 30.0 / efficiency
+        self._gains: dict[float, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _step_gains(self, dt: float) -> tuple[np.ndarray, np.ndarray]:
+        gains = self._gains.get(dt)
+        if gains is None:
+            gains = (-np.expm1(-dt / self.tau_up), -np.expm1(-dt / self.tau_down))
+            self._gains[dt] = gains
+        return gains
+
+    def ceiling(self, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        Highest reachable rotor speeds of some drones, shape (len(rows), M).
+
+        :rtype: np.ndarray
+        """
+        if self.battery is None:
+            return np.broadcast_to(self.rpm_max, self.rpm[rows].shape)
+        with np.errstate(invalid="ignore"):
+            reachable = self.kv * self.battery.voltage[rows, None]
+        return np.fmin(self.rpm_max, reachable)  # inf * 0 V is NaN, which fmin ignores
+
+    def target(self, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        The commands of some drones clamped to the reachable speeds.
+
+        :rtype: np.ndarray
+        """
+        return np.clip(self.command[rows], self.rpm_min, np.maximum(self.ceiling(rows), self.rpm_min))
+
+    def advance(self, dt: float, rows: np.ndarray | slice = slice(None)) -> None:
+        rpm = self.rpm[rows]
+        error = self.target(rows) - rpm
+        up, down = self._step_gains(dt)
+        change = error * np.where(error > 0, up, down)
+        limit = self.slew * dt
+        rpm = rpm + np.clip(change, -limit, limit)
+        self.rpm[rows] = rpm
+
+        if self.battery is not None:
+            voltage = np.maximum(self.battery.voltage[rows], 1e-3)
+            current = (rpm ** 3 @ self._power) / voltage
+            self.battery.advance(current, dt, rows)
+
+    def thrust_array(self, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        Thrust of every rotor of some drones at their actual speeds, shape (len(rows), M).
+
+        :rtype: np.ndarray
+        """
+        return self.k_f * self.rpm[rows] ** 2
+
+    def wrench_array(self, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        Rotor thrust and moments [thrust, Mx, My, Mz] of some drones at their actual speeds.
+
+        :return: Array of shape (len(rows), 4).
+        :rtype: np.ndarray
+        """
+        return self.rpm[rows] ** 2 @ self.B.T
@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+
+class ActuatorBase(ABC):
+    """
+    Base class of actuator models that hold the rotor speeds of N drones with M motors each.
+
+    Commanded and actual speeds live in (N, M) arrays. The allocator output only sets the command; the
+    actual speeds move towards it when ``advance`` is called, so rotor dynamics are integrated for all
+    rotors at once instead of in per-motor objects. Without a simulation every drone advances its own row
+    from its integrator step; once attached with ``NCopterBase.attach_actuators`` the simulation advances
+    all rows in one call per physics tick and ``batched`` is set.
+    """
+
+    def __init__(self, n: int, m: int):
+        """
+        :param n: Number of drones.
+        :type n: int
+        :param m: Number of motors per drone.
+        :type m: int
+        """
+        if n < 1 or m < 1:
+            raise ValueError(f"n and m must be at least 1, got {n} and {m}")
+        self.n = n
+        self.m = m
+        self.rpm = np.zeros((n, m))
+        self.command = np.zeros((n, m))
+        self.batched = False
+
+    def set_command(self, rpms: np.ndarray | Sequence[float], rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Sets the commanded rotor speeds of some drones.
+
+        :param rpms: Commanded speeds in RPM, shape (len(rows), M) or (M,).
+        :param rows: The drones to command; all by default.
+        """
+        self.command[rows] = rpms
+
+    @abstractmethod
+    def advance(self, dt: float, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Moves the actual rotor speeds of some drones forward by ``dt`` seconds.
+
+        :param dt: Time step in seconds.
+        :type dt: float
+        :param rows: The drones to advance; all by default.
+        """
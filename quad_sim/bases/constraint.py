@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from quad_sim.bases.state                    import      StateVector
-from quad_sim.bases.setpoints           import      Setpoints
+from quad_sim.bases.setpoints           import      Setpoints, SetpointRecord
 
 
 class Constraint(ABC):
@@ -36,6 +38,8 @@ class Constraint(ABC):
 
 class StateConstraint(Constraint, ABC):
     """A constraint that operates on StateVector."""
+    # Constraints implementing enforce_array set this to True so ConstraintBase can run them on whole swarms
+    vectorized: bool = False
 
     @abstractmethod
     def enforce(self, state: StateVector) -> StateVector:
@@ -48,21 +52,47 @@ class StateConstraint(Constraint, ABC):
         """
         pass
 
+    def enforce_array(self, states: np.ndarray) -> np.ndarray:
+        """
+        Vectorised form of enforce for packed states of shape (N, STATE_SIZE), modified in place.
+
+        :param states: Packed states following STATE_LAYOUT.
+        :type states: np.ndarray
+        :return: Boolean mask of shape (N,) of the rows the constraint changed.
+        :rtype: np.ndarray
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide a vectorised form")
+
 
 class SetpointConstraint(Constraint, ABC):
     """A constraint that operates on Setpoints."""
+    # Constraints implementing enforce_array set this to True so ConstraintBase can run them on whole swarms
+    vectorized: bool = False
 
     @abstractmethod
     def enforce(self, setpoints: Setpoints) -> Setpoints:
         """
         Enforce the constraint on the given setpoints.
+        DroneBase passes its reused SetpointRecord, which has the same attributes; modify it in place and return it.
         :param setpoints: The setpoints to be modified to satisfy the constraint.
-        :type setpoints: Setpoints
+        :type setpoints: Setpoints | SetpointRecord
         :return: The modified setpoints.
         :rtype: Setpoints
         """
         pass
 
+    def enforce_array(self, setpoints: np.ndarray) -> np.ndarray:
+        """
+        Vectorised form of enforce for packed setpoints of shape (N, SETPOINT_SIZE), NaN where unset,
+        modified in place.
+
+        :param setpoints: Packed setpoints following SETPOINT_FIELDS.
+        :type setpoints: np.ndarray
+        :return: Boolean mask of shape (N,) of the rows the constraint changed.
+        :rtype: np.ndarray
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide a vectorised form")
+
 
 class ConstraintBase(ABC):
     def __init__(self, constraints: list[Constraint]):
@@ -106,4 +136,49 @@ class ConstraintBase(ABC):
             setpoints = constraint.enforce(setpoints)
         return setpoints
 
+    @staticmethod
+    def _run_array(constraints: list, rows: np.ndarray, to_object, counts: np.ndarray) -> None:
+        """
+        Applies constraints in order to packed rows in place, counting the rows each one changed.
+        Constraints without a vectorised form run row by row on unpacked objects.
+        """
+        for k, constraint in enumerate(constraints):
+            if constraint.vectorized:
+                counts[k] = np.count_nonzero(constraint.enforce_array(rows))
+                continue
+            for row in rows:
+                obj = to_object(row)
+                # Compare against the unpacked object, not the row, so float32 round-off (StateVector)
+                # neither counts as a change nor leaks into the fields the constraint left alone
+                before = obj.to_array()
+                after = constraint.enforce(obj).to_array()
+                changed = (before != after) & ~(np.isnan(before) & np.isnan(after))
+                if changed.any():
+                    row[changed] = after[changed]
+                    counts[k] += 1
+
+    def enforce_state_constraints_array(self, states: np.ndarray) -> np.ndarray:
+        """
+        Enforces all state constraints on packed states of shape (N, STATE_SIZE) in one pass, in place.
 
+        :param states: Packed states following STATE_LAYOUT.
+        :type states: np.ndarray
+        :return: Number of drones each constraint activated on, aligned with ``state_constraints``.
+        :rtype: np.ndarray
+        """
+        counts = np.zeros(len(self.state_constraints), dtype=np.int64)
+        self._run_array(self.state_constraints, states, StateVector.from_array, counts)
+        return counts
+
+    def enforce_setpoint_constraints_array(self, setpoints: np.ndarray) -> np.ndarray:
+        """
+        Enforces all setpoint constraints on packed setpoints of shape (N, SETPOINT_SIZE) in one pass, in place.
+
+        :param setpoints: Packed setpoints following SETPOINT_FIELDS, NaN where unset.
+        :type setpoints: np.ndarray
+        :return: Number of drones each constraint activated on, aligned with ``setpoint_constraints``.
+        :rtype: np.ndarray
+        """
+        counts = np.zeros(len(self.setpoint_constraints), dtype=np.int64)
+        self._run_array(self.setpoint_constraints, setpoints, SetpointRecord, counts)
+        return counts
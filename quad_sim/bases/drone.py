@@ -5,7 +5,7 @@ from quad_sim.bases.controller          import      ControllerBase
 from quad_sim.bases.pilot               import      PilotBase
 from quad_sim.bases.allocator           import      AllocatorBase
 from quad_sim.bases.integrator           import     IntegratorBase
-from quad_sim.bases.setpoints           import      Setpoints
+from quad_sim.bases.setpoints           import      Setpoints, SetpointRecord
 from quad_sim.bases.environment         import      EnvironmentBase
 from quad_sim.bases.constraint            import      ConstraintBase
 
@@ -52,6 +52,18 @@ class DroneBase(ABC):
         self.environment = environment
         self.constraints = constraints
 
+        self._physics_ticks = 0
+        # Reused every tick; see get_setpoints
+        self.target = SetpointRecord()
+
+    @property
+    def time(self) -> float:
+        """
+        The simulation time of this drone in seconds, derived from the number of physics steps taken.
+
+        :rtype: float
+        """
+        return self._physics_ticks * self.integrator.dt
 
     def step(self) -> None:
         """
@@ -59,17 +71,40 @@ class DroneBase(ABC):
         This method updates the state of the drone model, applying control inputs,
         updating physics, and recalculating sensor readings as necessary.
         """
-        self.target = self.get_setpoints()
-        self.target = self.constraints.enforce_setpoint_constraints(self.target)
+        self.update_setpoints()
+        self.update_control()
+        self.update_physics()
+
+    def update_setpoints(self) -> None:
+        """
+        Outer (position) loop: generates the constrained setpoints for the drone.
+        """
+        target = self.get_setpoints()
+        if target is not self.target:
+            self.target.load(target)
+        target = self.constraints.enforce_setpoint_constraints(self.target)
+        if target is not self.target:
+            self.target.load(target)
+
+    def update_control(self) -> None:
+        """
+        Inner (attitude) loop: computes the control response for the latest setpoints and
+        allocates it to the motors. The motor commands are held until the next call.
+        """
         self.response = self.pilot.compute_control(self.state, self.target)
         self.model.set_motor_rpm(self.allocator.allocate(self.response))
-        
-        self.state = self.integrator.step(self.state, self.model, self.environment)
 
+    def update_physics(self) -> None:
+        """
+        Physics loop: integrates the state forward by one integrator time step and enforces the state constraints.
+        """
+        self.environment.advance(self.time)
+        self.state = self.integrator.step(self.state, self.model, self.environment)
         self.state = self.constraints.enforce_state_constraints(self.state)
+        self._physics_ticks += 1
 
     @abstractmethod
-    def get_setpoints(self) -> Setpoints:
+    def get_setpoints(self) -> Setpoints | SetpointRecord:
         """
         Generates the desired setpoints for the drone's operation.
 
@@ -77,8 +112,11 @@ class DroneBase(ABC):
         the desired setpoints, such as target positions, velocities, orientations, 
         or thrust levels, required for the drone's operation.
 
+        For the allocation-free path, fill ``self.target`` (a SetpointRecord reused every tick) in place
+        and return it; returned Setpoints are copied into it.
+
         Returns:
-            Setpoints: An object containing the calculated setpoints.
+            Setpoints | SetpointRecord: An object containing the calculated setpoints.
         """
         pass
 
@@ -4,22 +4,41 @@ import numpy as np
 
 from quad_sim.bases.rigidbody import RigidBody
 from quad_sim.bases.motor import MotorBase
+from quad_sim.bases.actuator import ActuatorBase
 from quad_sim.references.bodyFixed import BodyFixed
 from quad_sim.bases.environment import EnvironmentBase
 from quad_sim.bases.state import StateVector
+from quad_sim.orientation.quaternion import Quaternion
 
 from quad_sim.funcs import compute_aB,compute_alphaB,compute_q_rate
 
 
 class DynamicsBase(ABC):
-    def __init__(self, body: RigidBody, motors: List[MotorBase]):
+    def __init__(self, body: RigidBody, motors: List[MotorBase], actuators: ActuatorBase | None = None, row: int = 0):
+        """
+        :param body: The rigid body of the drone.
+        :type body: RigidBody
+        :param motors: The motors of the drone.
+        :type motors: List[MotorBase]
+        :param actuators: Rotor dynamics shared by a swarm; without them motor commands take effect instantly.
+        :type actuators: ActuatorBase | None
+        :param row: The row of this drone in ``actuators``.
+        :type row: int
+        """
         if not isinstance(body, RigidBody):
             raise TypeError(f"body must be an instance of RigidBody, got {type(body)}")
         if not isinstance(motors, list) or not all(isinstance(motor, MotorBase) for motor in motors):
             raise TypeError("motors must be a list of MotorBase instances")
-        
+        if actuators is not None:
+            if not isinstance(actuators, ActuatorBase):
+                raise TypeError(f"actuators must be an ActuatorBase subclass, got {type(actuators)}")
+            if actuators.m != len(motors) or not 0 <= row < actuators.n:
+                raise ValueError(f"actuators of shape ({actuators.n}, {actuators.m}) have no row {row} for {len(motors)} motors")
+
         self.body = body
         self.motors = motors
+        self.actuators = actuators
+        self._rows = slice(row, row + 1)
     
     @property
     def mass(self) -> float:
@@ -70,6 +89,10 @@ class DynamicsBase(ABC):
         return thrust, moments
     
     def compute_forces_and_moments(self, environment:EnvironmentBase, state:StateVector) -> tuple[BodyFixed, BodyFixed]:
+        if self.actuators is not None:
+            # The motors produce their forces at the actual rotor speeds at the start of the step
+            for motor, rpm in zip(self.motors, self.actuators.rpm[self._rows.start]):
+                motor.set_rpm(rpm)
         thrust, moments = BodyFixed(0, 0, 0), BodyFixed(0, 0, 0)
         intThrust, intMoment = self._compute_internal_forces()
         extThrust, extMoment = environment.apply_effects(state)
@@ -79,7 +102,7 @@ class DynamicsBase(ABC):
 
         return thrust, moments
     
-    def compute_accelerations(self, F:BodyFixed, M:BodyFixed, state:StateVector) -> tuple[BodyFixed, BodyFixed]:
+    def compute_accelerations(self, F:BodyFixed, M:BodyFixed, state:StateVector) -> tuple[BodyFixed, BodyFixed, Quaternion]:
         """
         Compute the linear and angular accelerations of the drone based on the applied forces and moments.
 
@@ -88,10 +111,10 @@ class DynamicsBase(ABC):
         :param M: The total moment acting on the drone in the body-fixed frame.
         :type M: BodyFixed
         
-        :return: A tuple containing the linear acceleration and angular acceleration of the drone.
-        :rtype: tuple[BodyFixed, BodyFixed]
+        :return: A tuple containing the linear acceleration, the angular acceleration and the quaternion rate of the drone.
+        :rtype: tuple[BodyFixed, BodyFixed, Quaternion]
         """
-        a = compute_aB(self.mass,F,state.omega,state.vel)  # Linear acceleration using Newton's second law
+        a = compute_aB(self.mass,F,state.omega,state.velocity)  # Linear acceleration using Newton's second law
         alpha = compute_alphaB(self.inertia_tensor,M,state.omega)  # Angular acceleration using Euler's rotation equations
         q_rate = compute_q_rate(state.quaternion, state.omega)  # Quaternion rate of change based on current angular velocity
         return a, alpha, q_rate
@@ -100,10 +123,26 @@ class DynamicsBase(ABC):
         """
         Set the RPM squared values for each motor in the drone. 
         This method takes a list of RPM values corresponding to each motor and updates the internal state of the motors accordingly.
+        With actuators the values are only commanded; the rotor speeds follow as the actuators advance.
         """
+        if self.actuators is not None:
+            self.actuators.set_command(rpms, self._rows)
+            return
         for motor, rpm in zip(self.motors, rpms):
             motor.set_rpm(rpm)
-        pass
+
+    def advance_actuators(self, dt: float) -> None:
+        """
+        Advances the rotor dynamics of this drone by one integrator step. Called by the integrator; does nothing
+        without actuators or when the simulation advances all of their rows at once (``actuators.batched``).
+        The motors pick up the new speeds at the next force computation.
+
+        :param dt: Time step in seconds.
+        :type dt: float
+        """
+        if self.actuators is None or self.actuators.batched:
+            return
+        self.actuators.advance(dt, self._rows)
     
     
     
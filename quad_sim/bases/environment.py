@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
 from typing import Tuple
 
+import numpy as np
+
 from quad_sim.references.bodyFixed import BodyFixed
-from quad_sim.bases.state            import      StateVector
+from quad_sim.bases.state            import      StateVector, STATE_SIZE, STATE_LAYOUT
+
+# What the result of an effect depends on, from the most to the least cacheable
+DEPENDENCIES = ("constant", "time", "position", "state")
 
 class EnvironmentEffect(ABC):
+    # Effects implementing apply_array set this to True so the environment can fuse them
+    vectorized: bool = False
+    # One of DEPENDENCIES; the environment memoizes the result of anything that is not "state" dependent
+    dependency: str = "state"
+
     @abstractmethod
     def apply(self, state:StateVector) -> Tuple[BodyFixed, BodyFixed]:
         """
@@ -12,20 +22,171 @@ class EnvironmentEffect(ABC):
          and returns the resulting forces and moments as a tuple of BodyFixed objects.
         """
 
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        """
+        Vectorised form of apply for packed states of shape (N, STATE_SIZE).
+        Adds the body-frame forces and moments of every row into the (N, 3) accumulators in place.
+
+        :param states: Packed states following STATE_LAYOUT.
+        :type states: np.ndarray
+        :param force: Force accumulator.
+        :type force: np.ndarray
+        :param moment: Moment accumulator.
+        :type moment: np.ndarray
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide a vectorised form")
+
+    def advance(self, time: float) -> None:
+        """
+        Called once per physics step, before any apply call of that step, with the simulation time in seconds.
+        Time-varying effects override this; the default does nothing.
+        """
+        pass
+
 class EnvironmentBase(ABC):
     def __init__(self, effects: list[EnvironmentEffect]):
         self.effects = effects
-    
+        self.time = 0.0
+
+        self._packed = np.zeros((1, STATE_SIZE), dtype=np.float64)
+        self._force = np.zeros((1, 3), dtype=np.float64)
+        self._moment = np.zeros((1, 3), dtype=np.float64)
+
+    @property
+    def effects(self) -> list[EnvironmentEffect]:
+        return self._effects
+
+    @effects.setter
+    def effects(self, value: list[EnvironmentEffect]):
+        if not all(isinstance(e, EnvironmentEffect) for e in value):
+            raise TypeError("effects must be a list of EnvironmentEffect instances")
+        for e in value:
+            if e.dependency not in DEPENDENCIES:
+                raise ValueError(f"{type(e).__name__}.dependency must be one of {DEPENDENCIES}, got {e.dependency!r}")
+        # Assign a new list to change the effects; the fused, fallback and memoized groups are split here
+        self._effects = list(value)
+        self._fused = [e for e in self._effects if e.dependency == "state" and e.vectorized]
+        self._fallback = [e for e in self._effects if e.dependency == "state" and not e.vectorized]
+        self._memoized = [e for e in self._effects if e.dependency != "state"]
+        self._memo: dict[int, tuple] = {}
+
+    def invalidate(self, effect: EnvironmentEffect | None = None) -> None:
+        """
+        Drops the memoized results of one effect (or of all effects), e.g. after changing its parameters.
+
+        :param effect: The effect to recompute on the next call; all effects when omitted.
+        :type effect: EnvironmentEffect | None
+        """
+        if effect is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(id(effect), None)
+
+    def advance(self, time: float) -> None:
+        """
+        Moves the environment to the given simulation time (in seconds) and forwards it to every effect.
+        """
+        self.time = time
+        for effect in self._effects:
+            effect.advance(time)
+
+    def _buffers(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        if self._force.shape[0] != n:
+            self._force = np.zeros((n, 3), dtype=np.float64)
+            self._moment = np.zeros((n, 3), dtype=np.float64)
+        else:
+            self._force.fill(0.0)
+            self._moment.fill(0.0)
+        return self._force, self._moment
+
+    @staticmethod
+    def _run(effect: EnvironmentEffect, states: np.ndarray, force: np.ndarray, moment: np.ndarray, state: StateVector | None = None) -> None:
+        """
+        Adds the result of one effect into the accumulators through its fastest available path.
+        """
+        if effect.vectorized:
+            effect.apply_array(states, force, moment)
+            return
+        for row, packed in enumerate(states):
+            f, m = effect.apply(state if state is not None else StateVector.from_array(packed))
+            force[row] += f.vec[:, 0]
+            moment[row] += m.vec[:, 0]
+
+    def _apply_memoized(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray, state: StateVector | None = None) -> None:
+        """
+        Adds the memoized effects. Constant and time-only results are computed for one row and broadcast
+        (until invalidated or, for time-only effects, until the time changes); position-only results are kept
+        per row and recomputed only for the rows whose position changed.
+        """
+        for effect in self._memoized:
+            memo = self._memo.get(id(effect))
+
+            if effect.dependency in ("constant", "time"):
+                key = self.time if effect.dependency == "time" else None
+                if memo is None or memo[0] != key:
+                    f, m = np.zeros((1, 3)), np.zeros((1, 3))
+                    self._run(effect, states[:1], f, m, state)
+                    memo = (key, f, m)
+                    self._memo[id(effect)] = memo
+                force += memo[1]
+                moment += memo[2]
+                continue
+
+            positions = states[:, STATE_LAYOUT["position"]]
+            if memo is None or memo[0].shape != positions.shape:
+                changed = np.ones(len(states), dtype=bool)
+                memo = (positions.copy(), np.zeros((len(states), 3)), np.zeros((len(states), 3)))
+                self._memo[id(effect)] = memo
+            else:
+                changed = np.any(memo[0] != positions, axis=1)
+
+            if changed.any():
+                rows = np.nonzero(changed)[0]
+                f, m = np.zeros((len(rows), 3)), np.zeros((len(rows), 3))
+                self._run(effect, states[rows], f, m, state)
+                memo[0][rows], memo[1][rows], memo[2][rows] = positions[rows], f, m
+            force += memo[1]
+            moment += memo[2]
+
+    def apply_effects_array(self, states: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies all effects to packed states of shape (N, STATE_SIZE) in one pass.
+        Vectorised effects write straight into a shared accumulator; the others are applied row by row.
+        Effects that do not depend on the full state are served from the memo when possible.
+
+        :param states: Packed states following STATE_LAYOUT.
+        :type states: np.ndarray
+        :return: Body-frame forces and moments of shape (N, 3). The arrays are reused by the next call.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        force, moment = self._buffers(len(states))
+        for effect in self._fused:
+            effect.apply_array(states, force, moment)
+        self._apply_memoized(states, force, moment)
+
+        if self._fallback:
+            for row, packed in enumerate(states):
+                state = StateVector.from_array(packed)
+                for effect in self._fallback:
+                    f, m = effect.apply(state)
+                    force[row] += f.vec[:, 0]
+                    moment[row] += m.vec[:, 0]
+        return force, moment
+
     def apply_effects(self, state:StateVector) -> Tuple[BodyFixed, BodyFixed]:
         """
         Applies all environmental effects to the given state vector and returns the cumulative forces and moments as a tuple of BodyFixed objects.
         """
-        total_force = BodyFixed(0, 0, 0)
-        total_moment = BodyFixed(0, 0, 0)
+        force, moment = self._buffers(1)
+        if self._fused or self._memoized:
+            state.to_array(out=self._packed[0])
+            for effect in self._fused:
+                effect.apply_array(self._packed, force, moment)
+            self._apply_memoized(self._packed, force, moment, state)
+
+        for effect in self._fallback:
+            f, m = effect.apply(state)
+            force[0] += f.vec[:, 0]
+            moment[0] += m.vec[:, 0]
 
-        for effect in self.effects:
-            force, moment = effect.apply(state)
-            total_force += force
-            total_moment += moment
-        
-        return total_force, total_moment
\ No newline at end of file
+        return BodyFixed.from_Array(force[0], flag="force"), BodyFixed.from_Array(moment[0], flag="moment")
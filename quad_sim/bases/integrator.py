@@ -3,6 +3,7 @@ from abc import abstractmethod, ABC
 from quad_sim.bases.state import StateVector
 from quad_sim.bases.dynamics import DynamicsBase,RigidBody
 from quad_sim.bases.environment import EnvironmentBase
+from quad_sim.orientation.quaternion import Quaternion
 from quad_sim.references.bodyFixed import BodyFixed
 
 class IntegratorBase(ABC):
@@ -20,11 +21,18 @@ class IntegratorBase(ABC):
             raise ValueError(f"Time step must be positive, got {self.dt}")
         
     @abstractmethod
-    def integrate(self, acc:BodyFixed, alpha:BodyFixed, state:StateVector,) -> StateVector:
+    def integrate(self, acc:BodyFixed, alpha:BodyFixed, q_rate:Quaternion, state:StateVector) -> StateVector:
         """
         Function should step forward one set of calculations for the integrator.
         This is where the intrgration scheme can be implemented (e.g. Euler, RK4, etc.)
 
+        :param acc: Linear acceleration in the body-fixed frame.
+        :type acc: BodyFixed
+        :param alpha: Angular acceleration in the body-fixed frame.
+        :type alpha: BodyFixed
+        :param q_rate: Rate of change of the attitude quaternion.
+        :type q_rate: Quaternion
+
         :param state: Reference to the StateVector.
         :type state: StateVector
         
@@ -44,8 +52,11 @@ class IntegratorBase(ABC):
         """
 
         F, M = model.compute_forces_and_moments(environment, state0)
-        a, alpha = model.compute_accelerations(F, M, state0)
+        a, alpha, q_rate = model.compute_accelerations(F, M, state0)
         # Update the state vector based on the computed forces and moments
-        state1 = self.integrate(a,alpha,state0)
+        state1 = self.integrate(a,alpha,q_rate,state0)
+        # Rotor speeds move over the same step; the forces above used their values at the start of it.
+        # A no-op when the simulation advances the rotor speeds of the whole swarm at once.
+        model.advance_actuators(self.dt)
 
         return state1
\ No newline at end of file
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+
+class InteractionModel(ABC):
+    """
+    Inter-agent interaction layer (proximity, collision, downwash, ...).
+    Runs after the physics loop on the packed states of every entity in the simulation.
+    """
+
+    @abstractmethod
+    def update(self, drone_ids: List[str], states: np.ndarray) -> None:
+        """
+        Updates the interaction model for the current tick.
+
+        :param drone_ids: Ids of the entities, in the row order of ``states``.
+        :type drone_ids: List[str]
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        """
+        pass
@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+from quad_sim.bases.state import STATE_SIZE, StateVector
+
+
+def _per_axis(value: float | Sequence[float], size: int, name: str) -> np.ndarray:
+    arr = np.broadcast_to(np.asarray(value, dtype=np.float64), (size,)).copy()
+    if np.any(arr < 0):
+        raise ValueError(f"{name} must be non-negative")
+    return arr
+
+
+class SensorBase(ABC):
+    """
+    Base class of sensor models for a swarm of N drones.
+
+    A sensor samples at ``rate`` Hz. Every sample is the ideal measurement plus a random-walk bias and white
+    noise, rounded to ``quantization``, and it is delivered ``latency`` seconds later (rounded to whole sample
+    periods) through a fixed-size ring buffer. Between samples the last delivered reading is held.
+
+    Noise comes from one seeded generator per drone and is drawn ``block`` samples at a time for the whole
+    swarm; drone ``i`` always gets the same noise for a given seed, whatever the size of the swarm.
+    Subclasses only provide ``size`` and ``ideal``.
+    """
+    # Width of one measurement
+    size: int = 0
+
+    def __init__(
+        self,
+        rate: float,
+        n: int = 1,
+        latency: float = 0.0,
+        white: float | Sequence[float] = 0.0,
+        bias_walk: float | Sequence[float] = 0.0,
+        bias: float | Sequence[float] = 0.0,
+        quantization: float | Sequence[float] = 0.0,
+        seed: int | None = None,
+        block: int = 1024,
+    ):
+        """
+        :param rate: Sample rate in Hz.
+        :type rate: float
+        :param n: Number of drones.
+        :type n: int
+        :param latency: Delay between sampling and delivery in seconds.
+        :type latency: float
+        :param white: Standard deviation of the white noise of every sample, per axis.
+        :param bias_walk: Bias random walk in units per sqrt(s), per axis.
+        :param bias: Standard deviation of the initial (turn-on) bias, per axis.
+        :param quantization: Resolution of the output, per axis; 0 disables rounding.
+        :param seed: Seed of the noise generators.
+        :param block: Number of samples drawn at once.
+        :type block: int
+        """
+        if rate <= 0 or latency < 0 or n < 1 or block < 1:
+            raise ValueError("rate must be positive, latency non-negative, n and block at least 1")
+
+        size = self.size
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.n = n
+        self.white = _per_axis(white, size, "white")
+        self.bias_walk = _per_axis(bias_walk, size, "bias_walk")
+        self.quantization = _per_axis(quantization, size, "quantization")
+
+        self._rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+        self.bias = np.stack([rng.standard_normal(size) for rng in self._rngs]) * _per_axis(bias, size, "bias")
+        self._block = np.empty((block, n, 2 * size))
+        self._cursor = block
+
+        self.lag = int(round(latency * rate))
+        self._ring = np.full((self.lag + 1, n, size), np.nan)
+        self._head = -1
+        self._next = 0.0
+        self.reading = np.full((n, size), np.nan)
+        self.fresh = False
+
+        self._packed = np.zeros((1, STATE_SIZE))
+
+    @abstractmethod
+    def ideal(self, states: np.ndarray) -> np.ndarray:
+        """
+        Error-free measurements of packed true states.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        :return: Measurements of shape (N, size).
+        :rtype: np.ndarray
+        """
+
+    def _noise(self) -> np.ndarray:
+        if self._cursor == len(self._block):
+            block = len(self._block)
+            self._block[:] = np.stack([rng.standard_normal((block, 2 * self.size)) for rng in self._rngs], axis=1)
+            self._cursor = 0
+        self._cursor += 1
+        return self._block[self._cursor - 1]
+
+    def measure_array(self, states: np.ndarray, time: float) -> np.ndarray:
+        """
+        Advances the sensor to ``time`` and returns the latest delivered readings.
+        ``fresh`` tells whether a new reading was delivered by this call.
+
+        :param states: Packed true states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        :param time: Simulation time in seconds.
+        :type time: float
+        :return: Readings of shape (N, size), NaN until the first delivery. The array is reused.
+        :rtype: np.ndarray
+        """
+        self.fresh = time + 1e-9 >= self._next
+        if not self.fresh:
+            return self.reading
+
+        noise = self._noise()
+        self.bias += self.bias_walk * np.sqrt(self.period) * noise[:, self.size:]
+        sample = self.ideal(states) + self.bias + self.white * noise[:, :self.size]
+        q = self.quantization
+        sample = np.where(q > 0, np.round(sample / np.where(q > 0, q, 1.0)) * q, sample)
+
+        self._head = (self._head + 1) % len(self._ring)
+        self._ring[self._head] = sample
+        self.reading[:] = self._ring[(self._head - self.lag) % len(self._ring)]
+        self._next = (np.floor(time * self.rate + 1e-9) + 1.0) * self.period
+        return self.reading
+
+    def measure(self, true_state: StateVector, time: float) -> np.ndarray:
+        """
+        Single-drone form of measure_array (for sensors built with n=1).
+
+        :param true_state: The true state of the drone.
+        :type true_state: StateVector
+        :param time: Simulation time in seconds.
+        :type time: float
+        :return: The latest reading of shape (size,).
+        :rtype: np.ndarray
+        """
+        true_state.to_array(out=self._packed[0])
+        return self.measure_array(self._packed, time)[0]
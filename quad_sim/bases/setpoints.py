@@ -1,6 +1,19 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
+import numpy as np
+
+# Order of the standard setpoints in their packed (flat) form; unset setpoints are NaN
+SETPOINT_FIELDS = (
+    "roll_angle", "pitch_angle", "yaw_angle",
+    "roll_rate", "pitch_rate", "yaw_rate",
+    "vx", "vy", "vz",
+    "x", "y", "z",
+    "thrustz",
+)
+SETPOINT_LAYOUT = {name: i for i, name in enumerate(SETPOINT_FIELDS)}
+SETPOINT_SIZE = len(SETPOINT_FIELDS)
+
 class Setpoints(BaseModel):
     """
     Universal data container for controller 
@@ -26,3 +39,163 @@ class Setpoints(BaseModel):
 
     # Allows for custom 
     model_config = ConfigDict(extra='allow')
+
+    def to_array(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Packs the standard setpoints into a flat float64 array following SETPOINT_FIELDS, with NaN for unset ones.
+        Custom (extra) setpoints are not packed.
+
+        :param out: Optional preallocated array of shape (SETPOINT_SIZE,) to write into.
+        :type out: np.ndarray | None
+        :return: The packed setpoints.
+        :rtype: np.ndarray
+        """
+        if out is None:
+            out = np.empty(SETPOINT_SIZE, dtype=np.float64)
+        elif out.shape != (SETPOINT_SIZE,):
+            raise ValueError(f"out must have shape ({SETPOINT_SIZE},), got {out.shape}")
+
+        for i, name in enumerate(SETPOINT_FIELDS):
+            value = getattr(self, name)
+            out[i] = np.nan if value is None else value
+        return out
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "Setpoints":
+        """
+        Builds Setpoints from a packed array following SETPOINT_FIELDS; NaN entries become None.
+
+        :param arr: Packed setpoints of shape (SETPOINT_SIZE,).
+        :type arr: np.ndarray
+        :rtype: Setpoints
+        """
+        if not isinstance(arr, np.ndarray) or arr.shape != (SETPOINT_SIZE,):
+            raise ValueError(f"arr must be a numpy.ndarray with shape ({SETPOINT_SIZE},)")
+        return cls(**{name: float(v) for name, v in zip(SETPOINT_FIELDS, arr.tolist()) if v == v})
+
+
+def _record_field(index: int) -> property:
+    def fget(self) -> Optional[float]:
+        value = self.values[index]
+        return None if value != value else float(value)
+
+    def fset(self, value: Optional[float]) -> None:
+        self.values[index] = np.nan if value is None else value
+
+    return property(fget, fset, doc=f"{SETPOINT_FIELDS[index]} (None when unset)")
+
+
+class SetpointRecord:
+    """
+    Fixed-layout, mutable setpoints for the per-tick path.
+
+    The standard setpoints live in a float64 array following SETPOINT_FIELDS, with NaN meaning "unset".
+    Attribute access mirrors Setpoints (unset fields read as None, other names are custom setpoints kept
+    in ``extra``), so pilots and constraints written against Setpoints work unchanged, but a record is
+    filled in place every tick instead of building and validating a pydantic model. ``values`` may be a
+    row of a swarm-wide (N, SETPOINT_SIZE) array.
+
+    Convert with ``load`` / ``to_setpoints`` only at API boundaries.
+    """
+    __slots__ = ("values", "extra")
+
+    def __init__(self, values: np.ndarray | None = None):
+        """
+        :param values: Optional float64 array of shape (SETPOINT_SIZE,) to use as storage (not copied).
+        :type values: np.ndarray | None
+        """
+        if values is None:
+            values = np.full(SETPOINT_SIZE, np.nan)
+        elif not isinstance(values, np.ndarray) or values.shape != (SETPOINT_SIZE,) or values.dtype != np.float64:
+            raise ValueError(f"values must be a float64 numpy.ndarray with shape ({SETPOINT_SIZE},)")
+        self.values = values
+        # Custom setpoints, as with Setpoints(extra='allow')
+        self.extra: dict = {}
+
+    def clear(self) -> "SetpointRecord":
+        """
+        Unsets every setpoint.
+        """
+        self.values.fill(np.nan)
+        if self.extra:
+            self.extra.clear()
+        return self
+
+    def update(self, **setpoints: Optional[float]) -> "SetpointRecord":
+        """
+        Sets the given setpoints (None unsets); unknown names are stored as custom setpoints.
+        """
+        for name, value in setpoints.items():
+            index = SETPOINT_LAYOUT.get(name)
+            if index is None:
+                self.extra[name] = value
+            else:
+                self.values[index] = np.nan if value is None else value
+        return self
+
+    def is_set(self, name: str) -> bool:
+        return not np.isnan(self.values[SETPOINT_LAYOUT[name]])
+
+    def load(self, source: "Setpoints | SetpointRecord") -> "SetpointRecord":
+        """
+        Overwrites this record with the content of Setpoints or of another record.
+        """
+        if isinstance(source, SetpointRecord):
+            self.values[:] = source.values
+            extra = source.extra
+        elif isinstance(source, Setpoints):
+            source.to_array(out=self.values)
+            extra = source.model_extra or {}
+        else:
+            raise TypeError(f"source must be Setpoints or a SetpointRecord, got {type(source)}")
+        # The dict is kept, like ``values``, so loading every tick allocates nothing
+        if extra is not self.extra:
+            self.extra.clear()
+            self.extra.update(extra)
+        return self
+
+    def to_array(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Copy of the packed setpoints, same as Setpoints.to_array.
+
+        :rtype: np.ndarray
+        """
+        if out is None:
+            return self.values.copy()
+        out[:] = self.values
+        return out
+
+    def to_setpoints(self) -> Setpoints:
+        """
+        The equivalent pydantic Setpoints, including custom setpoints.
+
+        :rtype: Setpoints
+        """
+        setpoints = Setpoints.from_array(self.values)
+        for name, value in self.extra.items():
+            setattr(setpoints, name, value)
+        return setpoints
+
+    def __getattr__(self, name: str):
+        # Only reached for names that are neither slots nor standard setpoints: custom setpoints
+        if name == "extra":
+            raise AttributeError(name)
+        try:
+            return self.extra[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no setpoint {name!r}") from None
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in SETPOINT_LAYOUT or name in SetpointRecord.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            self.extra[name] = value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={v:g}" for n, v in zip(SETPOINT_FIELDS, self.values) if v == v)
+        extra = "".join(f", {n}={v!r}" for n, v in self.extra.items())
+        return f"SetpointRecord({fields}{extra})"
+
+
+for _index, _name in enumerate(SETPOINT_FIELDS):
+    setattr(SetpointRecord, _name, _record_field(_index))
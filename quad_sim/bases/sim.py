@@ -1,10 +1,20 @@
 from abc import ABC
 from typing import List
+
+import numpy as np
+
+from quad_sim.bases.actuator import ActuatorBase
 from quad_sim.bases.drone import DroneBase
+from quad_sim.bases.interaction import InteractionModel
+from quad_sim.bases.state import STATE_SIZE
 from quad_sim.bases.configuration import BuildableConfig
+from quad_sim.runtime.clock import SimClock
+from quad_sim.runtime.pacing import Pacer, PacingStats
+from quad_sim.runtime.scheduler import LoopRates, Scheduler
+from quad_sim.runtime.sharedstate import SharedStatePublisher
 
 class NCopterBase(ABC):
-    def __init__(self, agents:List[BuildableConfig], log=None):
+    def __init__(self, agents:List[BuildableConfig], log=None, rates: LoopRates | None = None):
 
         # Check if the agent being passed is top level (droneBase) or not
         self.__checkTopLevel(agents)
@@ -16,22 +26,213 @@ class NCopterBase(ABC):
 
         # Construct the logger
         self.__logger = log
+        self.__publisher = None
+        self.__interaction = None
+        self.__actuators = None
+        self.__packed = None
+
+        # Construct the central clock and the multi-rate scheduler.
+        # Without explicit rates every loop runs at the integrator rate of the agents.
+        if rates is None:
+            rates = self.__defaultRates()
+        if not isinstance(rates, LoopRates):
+            raise TypeError(f"rates must be a LoopRates instance, got {type(rates)}")
+        self.__rates = rates
+        self.__clock = SimClock(rates.physics)
+        for dr in self.__entities.values():
+            self.__checkIntegratorRate(dr)
+
+        self.__scheduler = Scheduler(self.__clock)
+        self.__scheduler.add("position", self.__updatePosition, rates.position, priority=0)
+        self.__scheduler.add("attitude", self.__updateAttitude, rates.attitude, priority=1)
+        self.__scheduler.add("physics", self.__updatePhysics, rates.physics, priority=2)
+        self.__scheduler.add("logging", self.__updateLogging, rates.logging, priority=4)
 
         # Construct the enviornmental models (TBD)
     
     def run(self):
         """
-        Advances the simulation by one tick for all entities.
+        Advances the simulation by one physics tick for all entities.
 
         The caller is responsible for looping over the desired number of ticks.
-        Each call steps every entity once and, if a logger is attached, records
-        the current state.
+        Each call integrates every entity once; the position and attitude loops and
+        the logger only run on the ticks where they are due according to the loop rates.
+        """
+        self.__scheduler.tick()
+
+    def run_paced(self, duration: float, real_time_factor: float = 1.0, **kwargs) -> PacingStats:
+        """
+        Advances the simulation by ``duration`` simulated seconds while holding a wall-clock pace.
+
+        :param duration: Simulated duration in seconds.
+        :type duration: float
+        :param real_time_factor: Simulated seconds per wall-clock second (1.0 is real time,
+                                 ``math.inf`` runs as fast as possible).
+        :type real_time_factor: float
+        :param kwargs: Further options forwarded to :class:`Pacer` (``max_lag``, ``spin``).
+        :return: Per-tick latency percentiles and overrun accounting of the run.
+        :rtype: PacingStats
         """
-        for iD, dr in self.__entities.items():
-            dr.step()
+        ticks = int(round(duration / self.__clock.dt))
+        pacer = Pacer(self.__clock.dt, real_time_factor, **kwargs)
+        return pacer.run(self.run, ticks)
+
+    def __updatePosition(self):
+        for dr in self.__entities.values():
+            dr.update_setpoints()
+
+    def __updateAttitude(self):
+        for dr in self.__entities.values():
+            dr.update_control()
+
+    def __updatePhysics(self):
+        for dr in self.__entities.values():
+            dr.update_physics()
+
+    def __advanceActuators(self):
+        self.__actuators.advance(self.__clock.dt)
+
+    def __updateLogging(self):
         if self.__logger is not None:
             self.__logger.step()
 
+    def __publishState(self):
+        # The physics loop of this tick has already run, so the states belong to the next tick
+        tick = self.__clock.tick + 1
+        out = self.__publisher.begin(tick, tick / self.__clock.rate)
+        self.pack_states(out)
+        self.__publisher.commit()
+
+    def __updateInteraction(self):
+        states = self.pack_states(self.__interactionStates())
+        self.__interaction.update(list(self.__entities.keys()), states)
+
+    def __interactionStates(self) -> np.ndarray:
+        # Reuse one buffer between ticks, reallocating only when entities are added or removed
+        n = len(self.__entities)
+        if self.__packed is None or self.__packed.shape[0] != n:
+            self.__packed = np.empty((n, STATE_SIZE), dtype=np.float64)
+        return self.__packed
+
+    def attach_interaction(self, model: InteractionModel, rate: float | None = None) -> None:
+        """
+        Runs an inter-agent interaction model after the physics loop.
+
+        :param model: The interaction model (e.g. proximity and collision queries).
+        :type model: InteractionModel
+        :param rate: Update rate in Hz, defaults to the physics rate.
+        :type rate: float | None
+        """
+        if not isinstance(model, InteractionModel):
+            raise TypeError(f"model must be an InteractionModel, got {type(model)}")
+        if self.__interaction is not None:
+            self.__scheduler.remove("interaction")
+
+        self.__interaction = model
+        self.__packed = None
+        self.__scheduler.add("interaction", self.__updateInteraction, rate or self.__rates.physics, priority=3)
+
+    @property
+    def interaction(self) -> InteractionModel | None:
+        return self.__interaction
+
+    def attach_actuators(self, actuators: ActuatorBase) -> None:
+        """
+        Advances the rotor dynamics shared by the entities in one call per physics tick, right after the
+        physics loop, instead of one row at a time inside every integrator step.
+
+        :param actuators: The actuators the dynamics of the entities were built with (one row per drone).
+        :type actuators: ActuatorBase
+        """
+        if not isinstance(actuators, ActuatorBase):
+            raise TypeError(f"actuators must be an ActuatorBase subclass, got {type(actuators)}")
+        self.detach_actuators()
+
+        actuators.batched = True
+        self.__actuators = actuators
+        # Same priority as the physics task and added after it, so it runs right after it
+        self.__scheduler.add("actuators", self.__advanceActuators, self.__rates.physics, priority=2)
+
+    def detach_actuators(self) -> None:
+        if self.__actuators is not None:
+            self.__scheduler.remove("actuators")
+            self.__actuators.batched = False
+            self.__actuators = None
+
+    @property
+    def actuators(self) -> ActuatorBase | None:
+        return self.__actuators
+
+    def pack_states(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Packs the states of all entities into one array, one row per entity in insertion order.
+
+        :param out: Optional preallocated (N, STATE_SIZE) array to write into.
+        :type out: np.ndarray | None
+        :return: The packed states.
+        :rtype: np.ndarray
+        """
+        n = len(self.__entities)
+        if out is None:
+            out = np.empty((n, STATE_SIZE), dtype=np.float64)
+        elif out.shape != (n, STATE_SIZE):
+            raise ValueError(f"out must have shape ({n}, {STATE_SIZE}), got {out.shape}")
+
+        for row, dr in zip(out, self.__entities.values()):
+            dr.state.to_array(out=row)
+        return out
+
+    def attach_publisher(self, publisher: SharedStatePublisher, rate: float) -> None:
+        """
+        Publishes the packed states of all entities into a shared memory ring buffer at the given rate,
+        so external processes (e.g. visualizers) can read them without slowing the simulation down.
+
+        :param publisher: The shared memory publisher, created for the current entity ids.
+        :type publisher: SharedStatePublisher
+        :param rate: Publication rate in Hz. Must divide the physics rate evenly.
+        :type rate: float
+        """
+        if not isinstance(publisher, SharedStatePublisher):
+            raise TypeError(f"publisher must be a SharedStatePublisher, got {type(publisher)}")
+        if publisher.drone_ids != list(self.__entities.keys()):
+            raise ValueError("publisher drone ids must match the simulation entities (and their order)")
+        if self.__publisher is not None:
+            self.__scheduler.remove("publish")
+
+        self.__publisher = publisher
+        self.__scheduler.add("publish", self.__publishState, rate, priority=5)
+
+    def detach_publisher(self) -> None:
+        if self.__publisher is not None:
+            self.__scheduler.remove("publish")
+            self.__publisher = None
+
+    def detach_interaction(self) -> None:
+        if self.__interaction is not None:
+            self.__scheduler.remove("interaction")
+            self.__interaction = None
+
+    def __defaultRates(self) -> LoopRates:
+        """
+        Derives single-rate loop rates from the integrator time step of the first agent,
+        which reproduces stepping every subsystem on every tick.
+        """
+        for dr in self.__entities.values():
+            return LoopRates.uniform(1.0 / dr.integrator.dt)
+        return LoopRates()
+
+    def __checkIntegratorRate(self, drone: DroneBase):
+        """
+        Validates that the integrator time step of a drone matches the central clock.
+
+        :raises ValueError: If the integrator time step differs from the physics period.
+        """
+        if not np.isclose(drone.integrator.dt, self.__clock.dt, rtol=1e-9, atol=0.0):
+            raise ValueError(
+                f"Integrator dt of '{drone.iD}' ({drone.integrator.dt}) does not match "
+                f"the physics period of the simulation clock ({self.__clock.dt})"
+            )
+
     def close(self):
         if self.__logger is not None:
             self.__logger.finalize()
@@ -80,6 +281,7 @@ class NCopterBase(ABC):
         """
         for dr in agents:
             inst = dr.construct()
+            self.__checkIntegratorRate(inst)
             if not self.__checkEntID(inst.iD):
                 self.__entities[inst.iD] = inst
 
@@ -88,6 +290,27 @@ class NCopterBase(ABC):
     def entities(self):
         return self.__entities
 
+    @property
+    def clock(self) -> SimClock:
+        return self.__clock
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self.__scheduler
+
+    @property
+    def rates(self) -> LoopRates:
+        return self.__rates
+
+    @property
+    def time(self) -> float:
+        """
+        The current simulation time in seconds.
+
+        :rtype: float
+        """
+        return self.__clock.time
+
     def appendEntity(self, agents: list[BuildableConfig]):
         self.__checkTopLevel(agents)
         self.__addEntities(agents)
@@ -5,6 +5,17 @@ from quad_sim.orientation.quaternion import Quaternion
 
 import numpy as np
 
+# Layout of the packed (flat) state array shared by the array based subsystems
+STATE_LAYOUT = {
+    "position": slice(0, 3),
+    "velocity": slice(3, 6),
+    "quaternion": slice(6, 10),
+    "omega": slice(10, 13),
+    "acceleration": slice(13, 16),
+    "alpha": slice(16, 19),
+}
+STATE_SIZE = 19
+
 class StateVector(BaseModel):
     # Allows for custom 
     model_config = ConfigDict(extra='allow', arbitrary_types_allowed=True)
@@ -34,4 +45,47 @@ class StateVector(BaseModel):
         )
     )
 
-    
\ No newline at end of file
+    def to_array(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Packs the state into a flat float64 array following STATE_LAYOUT.
+
+        :param out: Optional preallocated array of shape (STATE_SIZE,) to write into.
+        :type out: np.ndarray | None
+        :return: The packed state.
+        :rtype: np.ndarray
+        """
+        if out is None:
+            out = np.empty(STATE_SIZE, dtype=np.float64)
+        elif out.shape != (STATE_SIZE,):
+            raise ValueError(f"out must have shape ({STATE_SIZE},), got {out.shape}")
+
+        q = self.quaternion
+        out[STATE_LAYOUT["position"]] = self.position.vec[:, 0]
+        out[STATE_LAYOUT["velocity"]] = self.velocity.vec[:, 0]
+        out[STATE_LAYOUT["quaternion"]] = (q.w, q.x, q.y, q.z)
+        out[STATE_LAYOUT["omega"]] = self.omega.vec[:, 0]
+        out[STATE_LAYOUT["acceleration"]] = self.acceleration.vec[:, 0]
+        out[STATE_LAYOUT["alpha"]] = self.alpha.vec[:, 0]
+        return out
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "StateVector":
+        """
+        Builds a StateVector from a packed array following STATE_LAYOUT.
+
+        :param arr: Packed state of shape (STATE_SIZE,).
+        :type arr: np.ndarray
+        :rtype: StateVector
+        """
+        if not isinstance(arr, np.ndarray) or arr.shape != (STATE_SIZE,):
+            raise ValueError(f"arr must be a numpy.ndarray with shape ({STATE_SIZE},)")
+
+        col = lambda key: arr[STATE_LAYOUT[key]].reshape(3, 1)
+        return cls(
+            position=EarthFixed.from_Array(col("position"), flag="position"),
+            velocity=BodyFixed.from_Array(col("velocity"), flag="velocity"),
+            quaternion=Quaternion(*arr[STATE_LAYOUT["quaternion"]].tolist()),
+            omega=BodyFixed.from_Array(col("omega"), flag="ang_velocity"),
+            acceleration=BodyFixed.from_Array(col("acceleration"), flag="acceleration"),
+            alpha=BodyFixed.from_Array(col("alpha"), flag="ang_acceleration"),
+        )
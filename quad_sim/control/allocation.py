@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.allocator import AllocatorBase
+from quad_sim.bases.flightmode import DesaturationPriority
+from quad_sim.bases.motor import MotorBase
+from quad_sim.references.bodyFixed import BodyFixed
+
+
+def _per_motor(value: float | Sequence[float], n: int, name: str) -> np.ndarray:
+    arr = np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+    if np.any(arr < 0):
+        raise ValueError(f"{name} must be non-negative")
+    return arr
+
+
+def mixing_matrix(motors: List[MotorBase], k_f: np.ndarray, k_m: np.ndarray) -> np.ndarray:
+    """
+    Maps squared rotor speeds to [thrust, Mx, My, Mz] for rotors thrusting along body +z.
+
+    Rotor ``i`` at (x, y) contributes ``k_f`` to the thrust, ``(y, -x) * k_f`` to the roll and pitch moments
+    and ``-spin_direction * k_m`` to the yaw moment, the reaction torque of ``MotorBase`` motors (see
+    ``DefaultMotor.compute_forces``).
+
+    :return: Matrix of shape (4, M).
+    :rtype: np.ndarray
+    """
+    B = np.zeros((4, len(motors)))
+    for i, motor in enumerate(motors):
+        x, y = motor.position.vec[0, 0], motor.position.vec[1, 0]
+        B[:, i] = (k_f[i], y * k_f[i], -x * k_f[i], -motor.spin_direction * k_m[i])
+    return B
+
+
+class MixerAllocator(AllocatorBase):
+    """
+    Pseudo-inverse mixer with vectorised desaturation.
+
+    The mixing matrix, its pseudo-inverse and the thrust-only direction ``d = pinv(B)[:, 0]`` are computed
+    once. Commands are solved as ``u = d * T + a * d`` (``a`` being the moment part in units of thrust), so
+    desaturation is pure array arithmetic on (N, M) arrays:
+
+    - ``ATTITUDE``: moments are kept and the collective thrust is moved within the feasible interval.
+      When even that interval is empty, the moments are scaled down uniformly until it is not.
+    - ``THRUST``: the collective thrust is kept (clamped to what the rotors can produce) and the moments
+      are scaled down uniformly until every rotor is within its limits.
+    """
+
+    def __init__(
+        self,
+        motors: List[MotorBase],
+        k_f: float | Sequence[float],
+        k_m: float | Sequence[float],
+        rpm_min: float | Sequence[float] = 0.0,
+        rpm_max: float | Sequence[float] = 20000.0,
+        priority: DesaturationPriority = DesaturationPriority.ATTITUDE,
+    ):
+        """
+        :param motors: The motors of the airframe, in the order of the returned RPMs.
+        :type motors: List[MotorBase]
+        :param k_f: Thrust coefficients, thrust = k_f * rpm^2.
+        :param k_m: Reaction torque coefficients, torque = k_m * rpm^2.
+        :param rpm_min: Lower rotor speed limits.
+        :param rpm_max: Upper rotor speed limits.
+        :param priority: What to preserve when the rotors saturate.
+        :type priority: DesaturationPriority
+        """
+        if not motors or not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a non-empty list of MotorBase instances")
+        if not isinstance(priority, DesaturationPriority):
+            raise TypeError(f"priority must be a DesaturationPriority, got {type(priority)}")
+
+        n = len(motors)
+        self.motors = motors
+        self.k_f = _per_motor(k_f, n, "k_f")
+        self.k_m = _per_motor(k_m, n, "k_m")
+        rpm_min, rpm_max = _per_motor(rpm_min, n, "rpm_min"), _per_motor(rpm_max, n, "rpm_max")
+        if np.any(rpm_max <= rpm_min):
+            raise ValueError("rpm_max must be greater than rpm_min")
+        self.priority = priority
+
+        self.B = mixing_matrix(motors, self.k_f, self.k_m)
+        if np.linalg.matrix_rank(self.B) < 4:
+            raise ValueError("the motor layout cannot produce independent thrust, roll, pitch and yaw")
+        self.B_pinv = np.linalg.pinv(self.B)
+
+        self.d = self.B_pinv[:, 0]
+        if np.any(self.d <= 0):
+            raise ValueError("every rotor must contribute positively to collective thrust")
+        self.lower = rpm_min ** 2
+        self.upper = rpm_max ** 2
+        # Limits and moment map in units of collective thrust (divided by d)
+        self._lo = self.lower / self.d
+        self._hi = self.upper / self.d
+        self._moment_map = (self.B_pinv[:, 1:] / self.d[:, None]).T  # (3, M)
+
+        # Pairwise terms of the attitude-priority moment scaling: k (a_j - a_i) <= hi_j - lo_i
+        self._pair_room = self._hi[None, :] - self._lo[:, None]  # [i, j]
+
+    @property
+    def n_motors(self) -> int:
+        return len(self.motors)
+
+    def allocate_array(self, commands: np.ndarray, priority: DesaturationPriority | None = None) -> np.ndarray:
+        """
+        Allocates many drones at once.
+
+        :param commands: Rows of [thrust, Mx, My, Mz], shape (N, 4).
+        :type commands: np.ndarray
+        :param priority: Overrides the allocator priority for this call.
+        :return: Rotor speeds in RPM, shape (N, M).
+        :rtype: np.ndarray
+        """
+        commands = np.asarray(commands, dtype=np.float64).reshape(-1, 4)
+        priority = self.priority if priority is None else priority
+        thrust = commands[:, :1]
+        a = commands[:, 1:] @ self._moment_map  # (N, M)
+
+        if priority is DesaturationPriority.ATTITUDE:
+            # Largest k in [0, 1] for which the interval of feasible collective thrusts is non-empty
+            spread = a[:, None, :] - a[:, :, None]  # [n, i, j] = a_j - a_i
+            with np.errstate(divide="ignore", invalid="ignore"):
+                bound = np.where(spread > 0, self._pair_room / spread, np.inf)
+            k = np.clip(bound.min(axis=(1, 2)), 0.0, 1.0)[:, None]
+            ka = k * a
+            low = np.max(self._lo - ka, axis=1, keepdims=True)
+            high = np.min(self._hi - ka, axis=1, keepdims=True)
+            collective = np.clip(thrust, low, np.maximum(high, low))
+        else:
+            collective = np.clip(thrust, self._lo.max(), self._hi.min())
+            with np.errstate(divide="ignore", invalid="ignore"):
+                room = np.where(a > 0, (self._hi - collective) / a, np.where(a < 0, (self._lo - collective) / a, np.inf))
+            k = np.clip(room.min(axis=1, keepdims=True), 0.0, 1.0)
+            ka = k * a
+
+        omega_sq = np.clip(self.d * (collective + ka), self.lower, self.upper)
+        return np.sqrt(omega_sq)
+
+    def allocate(self, thrust_torques: Tuple[BodyFixed, BodyFixed]) -> list[float]:
+        thrust, torque = thrust_torques
+        command = np.array([[thrust.vec[2, 0], *torque.vec[:, 0]]], dtype=np.float64)
+        return self.allocate_array(command)[0].tolist()
+
+
+class QPAllocator(AllocatorBase):
+    """
+    Bounded least-squares allocation:
+
+        minimise ||W (B u - v)||^2 + eps ||u||^2   subject to   rpm_min^2 <= u <= rpm_max^2
+
+    solved with a primal active-set method on the squared rotor speeds (scaled to [.., 1]).
+
+    Every tick warm-starts from the previous solution and active set. The inverse of the free-variable block
+    of the Hessian is cached per active set, so when the active set does not change (the common case) a
+    tick costs one cached solve plus the optimality check.
+    """
+
+    def __init__(
+        self,
+        motors: List[MotorBase],
+        k_f: float | Sequence[float],
+        k_m: float | Sequence[float],
+        rpm_min: float | Sequence[float] = 0.0,
+        rpm_max: float | Sequence[float] = 20000.0,
+        weights: Sequence[float] = (1.0, 1.0, 1.0, 1.0),
+        regularization: float = 1e-6,
+        max_iter: int = 32,
+    ):
+        """
+        :param motors: The motors of the airframe, in the order of the returned RPMs.
+        :type motors: List[MotorBase]
+        :param k_f: Thrust coefficients, thrust = k_f * rpm^2.
+        :param k_m: Reaction torque coefficients, torque = k_m * rpm^2.
+        :param weights: Weights of the [thrust, Mx, My, Mz] errors.
+        :param regularization: Relative weight of the minimum-effort term that makes the solution unique.
+        :type regularization: float
+        :param max_iter: Active-set iterations per solve.
+        :type max_iter: int
+        """
+        if not motors or not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a non-empty list of MotorBase instances")
+        n = len(motors)
+        self.motors = motors
+        self.k_f = _per_motor(k_f, n, "k_f")
+        self.k_m = _per_motor(k_m, n, "k_m")
+        rpm_min, rpm_max = _per_motor(rpm_min, n, "rpm_min"), _per_motor(rpm_max, n, "rpm_max")
+        if np.any(rpm_max <= rpm_min):
+            raise ValueError("rpm_max must be greater than rpm_min")
+        weights = np.asarray(weights, dtype=np.float64).reshape(4)
+        if np.any(weights <= 0) or regularization <= 0:
+            raise ValueError("weights and regularization must be positive")
+
+        self.B = mixing_matrix(motors, self.k_f, self.k_m)
+        self.scale = rpm_max ** 2
+        Bs = self.B * self.scale  # works on x = u / scale
+        self.H = Bs.T @ (weights[:, None] ** 2 * Bs)
+        self.H += regularization * np.trace(self.H) / n * np.eye(n)
+        self._G = Bs.T * weights ** 2  # linear term is -G v
+        self.lo = (rpm_min ** 2) / self.scale
+        self.hi = np.ones(n)
+        self.max_iter = max_iter
+
+        self._cache: dict[int, tuple] = {}
+        self._bits = 1 << np.arange(n)
+        self.reset()
+
+    @property
+    def n_motors(self) -> int:
+        return len(self.motors)
+
+    def reset(self) -> None:
+        """
+        Forgets the warm start (e.g. after a discontinuity in the commands).
+        """
+        self.x = 0.5 * (self.lo + self.hi)
+        self.active = np.zeros(self.n_motors, dtype=np.int8)  # -1 at lower bound, +1 at upper bound, 0 free
+        self.iterations = 0
+
+    def _factor(self, free: np.ndarray) -> tuple:
+        key = int(self._bits[free].sum())
+        entry = self._cache.get(key)
+        if entry is None:
+            F, A = np.nonzero(free)[0], np.nonzero(~free)[0]
+            inv = np.linalg.inv(self.H[np.ix_(F, F)]) if len(F) else np.zeros((0, 0))
+            entry = (F, A, inv, self.H[np.ix_(F, A)])
+            self._cache[key] = entry
+        return entry
+
+    def solve(self, command: np.ndarray) -> np.ndarray:
+        """
+        Solves one allocation, warm-started from the previous call.
+
+        :param command: [thrust, Mx, My, Mz].
+        :type command: np.ndarray
+        :return: Squared rotor speeds divided by rpm_max^2, shape (M,).
+        :rtype: np.ndarray
+        """
+        f = -(self._G @ command)
+        x, active = self.x.copy(), self.active.copy()
+
+        for it in range(1, self.max_iter + 1):
+            F, A, inv, H_FA = self._factor(active == 0)
+            if len(F):
+                target = -(inv @ (f[F] + H_FA @ x[A]))
+                step = target - x[F]
+                # Largest fraction of the step that stays feasible; the blocking bound joins the active set
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    ratio = np.where(step < 0, (self.lo[F] - x[F]) / step, np.where(step > 0, (self.hi[F] - x[F]) / step, np.inf))
+                block = int(np.argmin(ratio))
+                if ratio[block] < 1.0:
+                    x[F] += max(ratio[block], 0.0) * step
+                    i = F[block]
+                    active[i] = 1 if step[block] > 0 else -1
+                    x[i] = self.hi[i] if active[i] > 0 else self.lo[i]
+                    continue
+                x[F] = target
+
+            if not len(A):
+                break
+            # Release the bound with the most negative multiplier, if any
+            g = self.H[A] @ x + f[A]
+            multiplier = np.where(active[A] < 0, g, -g)
+            worst = int(np.argmin(multiplier))
+            if multiplier[worst] >= -1e-12:
+                break
+            active[A[worst]] = 0
+
+        self.x, self.active, self.iterations = x, active, it
+        return x
+
+    def allocate_array(self, commands: np.ndarray) -> np.ndarray:
+        """
+        Allocates a sequence of commands of shape (N, 4), each warm-started from the previous one.
+        Use one allocator per drone to keep the warm starts of different drones apart.
+
+        :return: Rotor speeds in RPM, shape (N, M).
+        :rtype: np.ndarray
+        """
+        commands = np.asarray(commands, dtype=np.float64).reshape(-1, 4)
+        return np.sqrt(np.array([self.solve(c) for c in commands]) * self.scale)
+
+    def allocate(self, thrust_torques: Tuple[BodyFixed, BodyFixed]) -> list[float]:
+        thrust, torque = thrust_torques
+        command = np.array([thrust.vec[2, 0], *torque.vec[:, 0]], dtype=np.float64)
+        return np.sqrt(self.solve(command) * self.scale).tolist()
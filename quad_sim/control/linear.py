@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.dynamics import DynamicsBase
+from quad_sim.bases.motor import MotorBase
+from quad_sim.bases.rigidbody import RigidBody
+from quad_sim.bases.state import STATE_LAYOUT
+from quad_sim.control.allocation import _per_motor, mixing_matrix
+from quad_sim.funcs import _get_body_to_inertial_batch
+
+GRAVITY = 9.81
+
+# State of the linear models: world position and velocity, ZYX Euler angles and body rates
+LINEAR_STATES = ("x", "y", "z", "vx", "vy", "vz", "roll", "pitch", "yaw", "p", "q", "r")
+LINEAR_SIZE = len(LINEAR_STATES)
+
+
+def _euler_rotation(roll: float, pitch: float, yaw: float) -> np.ndarray:
+    cr, sr, cp, sp, cy, sy = np.cos(roll), np.sin(roll), np.cos(pitch), np.sin(pitch), np.cos(yaw), np.sin(yaw)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+
+
+def euler_from_states(states: np.ndarray) -> np.ndarray:
+    """
+    ZYX Euler angles (roll, pitch, yaw) of packed states of shape (N, STATE_SIZE).
+
+    :rtype: np.ndarray
+    """
+    w, x, y, z = states[:, STATE_LAYOUT["quaternion"]].T
+    return np.stack([
+        np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)),
+        np.arcsin(np.clip(2 * (w * y - z * x), -1.0, 1.0)),
+        np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)),
+    ], axis=1)
+
+
+def linear_states(states: np.ndarray) -> np.ndarray:
+    """
+    Converts packed states of shape (N, STATE_SIZE) into LINEAR_STATES rows of shape (N, LINEAR_SIZE).
+
+    :rtype: np.ndarray
+    """
+    R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+    return np.concatenate([
+        states[:, STATE_LAYOUT["position"]],
+        np.einsum("nij,nj->ni", R, states[:, STATE_LAYOUT["velocity"]]),
+        euler_from_states(states),
+        states[:, STATE_LAYOUT["omega"]],
+    ], axis=1)
+
+
+def expm(M: np.ndarray) -> np.ndarray:
+    """
+    Matrix exponential by scaling and squaring of a Taylor series.
+    """
+    norm = np.linalg.norm(M, 1)
+    squarings = max(0, int(np.ceil(np.log2(norm / 0.25)))) if norm > 0 else 0
+    X = M / 2.0 ** squarings
+    result, term = np.eye(len(M)), np.eye(len(M))
+    for k in range(1, 14):
+        term = term @ X / k
+        result = result + term
+    for _ in range(squarings):
+        result = result @ result
+    return result
+
+
+def discretize(A: np.ndarray, B: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-order-hold discretisation of x' = A x + B u.
+
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    n, m = B.shape
+    M = np.zeros((n + m, n + m))
+    M[:n, :n], M[:n, n:] = A, B
+    E = expm(M * dt)
+    return E[:n, :n], E[:n, n:]
+
+
+def solve_dare(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R: np.ndarray, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """
+    Solves the discrete algebraic Riccati equation with the structure-preserving doubling algorithm,
+    which converges quadratically (a few dozen iterations even for fast sample rates).
+
+    :return: The stabilising solution P.
+    :rtype: np.ndarray
+    """
+    I = np.eye(len(A))
+    Ak, G, H = A.copy(), B @ np.linalg.solve(R, B.T), Q.copy()
+    for _ in range(max_iter):
+        W = np.linalg.inv(I + G @ H)
+        A_next = Ak @ W @ Ak
+        G_next = G + Ak @ W @ G @ Ak.T
+        H_next = H + Ak.T @ H @ W @ Ak
+        done = np.linalg.norm(H_next - H, 1) <= tol * max(1.0, np.linalg.norm(H_next, 1))
+        Ak, G, H = A_next, G_next, H_next
+        if done:
+            return (H + H.T) / 2
+    raise RuntimeError("Riccati iteration did not converge; check that (A, B) is stabilisable")
+
+
+def lqr_gain(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R: np.ndarray) -> np.ndarray:
+    """
+    Discrete-time LQR gain K of u = -K x.
+
+    :rtype: np.ndarray
+    """
+    P = solve_dare(A, B, Q, R)
+    return np.linalg.solve(R + B.T @ P @ B, B.T @ P @ A)
+
+
+def _motor_coefficient(motors: List[MotorBase], name: str) -> List[float]:
+    values = [getattr(m, name, None) for m in motors]
+    if any(v is None for v in values):
+        raise ValueError(f"motors do not all define '{name}'; pass the coefficient explicitly")
+    return values
+
+
+class LinearModel:
+    """
+    Rigid-body multicopter model used to design linear controllers.
+
+    Inputs are the thrusts of the individual rotors in N, mapped to [thrust, Mx, My, Mz] by the mixing
+    matrix of the motors. Besides gravity and the rotors the model includes a linear body-frame drag,
+    which is what makes forward-flight trim points differ from hover.
+    """
+
+    def __init__(
+        self,
+        body: RigidBody,
+        motors: List[MotorBase],
+        k_f: float | Sequence[float] | None = None,
+        k_m: float | Sequence[float] | None = None,
+        drag: Sequence[float] = (0.0, 0.0, 0.0),
+        gravity: float = GRAVITY,
+    ):
+        """
+        :param body: Mass and inertia.
+        :type body: RigidBody
+        :param motors: The motors of the airframe, in the order of the inputs.
+        :type motors: List[MotorBase]
+        :param k_f: Thrust coefficients of the rotors (only their ratio to k_m matters here); read from the
+            ``kf`` attribute of the motors when omitted.
+        :param k_m: Reaction torque coefficients of the rotors; read from the ``km`` attribute of the motors
+            when omitted.
+        :param drag: Linear drag coefficients along the body x, y and z axes in N/(m/s).
+        """
+        if not isinstance(body, RigidBody):
+            raise TypeError(f"body must be an instance of RigidBody, got {type(body)}")
+        if not motors or not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a non-empty list of MotorBase instances")
+
+        n = len(motors)
+        self.body = body
+        self.motors = motors
+        self.k_f = _per_motor(_motor_coefficient(motors, "kf") if k_f is None else k_f, n, "k_f")
+        self.k_m = _per_motor(_motor_coefficient(motors, "km") if k_m is None else k_m, n, "k_m")
+        self.drag = np.asarray(drag, dtype=np.float64).reshape(3)
+        self.gravity = gravity
+        # Wrench per newton of rotor thrust
+        self.mix = mixing_matrix(motors, self.k_f, self.k_m) / self.k_f
+        self._inertia = np.asarray(body.inertia_tensor, dtype=np.float64)
+        self._inertia_inv = np.linalg.inv(self._inertia)
+
+    @classmethod
+    def from_dynamics(cls, dynamics: DynamicsBase, **kwargs) -> "LinearModel":
+        """
+        Builds the model from the rigid body and motors of a dynamics model.
+
+        :rtype: LinearModel
+        """
+        if not isinstance(dynamics, DynamicsBase):
+            raise TypeError(f"dynamics must be an instance of DynamicsBase, got {type(dynamics)}")
+        return cls(dynamics.body, dynamics.motors, **kwargs)
+
+    @property
+    def inputs(self) -> int:
+        return len(self.motors)
+
+    def fingerprint(self) -> str:
+        """
+        Hash of every parameter that changes the linearisation (rigid body, motor geometry and coefficients,
+        drag and gravity). Controllers combine it with their own settings to key cached designs.
+
+        :rtype: str
+        """
+        h = hashlib.sha256()
+        for arr in (
+            [self.body.mass, self.gravity], self._inertia, self.drag, self.k_f, self.k_m,
+            [m.position.vec[:, 0] for m in self.motors], [m.spin_direction for m in self.motors],
+            self.mix,  # so tables cached under an older mixing convention are not reused
+        ):
+            h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+    def derivatives(self, x: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """
+        Time derivative of a LINEAR_STATES vector under per-rotor thrusts ``u``.
+
+        :rtype: np.ndarray
+        """
+        roll, pitch, yaw = x[6:9]
+        omega = x[9:12]
+        R = _euler_rotation(roll, pitch, yaw)
+        wrench = self.mix @ u
+
+        force = np.array([0.0, 0.0, wrench[0]]) - self.drag * (R.T @ x[3:6])
+        accel = R @ force / self.body.mass - np.array([0.0, 0.0, self.gravity])
+
+        sr, cr, tp, cp = np.sin(roll), np.cos(roll), np.tan(pitch), np.cos(pitch)
+        rates = np.array([
+            [1.0, sr * tp, cr * tp],
+            [0.0, cr, -sr],
+            [0.0, sr / cp, cr / cp],
+        ]) @ omega
+        alpha = self._inertia_inv @ (wrench[1:] - np.cross(omega, self._inertia @ omega))
+        return np.concatenate([x[3:6], accel, rates, alpha])
+
+    def trim(self, speed: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Level flight at ``speed`` m/s along the world x axis with zero yaw: the pitch angle and rotor thrusts
+        that cancel drag and gravity.
+
+        :return: Trim state and trim inputs.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        x = np.zeros(LINEAR_SIZE)
+        x[3] = speed
+        mix_pinv = np.linalg.pinv(self.mix)
+        unknowns = np.array([0.0, self.body.mass * self.gravity])  # pitch, collective thrust
+
+        def residual(v):
+            x[7] = v[0]
+            return self.derivatives(x, mix_pinv @ np.array([v[1], 0.0, 0.0, 0.0]))[[3, 5]]
+
+        for _ in range(20):
+            r = residual(unknowns)
+            if np.linalg.norm(r) < 1e-12:
+                break
+            J = np.column_stack([(residual(unknowns + e) - r) / 1e-7 for e in np.eye(2) * 1e-7])
+            unknowns = unknowns - np.linalg.solve(J, r)
+        x[7] = unknowns[0]
+        return x, mix_pinv @ np.array([unknowns[1], 0.0, 0.0, 0.0])
+
+    def linearize(self, speed: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Continuous-time Jacobians about a trim point, by central differences.
+
+        :return: A, B, trim state and trim inputs.
+        :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        """
+        x0, u0 = self.trim(speed)
+        step = 1e-6
+        A = np.column_stack([(self.derivatives(x0 + e, u0) - self.derivatives(x0 - e, u0)) / (2 * step)
+                             for e in np.eye(LINEAR_SIZE) * step])
+        B = np.column_stack([(self.derivatives(x0, u0 + e) - self.derivatives(x0, u0 - e)) / (2 * step)
+                             for e in np.eye(self.inputs) * step])
+        return A, B, x0, u0
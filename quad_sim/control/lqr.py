@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.pilot import PilotBase
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_SIZE, StateVector
+from quad_sim.control.linear import LINEAR_SIZE, LinearModel, discretize, linear_states, lqr_gain
+from quad_sim.references.bodyFixed import BodyFixed
+
+DEFAULT_Q = (10.0, 10.0, 10.0, 2.0, 2.0, 2.0, 4.0, 4.0, 2.0, 0.1, 0.1, 0.1)
+
+
+def _weights(value: float | Sequence[float] | np.ndarray, size: int, name: str) -> np.ndarray:
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim < 2:
+        arr = np.diag(np.broadcast_to(arr, (size,)))
+    if arr.shape != (size, size):
+        raise ValueError(f"{name} must be a scalar, {size} diagonal weights or a {size}x{size} matrix")
+    return arr
+
+
+class LQRPilot(PilotBase):
+    """
+    Gain-scheduled LQR for multicopters.
+
+    Gains are designed offline: the model is trimmed and linearised at every scheduled forward speed and
+    the discrete Riccati equation is solved there. The resulting table (gains mapped through the mixer to
+    [thrust, Mx, My, Mz], plus the trim points) is kept in memory; with a ``cache_dir`` it is also stored on
+    disk under a hash of the model and the design settings, so later runs with the same airframe load it
+    instead of solving again.
+
+    Online, the errors are expressed in the heading frame of the yaw setpoint, the gains of the two
+    neighbouring speeds are blended, and the command is one matrix-vector product per drone.
+
+    The pilot tracks ``x, y, z`` (held where unset), ``vx, vy, vz`` (zero where unset, also used as
+    feed-forward and to pick the trim point) and ``yaw_angle`` (held where unset). Angle, rate and thrust
+    setpoints are ignored.
+    """
+
+    def __init__(
+        self,
+        model: LinearModel,
+        dt: float,
+        Q: float | Sequence[float] | np.ndarray = DEFAULT_Q,
+        R: float | Sequence[float] | np.ndarray = 1.0,
+        speeds: Sequence[float] = (0.0,),
+        cache_dir: str | None = None,
+    ):
+        """
+        :param model: Linear design model of the airframe.
+        :type model: LinearModel
+        :param dt: Period (s) at which compute_control is called.
+        :type dt: float
+        :param Q: State weights, in LINEAR_STATES order.
+        :param R: Weights of the per-rotor thrusts.
+        :param speeds: Forward speeds (m/s, ascending) of the scheduled trim points.
+        :param cache_dir: Directory of the gain tables; None (the default) keeps the table in memory only.
+        :type cache_dir: str | None
+        """
+        if not isinstance(model, LinearModel):
+            raise TypeError(f"model must be a LinearModel, got {type(model)}")
+        if dt <= 0:
+            raise ValueError(f"dt must be positive, got {dt}")
+        speeds = np.asarray(speeds, dtype=np.float64).reshape(-1)
+        if len(speeds) == 0 or np.any(np.diff(speeds) <= 0):
+            raise ValueError("speeds must be a non-empty, strictly increasing sequence")
+
+        self.model = model
+        self.dt = dt
+        self.Q = _weights(Q, LINEAR_SIZE, "Q")
+        self.R = _weights(R, model.inputs, "R")
+        self.speeds = speeds
+        self.cache_dir = cache_dir
+
+        self.key = self._key()
+        self.from_cache = False
+        table = self._load()
+        if table is None:
+            table = self.design()
+            self._store(table)
+        self.gains, self.trims, self.wrenches = table["gains"], table["trims"], table["wrenches"]
+
+        self._state = np.zeros((1, STATE_SIZE))
+        self._setpoints = np.zeros((1, SETPOINT_SIZE))
+
+    def _key(self) -> str:
+        h = hashlib.sha256(self.model.fingerprint().encode())
+        for arr in (self.Q, self.R, self.speeds, [self.dt]):
+            h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+    @property
+    def cache_path(self) -> str | None:
+        return None if self.cache_dir is None else os.path.join(self.cache_dir, f"{self.key}.npz")
+
+    def _load(self) -> dict | None:
+        path = self.cache_path
+        if path is None or not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            table = {name: data[name] for name in ("gains", "trims", "wrenches")}
+        self.from_cache = True
+        return table
+
+    def _store(self, table: dict) -> None:
+        path = self.cache_path
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write then rename, so concurrent runs never read a partial table
+        tmp = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **table)
+        os.replace(tmp, path)
+
+    def design(self) -> dict:
+        """
+        Solves the LQR problem at every scheduled speed.
+
+        :return: ``gains`` (S, 4, LINEAR_SIZE) from state error to wrench, ``trims`` (S, LINEAR_SIZE) and
+            trim ``wrenches`` (S, 4).
+        :rtype: dict
+        """
+        gains, trims, wrenches = [], [], []
+        for speed in self.speeds:
+            A, B, x0, u0 = self.model.linearize(speed)
+            K = lqr_gain(*discretize(A, B, self.dt), self.Q, self.R)
+            gains.append(self.model.mix @ K)
+            trims.append(x0)
+            wrenches.append(self.model.mix @ u0)
+        return {"gains": np.array(gains), "trims": np.array(trims), "wrenches": np.array(wrenches)}
+
+    def compute_control_array(self, states: np.ndarray, setpoints: np.ndarray) -> np.ndarray:
+        """
+        LQR commands for N drones.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        :param setpoints: Packed setpoints of shape (N, SETPOINT_SIZE), NaN where unset.
+        :type setpoints: np.ndarray
+        :return: Rows of [thrust, Mx, My, Mz] in the body frame, shape (N, 4).
+        :rtype: np.ndarray
+        """
+        x = linear_states(states)
+        sp = lambda *names: setpoints[:, [SETPOINT_LAYOUT[k] for k in names]]
+        position = sp("x", "y", "z")
+        position = np.where(np.isnan(position), x[:, 0:3], position)
+        velocity = np.nan_to_num(sp("vx", "vy", "vz"))
+        yaw = sp("yaw_angle")[:, 0]
+        yaw = np.where(np.isnan(yaw), x[:, 8], yaw)
+
+        c, s = np.cos(yaw), np.sin(yaw)
+        heading = lambda v: np.stack([c * v[:, 0] + s * v[:, 1], -s * v[:, 0] + c * v[:, 1], v[:, 2]], axis=1)
+        velocity_h = heading(velocity)
+
+        # Neighbouring trim points and blend weights
+        speed = np.clip(velocity_h[:, 0], self.speeds[0], self.speeds[-1])
+        upper = np.minimum(np.searchsorted(self.speeds, speed), len(self.speeds) - 1)
+        lower = np.maximum(upper - 1, 0)
+        span = self.speeds[upper] - self.speeds[lower]
+        w = np.where(span > 0, (speed - self.speeds[lower]) / np.where(span > 0, span, 1.0), 0.0)[:, None]
+
+        trim = (1 - w) * self.trims[lower] + w * self.trims[upper]
+        error = np.empty_like(x)
+        error[:, 0:3] = heading(x[:, 0:3] - position)
+        error[:, 3:6] = heading(x[:, 3:6]) - velocity_h
+        error[:, 6:8] = x[:, 6:8] - trim[:, 6:8]
+        error[:, 8] = np.angle(np.exp(1j * (x[:, 8] - yaw)))
+        error[:, 9:12] = x[:, 9:12]
+
+        gains = (1 - w[:, :, None]) * self.gains[lower] + w[:, :, None] * self.gains[upper]
+        wrench = (1 - w) * self.wrenches[lower] + w * self.wrenches[upper]
+        return wrench - np.einsum("nij,nj->ni", gains, error)
+
+    def compute_control(self, state: StateVector, setpoints: Setpoints) -> Tuple[BodyFixed, BodyFixed]:
+        state.to_array(out=self._state[0])
+        setpoints.to_array(out=self._setpoints[0])
+        command = self.compute_control_array(self._state, self._setpoints)[0]
+        return BodyFixed(0.0, 0.0, command[0], flag="force"), BodyFixed.from_Array(command[1:], flag="moment")
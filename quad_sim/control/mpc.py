@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.pilot import PilotBase
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_SIZE, StateVector
+from quad_sim.control.allocation import _per_motor
+from quad_sim.control.linear import LINEAR_SIZE, LinearModel, discretize, linear_states, solve_dare
+from quad_sim.control.lqr import DEFAULT_Q, _weights
+from quad_sim.references.bodyFixed import BodyFixed
+
+
+class MPCPilot(PilotBase):
+    """
+    Linear MPC with a condensed, box-constrained QP.
+
+    The model is linearised about hover and discretised once. Eliminating the states over the horizon gives
+    the prediction ``Z = Phi z0 + Gamma U``, so the QP in the stacked rotor thrust deviations ``U`` is
+
+        min 1/2 U' H U + U' (F z0 - G r)    s.t.  u_min - u0 <= U <= u_max - u0
+
+    with ``H``, ``F``, ``G``, ``H^-1`` and the Lipschitz constant of the gradient all precomputed. Each tick:
+
+    - the unconstrained minimiser ``-H^-1 g`` is taken when it respects the rotor limits (one matvec),
+    - otherwise an accelerated projected gradient method (FISTA) runs, warm-started from the previous
+      solution shifted by one step.
+
+    Errors are expressed in the heading frame of the yaw setpoint, as in LQRPilot. Without a position
+    setpoint the position reference integrates the velocity setpoint from the current position.
+    A terminal cost from the discrete Riccati equation keeps short horizons stable.
+    """
+
+    def __init__(
+        self,
+        model: LinearModel,
+        dt: float,
+        thrust_max: float | Sequence[float],
+        thrust_min: float | Sequence[float] = 0.0,
+        horizon: int = 20,
+        Q: float | Sequence[float] | np.ndarray = DEFAULT_Q,
+        R: float | Sequence[float] | np.ndarray = 1.0,
+        tol: float = 1e-6,
+        max_iter: int = 200,
+        n: int = 1,
+        history: int = 1000,
+    ):
+        """
+        :param model: Linear design model of the airframe.
+        :type model: LinearModel
+        :param dt: Control period and prediction step in seconds.
+        :type dt: float
+        :param thrust_max: Upper limits of the rotor thrusts in N.
+        :param thrust_min: Lower limits of the rotor thrusts in N.
+        :param horizon: Number of prediction steps.
+        :type horizon: int
+        :param Q: State weights, in LINEAR_STATES order.
+        :param R: Weights of the per-rotor thrusts.
+        :param tol: Largest change of any thrust (N) between two iterations at convergence.
+        :type tol: float
+        :param max_iter: Iteration cap of the constrained solver.
+        :type max_iter: int
+        :param n: Number of drones served by compute_control_array.
+        :type n: int
+        :param history: Number of recent solves kept for ``stats``.
+        :type history: int
+        """
+        if not isinstance(model, LinearModel):
+            raise TypeError(f"model must be a LinearModel, got {type(model)}")
+        if dt <= 0 or horizon < 1 or n < 1:
+            raise ValueError("dt must be positive, horizon and n at least 1")
+
+        m = model.inputs
+        self.model = model
+        self.dt = dt
+        self.horizon = horizon
+        self.tol = tol
+        self.max_iter = max_iter
+        self.n = n
+
+        A, B, _, u0 = model.linearize(0.0)
+        Ad, Bd = discretize(A, B, dt)
+        Q, R = _weights(Q, LINEAR_SIZE, "Q"), _weights(R, m, "R")
+        P = solve_dare(Ad, Bd, Q, R)
+
+        # Prediction matrices: Z = Phi z0 + Gamma U, Z stacking z_1 .. z_N
+        powers = [np.eye(LINEAR_SIZE)]
+        for _ in range(horizon):
+            powers.append(Ad @ powers[-1])
+        Phi = np.vstack(powers[1:])
+        Gamma = np.zeros((horizon * LINEAR_SIZE, horizon * m))
+        for k in range(horizon):
+            for j in range(k + 1):
+                Gamma[k * LINEAR_SIZE:(k + 1) * LINEAR_SIZE, j * m:(j + 1) * m] = powers[k - j] @ Bd
+        Q_bar = np.kron(np.eye(horizon), Q)
+        Q_bar[-LINEAR_SIZE:, -LINEAR_SIZE:] = P
+
+        self.H = Gamma.T @ Q_bar @ Gamma + np.kron(np.eye(horizon), R)
+        self.F = Gamma.T @ Q_bar @ Phi
+        self.G = Gamma.T @ Q_bar
+        self.H_inv = np.linalg.inv(self.H)
+        self._step = 1.0 / np.linalg.eigvalsh(self.H)[-1]
+
+        self.trim = u0
+        lower = _per_motor(thrust_min, m, "thrust_min") - u0
+        upper = _per_motor(thrust_max, m, "thrust_max") - u0
+        if np.any(lower > 0) or np.any(upper < 0):
+            raise ValueError("the hover thrust of every rotor must lie within [thrust_min, thrust_max]")
+        self.lower, self.upper = np.tile(lower, horizon), np.tile(upper, horizon)
+
+        self._offsets = (np.arange(1, horizon + 1) * dt)[:, None]
+        self.solution = np.zeros((n, horizon * m))
+        self.solve_times: deque[float] = deque(maxlen=history)
+        self.iterations: deque[int] = deque(maxlen=history)
+
+        self._state = np.zeros((1, STATE_SIZE))
+        self._setpoints = np.zeros((1, SETPOINT_SIZE))
+
+    def reset(self) -> None:
+        self.solution.fill(0.0)
+
+    def stats(self) -> dict:
+        """
+        Solve-time statistics of the recent calls of compute_control_array.
+
+        :return: Mean, median, 99th percentile and maximum solve time in seconds, the mean number of
+            constrained-solver iterations and the number of recorded solves.
+        :rtype: dict
+        """
+        if not self.solve_times:
+            return {"count": 0}
+        times = np.array(self.solve_times)
+        return {
+            "count": len(times),
+            "mean": float(times.mean()),
+            "p50": float(np.percentile(times, 50)),
+            "p99": float(np.percentile(times, 99)),
+            "max": float(times.max()),
+            "iterations": float(np.mean(self.iterations)),
+        }
+
+    def solve(self, gradient: np.ndarray, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        Solves the box-constrained QP for a batch of linear terms (N, horizon * M), warm-starting from the
+        shifted previous solutions of the given drones, and stores the new solutions.
+
+        :rtype: np.ndarray
+        """
+        U = -gradient @ self.H_inv
+        violated = np.any((U < self.lower) | (U > self.upper), axis=1)
+        iterations = 0
+        if violated.any():
+            idx = np.arange(self.n)[rows][violated]
+            m = self.model.inputs
+            previous = self.solution[idx]
+            start = np.concatenate([previous[:, m:], previous[:, -m:]], axis=1)
+            U[violated], iterations = self._fista(gradient[violated], np.clip(start, self.lower, self.upper))
+        self.solution[rows] = U
+        self.iterations.append(iterations)
+        return U
+
+    def _fista(self, g: np.ndarray, U: np.ndarray) -> Tuple[np.ndarray, int]:
+        Y, t = U.copy(), 1.0
+        for k in range(1, self.max_iter + 1):
+            U_next = np.clip(Y - (Y @ self.H + g) * self._step, self.lower, self.upper)
+            if np.abs(U_next - U).max() <= self.tol:
+                return U_next, k
+            t_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t * t))
+            Y = U_next + ((t - 1.0) / t_next) * (U_next - U)
+            U, t = U_next, t_next
+        return U, self.max_iter
+
+    def compute_control_array(self, states: np.ndarray, setpoints: np.ndarray, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        MPC commands for N drones.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        :param setpoints: Packed setpoints of shape (N, SETPOINT_SIZE), NaN where unset.
+        :type setpoints: np.ndarray
+        :param rows: Which of the ``n`` drones (warm starts) the rows belong to; all by default.
+        :return: Rows of [thrust, Mx, My, Mz] in the body frame, shape (N, 4).
+        :rtype: np.ndarray
+        """
+        started = time.perf_counter()
+        x = linear_states(states)
+        sp = lambda *names: setpoints[:, [SETPOINT_LAYOUT[k] for k in names]]
+        position = sp("x", "y", "z")
+        held = np.isnan(position)
+        position = np.where(held, x[:, 0:3], position)
+        velocity = np.nan_to_num(sp("vx", "vy", "vz"))
+        yaw = sp("yaw_angle")[:, 0]
+        yaw = np.where(np.isnan(yaw), x[:, 8], yaw)
+
+        c, s = np.cos(yaw), np.sin(yaw)
+        heading = lambda v: np.stack([c * v[..., 0] + s * v[..., 1], -s * v[..., 0] + c * v[..., 1], v[..., 2]], axis=-1)
+        velocity_h = heading(velocity)
+
+        z0 = np.empty_like(x)
+        z0[:, 0:3] = heading(x[:, 0:3] - position)
+        z0[:, 3:6] = heading(x[:, 3:6])
+        z0[:, 6:8] = x[:, 6:8]
+        z0[:, 8] = np.angle(np.exp(1j * (x[:, 8] - yaw)))
+        z0[:, 9:12] = x[:, 9:12]
+
+        # Reference over the horizon: held axes drift with the velocity setpoint
+        reference = np.zeros((len(x), self.horizon, LINEAR_SIZE))
+        reference[:, :, 0:3] = np.where(held, velocity_h, 0.0)[:, None, :] * self._offsets
+        reference[:, :, 3:6] = velocity_h[:, None, :]
+
+        gradient = z0 @ self.F.T - reference.reshape(len(x), -1) @ self.G.T
+        U = self.solve(gradient, rows)
+        thrusts = self.trim + U[:, :self.model.inputs]
+        self.solve_times.append(time.perf_counter() - started)
+        return thrusts @ self.model.mix.T
+
+    def compute_control(self, state: StateVector, setpoints: Setpoints) -> Tuple[BodyFixed, BodyFixed]:
+        state.to_array(out=self._state[0])
+        setpoints.to_array(out=self._setpoints[0])
+        command = self.compute_control_array(self._state, self._setpoints, rows=slice(0, 1))[0]
+        return BodyFixed(0.0, 0.0, command[0], flag="force"), BodyFixed.from_Array(command[1:], flag="moment")
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.pilot import PilotBase
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch, _quat_multiply_batch
+from quad_sim.references.bodyFixed import BodyFixed
+
+GRAVITY = 9.81
+
+
+@dataclass(frozen=True)
+class PIDGains:
+    """
+    Gains and limits of one PID channel.
+
+    :ivar i_limit: Clamp of the integral term (in output units).
+    :ivar out_limit: Clamp of the output.
+    :ivar alpha: Smoothing factor of the first-order derivative filter, 1 disables filtering.
+    """
+    kp: float
+    ki: float = 0.0
+    kd: float = 0.0
+    i_limit: float = np.inf
+    out_limit: float = np.inf
+    alpha: float = 1.0
+
+    def __post_init__(self):
+        if min(self.kp, self.ki, self.kd) < 0:
+            raise ValueError("PID gains must be non-negative")
+        if self.i_limit < 0 or self.out_limit <= 0:
+            raise ValueError("i_limit must be non-negative and out_limit positive")
+        if not 0 < self.alpha <= 1:
+            raise ValueError(f"alpha must be in (0, 1], got {self.alpha}")
+
+
+class PIDBank:
+    """
+    Many PID controllers updated together. Gains are (1, C) arrays shared by all drones (replace them with
+    (N, C) arrays for per-drone tuning); integrators and derivative filter states are (N, C) arrays.
+
+    Features of every channel:
+
+    - derivative on measurement with a first-order low-pass filter,
+    - conditional integration (the integrator holds while the output saturates in the direction of the error)
+      plus an integral clamp, as anti-windup,
+    - NaN setpoints disable a channel: its output is NaN and its integrator and derivative state reset.
+    """
+
+    def __init__(self, gains: Sequence[PIDGains], n: int = 1):
+        if not gains or not all(isinstance(g, PIDGains) for g in gains):
+            raise TypeError("gains must be a non-empty sequence of PIDGains")
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+
+        column = lambda field: np.array([[getattr(g, field) for g in gains]], dtype=np.float64)
+        self.kp, self.ki, self.kd = column("kp"), column("ki"), column("kd")
+        self.i_limit, self.out_limit, self.alpha = column("i_limit"), column("out_limit"), column("alpha")
+        self.n = n
+        self.reset()
+
+    @property
+    def channels(self) -> int:
+        return self.kp.shape[1]
+
+    def reset(self, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Clears the integrators and derivative filters of the given drones (all by default).
+        """
+        if not hasattr(self, "integral"):
+            shape = (self.n, self.channels)
+            self.integral = np.zeros(shape)
+            self.last_measurement = np.zeros(shape)
+            self.derivative = np.zeros(shape)
+            self.primed = np.zeros(shape, dtype=bool)
+        self.integral[rows] = 0.0
+        self.derivative[rows] = 0.0
+        self.primed[rows] = False
+
+    def update(self, setpoint: np.ndarray, measurement: np.ndarray, dt: float, channels: slice = slice(None)) -> np.ndarray:
+        """
+        Advances a group of channels of every drone by one step.
+
+        :param setpoint: Setpoints of shape (N, c); NaN disables a channel.
+        :type setpoint: np.ndarray
+        :param measurement: Measurements of shape (N, c).
+        :type measurement: np.ndarray
+        :param dt: Time since the previous update of these channels in seconds.
+        :type dt: float
+        :param channels: The channels (columns of the bank) to update.
+        :type channels: slice
+        :return: Outputs of shape (N, c), NaN for disabled channels.
+        :rtype: np.ndarray
+        """
+        kp, ki, kd = self.kp[:, channels], self.ki[:, channels], self.kd[:, channels]
+        i_limit, out_limit, alpha = self.i_limit[:, channels], self.out_limit[:, channels], self.alpha[:, channels]
+        integral, last = self.integral[:, channels], self.last_measurement[:, channels]
+        derivative, primed = self.derivative[:, channels], self.primed[:, channels]
+
+        active = ~np.isnan(setpoint)
+        error = np.where(active, setpoint - measurement, 0.0)
+
+        raw = np.where(primed, (last - measurement) / dt, 0.0)
+        derivative[:] = np.where(primed, alpha * raw + (1.0 - alpha) * derivative, 0.0)
+
+        p_d = kp * error + kd * derivative
+        unclamped = p_d + integral
+        winding = (np.abs(unclamped) >= out_limit) & (np.sign(error) == np.sign(unclamped))
+        candidate = np.clip(integral + ki * error * dt, -i_limit, i_limit)
+        integral[:] = np.where(active, np.where(winding, integral, candidate), 0.0)
+
+        last[:] = measurement
+        primed[:] = active
+        derivative[~active] = 0.0
+        return np.where(active, np.clip(p_d + integral, -out_limit, out_limit), np.nan)
+
+
+def _quat_from_euler(roll: np.ndarray, pitch: np.ndarray, yaw: np.ndarray) -> np.ndarray:
+    cy, sy = np.cos(yaw / 2), np.sin(yaw / 2)
+    cp, sp = np.cos(pitch / 2), np.sin(pitch / 2)
+    cr, sr = np.cos(roll / 2), np.sin(roll / 2)
+    return np.stack([
+        cy * cp * cr + sy * sp * sr,
+        cy * cp * sr - sy * sp * cr,
+        cy * sp * cr + sy * cp * sr,
+        sy * cp * cr - cy * sp * sr,
+    ], axis=1)
+
+
+# Channel groups of the cascade inside the bank
+POSITION, VELOCITY, ATTITUDE, RATE = slice(0, 3), slice(3, 6), slice(6, 9), slice(9, 12)
+
+
+class CascadedPIDPilot(PilotBase):
+    """
+    Cascaded position -> velocity -> attitude -> rate controller for multicopters thrusting along body +z.
+
+    Every loop engages only when its setpoint (or the loop above it) is set, so the same pilot serves
+    position, velocity, angle and rate modes:
+
+    - ``x, y, z`` drive the position loop, which produces velocity setpoints (else ``vx, vy, vz`` are used),
+    - the velocity loop produces accelerations that become the thrust and the roll/pitch angles
+      (else ``roll_angle, pitch_angle`` and ``thrustz``; level attitude and hover thrust when nothing is set),
+    - the attitude loop works on the body-frame quaternion error and produces body rates
+      (else ``roll_rate, pitch_rate, yaw_rate``); without a yaw setpoint the current yaw is held,
+    - the rate loop produces the body torques.
+
+    All loops of all drones live in one PIDBank, so a tick costs a handful of array operations.
+    """
+
+    def __init__(
+        self,
+        mass: float,
+        dt: float,
+        position: Sequence[PIDGains] = (PIDGains(1.0, out_limit=5.0),) * 3,
+        velocity: Sequence[PIDGains] = (PIDGains(2.0, 0.5, i_limit=2.0, out_limit=5.0),) * 3,
+        attitude: Sequence[PIDGains] = (PIDGains(6.0, out_limit=6.0),) * 3,
+        rate: Sequence[PIDGains] = (PIDGains(0.15, 0.05, 0.002, i_limit=0.05, out_limit=1.0, alpha=0.5),) * 2
+                                   + (PIDGains(0.1, 0.02, 0.0, i_limit=0.05, out_limit=0.5),),
+        max_tilt: float = 0.6,
+        gravity: float = GRAVITY,
+        n: int = 1,
+    ):
+        """
+        :param mass: Vehicle mass in kg.
+        :type mass: float
+        :param dt: Period (s) at which compute_control is called.
+        :type dt: float
+        :param position: Gains of the x, y and z position loops (output: m/s).
+        :param velocity: Gains of the x, y and z velocity loops (output: m/s^2).
+        :param attitude: Gains of the roll, pitch and yaw angle loops (output: rad/s).
+        :param rate: Gains of the roll, pitch and yaw rate loops (output: N m).
+        :param max_tilt: Largest commanded roll or pitch angle in rad.
+        :type max_tilt: float
+        :param n: Number of drones served by compute_control_array.
+        :type n: int
+        """
+        if mass <= 0 or dt <= 0:
+            raise ValueError("mass and dt must be positive")
+        for name, group in (("position", position), ("velocity", velocity), ("attitude", attitude), ("rate", rate)):
+            if len(group) != 3:
+                raise ValueError(f"{name} needs gains for three axes, got {len(group)}")
+
+        self.mass = mass
+        self.dt = dt
+        self.max_tilt = max_tilt
+        self.gravity = gravity
+        self.bank = PIDBank([*position, *velocity, *attitude, *rate], n=n)
+
+        self._state = np.zeros((1, STATE_SIZE))
+        self._setpoints = np.zeros((1, SETPOINT_SIZE))
+
+    def reset(self) -> None:
+        self.bank.reset()
+
+    def compute_control_array(self, states: np.ndarray, setpoints: np.ndarray) -> np.ndarray:
+        """
+        Runs the cascade for N drones.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :type states: np.ndarray
+        :param setpoints: Packed setpoints of shape (N, SETPOINT_SIZE), NaN where unset.
+        :type setpoints: np.ndarray
+        :return: Rows of [thrust, Mx, My, Mz] in the body frame, shape (N, 4).
+        :rtype: np.ndarray
+        """
+        sp = lambda *names: setpoints[:, [SETPOINT_LAYOUT[k] for k in names]]
+        q = states[:, STATE_LAYOUT["quaternion"]]
+        R = _get_body_to_inertial_batch(q)
+        velocity = np.einsum("nij,nj->ni", R, states[:, STATE_LAYOUT["velocity"]])
+        w, x, y, z = q.T
+        yaw = np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+
+        # Position -> velocity -> acceleration
+        v_sp = self.bank.update(sp("x", "y", "z"), states[:, STATE_LAYOUT["position"]], self.dt, POSITION)
+        v_sp = np.where(np.isnan(v_sp), sp("vx", "vy", "vz"), v_sp)
+        a_sp = self.bank.update(v_sp, velocity, self.dt, VELOCITY)
+
+        # Acceleration -> tilt and thrust
+        vertical = np.nan_to_num(a_sp[:, 2])
+        lift = self.gravity + vertical
+        c, s = np.cos(yaw), np.sin(yaw)
+        ax_b = c * a_sp[:, 0] + s * a_sp[:, 1]
+        ay_b = -s * a_sp[:, 0] + c * a_sp[:, 1]
+        angles = sp("roll_angle", "pitch_angle", "yaw_angle")
+        rates = sp("roll_rate", "pitch_rate", "yaw_rate")
+        horizontal = ~np.isnan(ax_b)
+        roll = np.where(horizontal, -np.arctan2(ay_b, lift), angles[:, 0])
+        pitch = np.where(horizontal, np.arctan2(ax_b, lift), angles[:, 1])
+        # An unset angle levels the axis unless a rate setpoint takes over
+        roll = np.clip(np.where(np.isnan(roll) & np.isnan(rates[:, 0]), 0.0, roll), -self.max_tilt, self.max_tilt)
+        pitch = np.clip(np.where(np.isnan(pitch) & np.isnan(rates[:, 1]), 0.0, pitch), -self.max_tilt, self.max_tilt)
+        yaw_sp = np.where(np.isnan(angles[:, 2]) & np.isnan(rates[:, 2]), yaw, angles[:, 2])
+
+        tilt = np.cos(np.nan_to_num(roll)) * np.cos(np.nan_to_num(pitch))
+        thrust = np.where(np.isnan(a_sp[:, 2]), sp("thrustz")[:, 0], self.mass * lift / tilt)
+        thrust = np.where(np.isnan(thrust), self.mass * self.gravity / tilt, thrust)
+
+        # Attitude: body-frame error of the shortest rotation to the target
+        target = _quat_from_euler(np.nan_to_num(roll), np.nan_to_num(pitch), np.nan_to_num(yaw_sp))
+        conj = q * np.array([1.0, -1.0, -1.0, -1.0])
+        error = _quat_multiply_batch(conj, target)
+        error = 2.0 * np.sign(error[:, :1] + (error[:, :1] == 0)) * error[:, 1:]
+        error[np.isnan(np.stack([roll, pitch, yaw_sp], axis=1))] = np.nan
+        # Regulate the error to zero: with -error as the measurement the derivative term acts on d(error)/dt
+        omega_sp = self.bank.update(np.where(np.isnan(error), np.nan, 0.0), -np.nan_to_num(error), self.dt, ATTITUDE)
+        omega_sp = np.nan_to_num(np.where(np.isnan(omega_sp), rates, omega_sp))
+
+        torque = self.bank.update(omega_sp, states[:, STATE_LAYOUT["omega"]], self.dt, RATE)
+        return np.column_stack([thrust, torque])
+
+    def compute_control(self, state: StateVector, setpoints: Setpoints) -> Tuple[BodyFixed, BodyFixed]:
+        state.to_array(out=self._state[0])
+        setpoints.to_array(out=self._setpoints[0])
+        command = self.compute_control_array(self._state, self._setpoints)[0]
+        return BodyFixed(0.0, 0.0, command[0], flag="force"), BodyFixed.from_Array(command[1:], flag="moment")
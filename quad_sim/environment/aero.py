@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.actuation.motors import MotorBank
+from quad_sim.bases.environment import EnvironmentEffect
+from quad_sim.bases.motor import MotorBase
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch
+from quad_sim.references.bodyFixed import BodyFixed
+
+AIR_DENSITY = 1.225  # kg/m^3, ISA sea level
+
+
+class DragEffect(EnvironmentEffect):
+    """
+    Still-air body drag, linear and quadratic per body axis: ``F = -(linear * v + quadratic * v * |v|)``.
+    """
+    vectorized = True
+
+    def __init__(self, linear: Sequence[float] = (0.0, 0.0, 0.0), quadratic: Sequence[float] = (0.05, 0.05, 0.1)):
+        """
+        :param linear: Linear drag coefficients along the body x, y and z axes in N/(m/s).
+        :param quadratic: Quadratic drag coefficients along the body x, y and z axes in N/(m/s)^2.
+        """
+        self.linear = np.asarray(linear, dtype=np.float64).reshape(3)
+        self.quadratic = np.asarray(quadratic, dtype=np.float64).reshape(3)
+        if np.any(self.linear < 0) or np.any(self.quadratic < 0):
+            raise ValueError("drag coefficients must be non-negative")
+
+    def forces(self, states: np.ndarray) -> np.ndarray:
+        """
+        Body-frame drag forces for packed states of shape (N, STATE_SIZE).
+
+        :rtype: np.ndarray
+        """
+        v = states[:, STATE_LAYOUT["velocity"]]
+        return -(self.linear * v + self.quadratic * v * np.abs(v))
+
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        force += self.forces(states)
+
+    def apply(self, state: StateVector) -> Tuple[BodyFixed, BodyFixed]:
+        force = self.forces(state.to_array()[None, :])[0]
+        return BodyFixed.from_Array(force, flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
+
+
+class RotorEffect(EnvironmentEffect):
+    """
+    Base of the effects that scale the thrust of every rotor. Subclasses implement ``gain`` on packed
+    arrays; the extra thrust ``(gain - 1) * T`` of every rotor is summed into a body force and a moment
+    about the CG.
+
+    The rotor thrust comes from one of two sources:
+
+    - a list of motors: ``apply`` asks them for their thrust. The motors belong to one drone, so such an
+      effect must only be used in the environment of that drone, never shared across a swarm.
+    - a ``MotorBank``: the thrust of every drone is read from its rotor speeds, so the effect is vectorised
+      and ``apply_array`` serves the whole swarm (rows of the states are rows of the bank). With ``row``
+      the effect serves that single drone instead, for per-drone environments.
+    """
+
+    def __init__(self, motors: List[MotorBase] | MotorBank, rotor_radius: float, row: int | None = None):
+        if isinstance(motors, MotorBank):
+            if row is not None and not 0 <= row < motors.n:
+                raise ValueError(f"row must be within [0, {motors.n}), got {row}")
+            self.bank = motors
+            self.row = row
+            self.vectorized = True
+            motors = motors.motors
+        else:
+            if row is not None:
+                raise ValueError("row is only meaningful with a MotorBank")
+            self.bank = None
+            self.row = None
+        if not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a list of MotorBase instances or a MotorBank")
+        if rotor_radius <= 0:
+            raise ValueError(f"rotor_radius must be positive, got {rotor_radius}")
+        self.motors = motors
+        self.rotor_radius = float(rotor_radius)
+        self.positions = np.array([m.position.vec[:, 0] for m in motors], dtype=np.float64).reshape(-1, 3)
+
+    @abstractmethod
+    def gain(self, states: np.ndarray, thrust: np.ndarray) -> np.ndarray:
+        """
+        Thrust multiplier of every rotor.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :param thrust: Body-frame thrust vectors of shape (N, M, 3) as produced without the effect.
+        :return: Multipliers of shape (N, M).
+        :rtype: np.ndarray
+        """
+        pass
+
+    def evaluate(self, states: np.ndarray, thrust: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Extra body force and moment of all drones and rotors in one call.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :param thrust: Body-frame thrust vectors of shape (N, M, 3).
+        :return: Forces and moments of shape (N, 3).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        extra = (self.gain(states, thrust) - 1.0)[..., None] * thrust
+        return extra.sum(axis=1), np.cross(self.positions[None], extra).sum(axis=1)
+
+    def _bank_thrust(self, n: int) -> np.ndarray:
+        rows = slice(None) if self.row is None else slice(self.row, self.row + 1)
+        thrust = self.bank.thrust_array(rows)
+        if len(thrust) != n:
+            raise ValueError(f"{n} states do not match the {len(thrust)} drones served by the motor bank")
+        vectors = np.zeros(thrust.shape + (3,))
+        vectors[..., 2] = thrust
+        return vectors
+
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        if self.bank is None:
+            raise NotImplementedError(f"{type(self).__name__} needs a MotorBank for its vectorised form")
+        f, m = self.evaluate(states, self._bank_thrust(len(states)))
+        force += f
+        moment += m
+
+    def apply(self, state: StateVector) -> Tuple[BodyFixed, BodyFixed]:
+        if self.bank is not None:
+            thrust = self._bank_thrust(1)
+        else:
+            thrust = np.array([m.compute_forces()[0].vec[:, 0] for m in self.motors], dtype=np.float64)[None]
+        force, moment = self.evaluate(state.to_array()[None, :], thrust)
+        return BodyFixed.from_Array(force[0], flag="force"), BodyFixed.from_Array(moment[0], flag="moment")
+
+
+class GroundEffect(RotorEffect):
+    """
+    Rotor ground effect after Cheeseman and Bennett: ``T_IGE / T_OGE = 1 / (1 - (R / 4z)^2)``,
+    where z is the height of the rotor hub above a flat ground plane. The gain is capped at ``max_gain``
+    because the model diverges at z = R / 4.
+    """
+
+    def __init__(self, motors: List[MotorBase] | MotorBank, rotor_radius: float, ground: float = 0.0, max_gain: float = 1.5, row: int | None = None):
+        super().__init__(motors, rotor_radius, row)
+        if max_gain < 1:
+            raise ValueError(f"max_gain must be at least 1, got {max_gain}")
+        self.ground = ground
+        self.max_gain = max_gain
+
+    def gain(self, states: np.ndarray, thrust: np.ndarray) -> np.ndarray:
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        hub_z = states[:, None, 2] + np.einsum("nj,mj->nm", R[:, 2, :], self.positions)
+        height = np.maximum(hub_z - self.ground, 1e-6)
+        ratio = (self.rotor_radius / (4.0 * height)) ** 2
+        gain = np.where(ratio < 1.0, 1.0 / np.maximum(1.0 - ratio, 1e-12), np.inf)
+        return np.minimum(gain, self.max_gain)
+
+
+class VortexRingEffect(RotorEffect):
+    """
+    Thrust loss in the vortex ring state.
+
+    The loss peaks when a rotor descends along its own wake at about its hover induced velocity
+    ``v_h = sqrt(T / (2 rho A))`` and fades with lateral speed. The empirical shape is
+    ``1 - depth * exp(-((v_d / v_h - center) / width)^2) * exp(-(v_l / v_h)^2)``.
+    """
+
+    def __init__(
+        self,
+        motors: List[MotorBase] | MotorBank,
+        rotor_radius: float,
+        depth: float = 0.3,
+        center: float = 1.0,
+        width: float = 0.4,
+        air_density: float = AIR_DENSITY,
+        row: int | None = None,
+    ):
+        super().__init__(motors, rotor_radius, row)
+        if not 0 <= depth < 1 or width <= 0:
+            raise ValueError("depth must be in [0, 1) and width positive")
+        self.depth = depth
+        self.center = center
+        self.width = width
+        self.disk_area = np.pi * self.rotor_radius ** 2
+        self.air_density = air_density
+
+    def gain(self, states: np.ndarray, thrust: np.ndarray) -> np.ndarray:
+        magnitude = np.linalg.norm(thrust, axis=-1)
+        axis = thrust / np.maximum(magnitude, 1e-12)[..., None]
+        v_hover = np.sqrt(magnitude / (2.0 * self.air_density * self.disk_area))
+
+        v = states[:, None, STATE_LAYOUT["velocity"]]
+        descent = -np.einsum("nmi,nmi->nm", axis, np.broadcast_to(v, axis.shape))
+        lateral = np.linalg.norm(v - (-descent)[..., None] * axis, axis=-1)
+
+        scale = np.maximum(v_hover, 1e-6)
+        loss = self.depth * np.exp(-((descent / scale - self.center) / self.width) ** 2) * np.exp(-(lateral / scale) ** 2)
+        return np.where(magnitude > 0, 1.0 - loss, 1.0)
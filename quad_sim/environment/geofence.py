@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.constraint import SetpointConstraint, StateConstraint
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, Setpoints
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch
+
+KEEP_IN, KEEP_OUT = "keep_in", "keep_out"
+# Distance by which projected points are moved past a fence, so they test as compliant
+_CLEARANCE = 1e-6
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For groups of the given sizes, the group of every element and its offset within the group.
+    """
+    group = np.repeat(np.arange(len(counts), dtype=np.intp), counts)
+    offset = np.arange(len(group), dtype=np.intp) - np.repeat(np.cumsum(counts) - counts, counts)
+    return group, offset
+
+
+@dataclass(frozen=True)
+class Zone:
+    """
+    A prism of the ``EarthFixed`` frame: a simple polygon in (x, y) extruded over an altitude band.
+
+    :ivar polygon: Vertices of shape (V, 2), in order, without repeating the first one.
+    :ivar z_min: Bottom of the band in metres.
+    :ivar z_max: Top of the band in metres.
+    :ivar kind: KEEP_OUT (no-fly zone) or KEEP_IN (drones must stay inside at least one keep-in zone).
+    """
+    polygon: np.ndarray
+    z_min: float = -np.inf
+    z_max: float = np.inf
+    kind: str = KEEP_OUT
+
+    def __post_init__(self):
+        polygon = np.asarray(self.polygon, dtype=np.float64)
+        if polygon.ndim != 2 or polygon.shape[1] != 2 or len(polygon) < 3:
+            raise ValueError(f"polygon must have shape (V, 2) with V >= 3, got {polygon.shape}")
+        if not self.z_min < self.z_max:
+            raise ValueError(f"z_min must be below z_max, got {self.z_min} and {self.z_max}")
+        if self.kind not in (KEEP_IN, KEEP_OUT):
+            raise ValueError(f"kind must be {KEEP_IN!r} or {KEEP_OUT!r}, got {self.kind!r}")
+        object.__setattr__(self, "polygon", polygon)
+
+
+class Geofence:
+    """
+    Many zones behind a uniform grid index.
+
+    Every grid cell lists the zones whose bounding box overlaps it (CSR arrays), so a query only tests the
+    zones of the cell a drone is in: the cost per drone depends on the local zone density, not on the
+    number of zones. Point-in-polygon tests and nearest-boundary searches run over all (drone, zone, edge)
+    triples of a query at once.
+    """
+
+    def __init__(self, zones: Sequence[Zone], cell: float | None = None, max_cells: int = 1 << 20):
+        """
+        :param zones: The keep-out and keep-in zones.
+        :param cell: Grid cell size in metres; by default the median zone extent.
+        :type cell: float | None
+        :param max_cells: Upper bound on the number of grid cells (the cell size grows to respect it).
+        :type max_cells: int
+        """
+        if not zones or not all(isinstance(z, Zone) for z in zones):
+            raise TypeError("zones must be a non-empty sequence of Zone instances")
+        self.zones = list(zones)
+
+        counts = np.array([len(z.polygon) for z in self.zones], dtype=np.intp)
+        self._edge_start = np.concatenate([[0], np.cumsum(counts)])
+        self._a = np.concatenate([z.polygon for z in self.zones])
+        self._b = np.concatenate([np.roll(z.polygon, -1, axis=0) for z in self.zones])
+        self._z_min = np.array([z.z_min for z in self.zones])
+        self._z_max = np.array([z.z_max for z in self.zones])
+        self._keep_in = np.array([z.kind == KEEP_IN for z in self.zones])
+        self.keep_in = np.nonzero(self._keep_in)[0]
+
+        lo = np.array([z.polygon.min(axis=0) for z in self.zones])
+        hi = np.array([z.polygon.max(axis=0) for z in self.zones])
+        if cell is None:
+            cell = float(np.median((hi - lo).max(axis=1)))
+        span = hi.max(axis=0) - lo.min(axis=0)
+        cell = max(cell, float(np.sqrt(span[0] * span[1] / max_cells)), 1e-9)
+
+        self.origin = lo.min(axis=0)
+        self.cell = cell
+        self.shape = np.maximum(np.ceil(span / cell).astype(np.intp), 1)
+        first = np.clip(((lo - self.origin) / cell).astype(np.intp), 0, self.shape - 1)
+        last = np.clip(((hi - self.origin) / cell).astype(np.intp), 0, self.shape - 1)
+
+        # (cell, zone) pairs of every bounding box, then CSR by cell
+        extent = last - first + 1
+        zone, offset = _expand(extent[:, 0] * extent[:, 1])
+        ix = first[zone, 0] + offset // extent[zone, 1]
+        iy = first[zone, 1] + offset % extent[zone, 1]
+        cells = ix * self.shape[1] + iy
+        order = np.argsort(cells, kind="stable")
+        self._cell_zone = zone[order]
+        self._cell_start = np.searchsorted(cells[order], np.arange(self.shape[0] * self.shape[1] + 1))
+        # The same index restricted to keep-in zones, for the ring search of _enter_keep_in
+        own = self._keep_in[self._cell_zone]
+        self._in_zone = self._cell_zone[own]
+        self._in_start = np.searchsorted(cells[order][own], np.arange(self.shape[0] * self.shape[1] + 1))
+        self._rings: dict[int, np.ndarray] = {}
+
+    def candidates(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Broad phase: the (point, zone) pairs sharing a grid cell.
+
+        :param points: Points of shape (N, 2+).
+        :return: Point indices and zone indices of the pairs, grouped by point.
+        """
+        ij = np.floor((points[:, :2] - self.origin) / self.cell).astype(np.intp)
+        valid = np.all((ij >= 0) & (ij < self.shape), axis=1)
+        cell = np.where(valid, ij[:, 0] * self.shape[1] + ij[:, 1], 0)
+        counts = np.where(valid, self._cell_start[cell + 1] - self._cell_start[cell], 0)
+        point, offset = _expand(counts)
+        return point, self._cell_zone[self._cell_start[cell[point]] + offset]
+
+    def _edges(self, points: np.ndarray, zone: np.ndarray):
+        pair, offset = _expand(self._edge_start[zone + 1] - self._edge_start[zone])
+        edge = self._edge_start[zone[pair]] + offset
+        return pair, self._a[edge], self._b[edge], points[pair, :2]
+
+    def inside(self, points: np.ndarray, zone: np.ndarray) -> np.ndarray:
+        """
+        Whether each point lies inside the paired zone (polygon and altitude band), by crossing number.
+
+        :param points: Points of shape (P, 3), one per pair.
+        :param zone: Zone indices of shape (P,).
+        :rtype: np.ndarray
+        """
+        pair, a, b, p = self._edges(points, zone)
+        straddles = (a[:, 1] > p[:, 1]) != (b[:, 1] > p[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = a[:, 0] + (p[:, 1] - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+        crossings = np.bincount(pair, weights=straddles & (p[:, 0] < x_cross), minlength=len(zone))
+        return (crossings % 2 == 1) & (points[:, 2] >= self._z_min[zone]) & (points[:, 2] <= self._z_max[zone])
+
+    def _closest_boundary(self, points: np.ndarray, zone: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closest point of every paired polygon outline to the point (horizontally) and its distance.
+        """
+        pair, a, b, p = self._edges(points, zone)
+        ab = b - a
+        t = np.clip(np.einsum("ij,ij->i", p - a, ab) / np.einsum("ij,ij->i", ab, ab), 0.0, 1.0)
+        q = a + t[:, None] * ab
+        d2 = np.einsum("ij,ij->i", q - p, q - p)
+        best = np.lexsort((d2, pair))[np.searchsorted(pair, np.arange(len(zone)))]
+        return q[best], np.sqrt(d2[best])
+
+    def violations(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param positions: Positions of shape (N, 3).
+        :return: Index of a keep-out zone containing each position (-1 for none), and whether each position
+            is outside every keep-in zone (always False when there are no keep-in zones).
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        point, zone = self.candidates(positions)
+        hit = self.inside(positions[point], zone)
+        keep_out = np.full(len(positions), -1, dtype=np.intp)
+        out = hit & ~self._keep_in[zone]
+        keep_out[point[out]] = zone[out]
+        outside = np.zeros(len(positions), dtype=bool)
+        if len(self.keep_in):
+            outside[:] = True
+            outside[point[hit & self._keep_in[zone]]] = False
+        return keep_out, outside
+
+    def _exit_keep_out(self, positions: np.ndarray, zone: np.ndarray) -> np.ndarray:
+        q, horizontal = self._closest_boundary(positions, zone)
+        below = positions[:, 2] - self._z_min[zone]
+        above = self._z_max[zone] - positions[:, 2]
+        step = np.argmin(np.stack([horizontal, below, above], axis=1), axis=1)
+        target = positions.copy()
+        side = step == 0
+        direction = q[side] - positions[side, :2]
+        norm = np.linalg.norm(direction, axis=1, keepdims=True)
+        target[side, :2] = q[side] + _CLEARANCE * direction / np.where(norm > 0, norm, 1.0)
+        target[step == 1, 2] = self._z_min[zone[step == 1]] - _CLEARANCE
+        target[step == 2, 2] = self._z_max[zone[step == 2]] + _CLEARANCE
+        return target
+
+    def _ring(self, r: int) -> np.ndarray:
+        """
+        Cell offsets at Chebyshev distance ``r``, shape (8r, 2) (one offset for r = 0).
+        """
+        ring = self._rings.get(r)
+        if ring is None:
+            side = np.arange(-r, r + 1)
+            square = np.stack(np.meshgrid(side, side, indexing="ij"), axis=-1).reshape(-1, 2)
+            ring = square[np.abs(square).max(axis=1) == r]
+            self._rings[r] = ring
+        return ring
+
+    def _keep_in_targets(self, points: np.ndarray, zone: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest point of every paired keep-in zone to the point, and its distance.
+        """
+        flat = points.copy()
+        flat[:, 2] = np.clip(points[:, 2], self._z_min[zone], self._z_max[zone])
+        inside_xy = self.inside(flat, zone)
+        q, _ = self._closest_boundary(points, zone)
+        flat[~inside_xy, :2] = q[~inside_xy]
+        return flat, np.linalg.norm(flat - points, axis=1)
+
+    def _enter_keep_in(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Ring search over the keep-in index: the cells around each position are visited ring by ring and
+        the search stops for a position once its best candidate is closer than anything beyond the ring.
+        """
+        n = len(positions)
+        ij = np.clip(np.floor((positions[:, :2] - self.origin) / self.cell).astype(np.intp), 0, self.shape - 1)
+        # Distance from each position to its (clamped) cell bounds how close unvisited rings can be
+        low = self.origin + ij * self.cell
+        gap = np.linalg.norm(np.maximum(np.maximum(low - positions[:, :2], positions[:, :2] - low - self.cell), 0.0), axis=1)
+
+        best = np.full(n, np.inf)
+        target = positions.copy()
+        active = np.arange(n)
+        for r in range(int(self.shape.max())):
+            cells = ij[active, None, :] + self._ring(r)[None]
+            a, o = np.nonzero(np.all((cells >= 0) & (cells < self.shape), axis=2))
+            cell = cells[a, o, 0] * self.shape[1] + cells[a, o, 1]
+            pair, offset = _expand(self._in_start[cell + 1] - self._in_start[cell])
+            if len(pair):
+                key = np.unique(active[a[pair]] * len(self.zones) + self._in_zone[self._in_start[cell[pair]] + offset])
+                point, zone = key // len(self.zones), key % len(self.zones)
+                candidate, distance = self._keep_in_targets(positions[point], zone)
+                order = np.lexsort((distance, point))
+                first = order[np.r_[True, point[order][1:] != point[order][:-1]]]
+                better = distance[first] < best[point[first]]
+                rows = point[first][better]
+                best[rows] = distance[first][better]
+                target[rows] = candidate[first][better]
+            active = active[best[active] > r * self.cell - gap[active]]
+            if not len(active):
+                break
+
+        direction = target - positions
+        norm = np.linalg.norm(direction, axis=1, keepdims=True)
+        return target + _CLEARANCE * direction / np.where(norm > 0, norm, 1.0)
+
+    def project(self, positions: np.ndarray, passes: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Moves violating positions to the nearest compliant point: out of a keep-out zone through its closest
+        side, top or bottom, or into the nearest keep-in zone. Overlapping zones are resolved over a few passes.
+
+        :param positions: Positions of shape (N, 3).
+        :return: Projected positions and the mask of the positions that were moved.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        positions = positions.copy()
+        moved = np.zeros(len(positions), dtype=bool)
+        for _ in range(passes):
+            keep_out, outside = self.violations(positions)
+            inside = keep_out >= 0
+            if not inside.any() and not outside.any():
+                break
+            if inside.any():
+                positions[inside] = self._exit_keep_out(positions[inside], keep_out[inside])
+            outside &= ~inside
+            if outside.any():
+                positions[outside] = self._enter_keep_in(positions[outside])
+            moved |= inside | outside
+        return positions, moved
+
+
+class GeofenceConstraint(StateConstraint):
+    """
+    Hard geofence: moves a violating drone to the nearest compliant point and removes the velocity
+    component that points back across the fence.
+    """
+    vectorized = True
+
+    def __init__(self, geofence: Geofence):
+        if not isinstance(geofence, Geofence):
+            raise TypeError(f"geofence must be a Geofence, got {type(geofence)}")
+        self.geofence = geofence
+
+    def enforce_array(self, states: np.ndarray) -> np.ndarray:
+        positions = states[:, STATE_LAYOUT["position"]]
+        projected, moved = self.geofence.project(positions)
+        if not moved.any():
+            return moved
+
+        rows = np.nonzero(moved)[0]
+        normal = projected[rows] - positions[rows]
+        normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+        R = _get_body_to_inertial_batch(states[rows, STATE_LAYOUT["quaternion"]])
+        v_world = np.einsum("nij,nj->ni", R, states[rows, STATE_LAYOUT["velocity"]])
+        v_world -= np.minimum(np.einsum("ij,ij->i", v_world, normal), 0.0)[:, None] * normal
+
+        positions[rows] = projected[rows]
+        states[rows, STATE_LAYOUT["velocity"]] = np.einsum("nji,nj->ni", R, v_world)
+        return moved
+
+    def enforce(self, state: StateVector) -> StateVector:
+        packed = state.to_array()[None, :]
+        if self.enforce_array(packed)[0]:
+            state.position.vec[:, 0] = packed[0, STATE_LAYOUT["position"]]
+            state.velocity.vec[:, 0] = packed[0, STATE_LAYOUT["velocity"]]
+        return state
+
+
+class GeofenceSetpointConstraint(SetpointConstraint):
+    """
+    Moves position setpoints that lie in forbidden space to the nearest compliant point.
+    Rows without a complete (x, y, z) setpoint are left alone.
+    """
+    vectorized = True
+    _columns = [SETPOINT_LAYOUT[k] for k in ("x", "y", "z")]
+
+    def __init__(self, geofence: Geofence):
+        if not isinstance(geofence, Geofence):
+            raise TypeError(f"geofence must be a Geofence, got {type(geofence)}")
+        self.geofence = geofence
+
+    def enforce_array(self, setpoints: np.ndarray) -> np.ndarray:
+        moved = np.zeros(len(setpoints), dtype=bool)
+        positions = setpoints[:, self._columns]
+        rows = np.nonzero(~np.isnan(positions).any(axis=1))[0]
+        if len(rows):
+            projected, moved[rows] = self.geofence.project(positions[rows])
+            setpoints[np.ix_(rows, self._columns)] = projected
+        return moved
+
+    def enforce(self, setpoints: Setpoints) -> Setpoints:
+        if setpoints.x is None or setpoints.y is None or setpoints.z is None:
+            return setpoints
+        projected, moved = self.geofence.project(np.array([[setpoints.x, setpoints.y, setpoints.z]]))
+        if moved[0]:
+            setpoints.x, setpoints.y, setpoints.z = map(float, projected[0])
+        return setpoints
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from quad_sim.bases.constraint import StateConstraint
+from quad_sim.bases.environment import EnvironmentEffect
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch
+from quad_sim.references.bodyFixed import BodyFixed
+
+BOX, CYLINDER, TRIANGLE = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class ContactSet:
+    """
+    Sphere-vs-world contacts, one row per penetrating (drone, primitive) pair, sorted by drone.
+
+    :ivar drone: Row index of the drone in the queried arrays.
+    :ivar normal: Unit contact normals pointing from the obstacle towards the drone, shape (P, 3).
+    :ivar depth: Penetration depths in metres.
+    """
+    drone: np.ndarray
+    primitive: np.ndarray
+    normal: np.ndarray
+    depth: np.ndarray
+
+    def __len__(self):
+        return len(self.drone)
+
+
+def _closest_on_triangles(p: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Vectorised closest point on triangles (a, b, c) to points p, all of shape (P, 3).
+    Region classification follows Ericson, Real-Time Collision Detection, 5.1.5.
+    """
+    dot = lambda u, v: np.einsum("ij,ij->i", u, v)
+    ab, ac, ap = b - a, c - a, p - a
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    bp = p - b
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    cp = p - c
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        v = np.where(denom != 0, vb / denom, 0.0)
+        w = np.where(denom != 0, vc / denom, 0.0)
+        out = a + ab * v[:, None] + ac * w[:, None]  # face region
+
+        t_ab = np.where(d1 - d3 != 0, d1 / (d1 - d3), 0.0)
+        t_ac = np.where(d2 - d6 != 0, d2 / (d2 - d6), 0.0)
+        t_bc = np.where((d4 - d3) + (d5 - d6) != 0, (d4 - d3) / ((d4 - d3) + (d5 - d6)), 0.0)
+
+    # Edge regions, then vertex regions (later assignments take precedence, matching the early returns)
+    edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+    out[edge_bc] = (b + (c - b) * t_bc[:, None])[edge_bc]
+    edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+    out[edge_ac] = (a + ac * t_ac[:, None])[edge_ac]
+    edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+    out[edge_ab] = (a + ab * t_ab[:, None])[edge_ab]
+    vert_c = (d6 >= 0) & (d5 <= d6)
+    out[vert_c] = c[vert_c]
+    vert_b = (d3 >= 0) & (d4 <= d3)
+    out[vert_b] = b[vert_b]
+    vert_a = (d1 <= 0) & (d2 <= 0)
+    out[vert_a] = a[vert_a]
+    return out
+
+
+class ObstacleWorld:
+    """
+    Static obstacle geometry (axis-aligned boxes, vertical cylinders and triangle meshes)
+    indexed by a bounding-volume hierarchy.
+
+    The BVH is stored as flat arrays and traversed breadth-first for all query spheres at once, so a
+    query over N drones costs O(depth) vectorised steps instead of N separate tree walks.
+    """
+
+    def __init__(self, leaf_size: int = 4):
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be at least 1, got {leaf_size}")
+        self.leaf_size = leaf_size
+
+        self._boxes: list[np.ndarray] = []  # (lo, hi) rows
+        self._cylinders: list[np.ndarray] = []  # (cx, cy, radius, z_min, z_max)
+        self._triangles: list[np.ndarray] = []  # (3, 3) vertex rows
+        self._built = False
+
+    # ---------- loading ----------
+
+    def add_box(self, lo: np.ndarray, hi: np.ndarray) -> None:
+        lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+        if lo.shape != (3,) or hi.shape != (3,) or np.any(hi < lo):
+            raise ValueError("box corners must be 3-vectors with lo <= hi")
+        self._boxes.append(np.concatenate([lo, hi]))
+        self._built = False
+
+    def add_cylinder(self, center: Tuple[float, float], radius: float, z_min: float, z_max: float) -> None:
+        if radius <= 0 or z_max < z_min:
+            raise ValueError("cylinder must have a positive radius and z_min <= z_max")
+        self._cylinders.append(np.array([center[0], center[1], radius, z_min, z_max], dtype=np.float64))
+        self._built = False
+
+    def add_mesh(self, vertices: np.ndarray, faces: np.ndarray) -> None:
+        """
+        Adds a triangle mesh.
+
+        :param vertices: Vertex positions of shape (V, 3).
+        :param faces: Vertex indices of shape (F, 3).
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+        faces = np.asarray(faces, dtype=np.intp)
+        if vertices.ndim != 2 or vertices.shape[1] != 3 or faces.ndim != 2 or faces.shape[1] != 3:
+            raise ValueError("vertices must be (V, 3) and faces (F, 3)")
+        self._triangles.extend(vertices[faces])
+        self._built = False
+
+    def load_obj(self, path: str) -> None:
+        """
+        Adds the triangles of a Wavefront OBJ file (``v`` and ``f`` records; polygons are fanned).
+        """
+        vertices, faces = [], []
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == "v":
+                    vertices.append([float(x) for x in parts[1:4]])
+                elif parts[0] == "f":
+                    idx = [int(p.split("/")[0]) for p in parts[1:]]
+                    idx = [i - 1 if i > 0 else len(vertices) + i for i in idx]
+                    faces.extend([idx[0], idx[k], idx[k + 1]] for k in range(1, len(idx) - 1))
+        self.add_mesh(np.array(vertices).reshape(-1, 3), np.array(faces).reshape(-1, 3))
+
+    # ---------- BVH ----------
+
+    @property
+    def size(self) -> int:
+        return len(self._boxes) + len(self._cylinders) + len(self._triangles)
+
+    def build(self) -> None:
+        """
+        Builds the BVH (median split along the longest centroid axis). Called lazily by the queries.
+        """
+        boxes = np.array(self._boxes).reshape(-1, 6)
+        cyl = np.array(self._cylinders).reshape(-1, 5)
+        tri = np.array(self._triangles).reshape(-1, 3, 3)
+
+        self._box_data, self._cyl_data, self._tri_data = boxes, cyl, tri
+        self._kind = np.concatenate([np.full(len(boxes), BOX), np.full(len(cyl), CYLINDER), np.full(len(tri), TRIANGLE)])
+        self._local = np.concatenate([np.arange(len(boxes)), np.arange(len(cyl)), np.arange(len(tri))]).astype(np.intp)
+
+        lo = np.concatenate([boxes[:, :3], np.c_[cyl[:, :2] - cyl[:, 2:3], cyl[:, 3]], tri.min(axis=1)]).reshape(-1, 3)
+        hi = np.concatenate([boxes[:, 3:], np.c_[cyl[:, :2] + cyl[:, 2:3], cyl[:, 4]], tri.max(axis=1)]).reshape(-1, 3)
+        centroid = 0.5 * (lo + hi)
+
+        order = np.arange(len(lo), dtype=np.intp)
+        node_lo, node_hi, left, right, start, count = [], [], [], [], [], []
+
+        def new_node(s, e):
+            node_lo.append(lo[order[s:e]].min(axis=0) if e > s else np.full(3, np.inf))
+            node_hi.append(hi[order[s:e]].max(axis=0) if e > s else np.full(3, -np.inf))
+            left.append(-1)
+            right.append(-1)
+            start.append(s)
+            count.append(e - s)
+            return len(node_lo) - 1
+
+        stack = [(new_node(0, len(order)), 0, len(order))]
+        while stack:
+            node, s, e = stack.pop()
+            if e - s <= self.leaf_size:
+                continue
+            ids = order[s:e]
+            axis = int(np.argmax(centroid[ids].max(axis=0) - centroid[ids].min(axis=0)))
+            mid = (e - s) // 2
+            order[s:e] = ids[np.argpartition(centroid[ids, axis], mid)]
+            l, r = new_node(s, s + mid), new_node(s + mid, e)
+            left[node], right[node], count[node] = l, r, 0
+            stack += [(l, s, s + mid), (r, s + mid, e)]
+
+        self._order = order
+        self._node_lo, self._node_hi = np.array(node_lo), np.array(node_hi)
+        self._left, self._right = np.array(left), np.array(right)
+        self._start, self._count = np.array(start), np.array(count)
+        self._built = True
+
+    def candidates(self, centers: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Broad phase: every (sphere, primitive) pair whose bounding boxes overlap.
+
+        :param centers: Sphere centres of shape (N, 3).
+        :param radius: Sphere radius.
+        :return: Sphere indices and primitive indices of the candidate pairs.
+        """
+        if not self._built:
+            self.build()
+        if self.size == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        q = np.arange(len(centers), dtype=np.intp)
+        node = np.zeros(len(centers), dtype=np.intp)
+        out_q, out_p = [], []
+        r2 = radius * radius
+
+        while len(q):
+            c = centers[q]
+            d = np.clip(c, self._node_lo[node], self._node_hi[node]) - c
+            hit = np.einsum("ij,ij->i", d, d) <= r2
+            q, node = q[hit], node[hit]
+
+            leaf = self._count[node] > 0
+            counts = self._count[node[leaf]]
+            if counts.size:
+                base = np.repeat(self._start[node[leaf]] - (np.cumsum(counts) - counts), counts)
+                out_q.append(np.repeat(q[leaf], counts))
+                out_p.append(self._order[base + np.arange(counts.sum())])
+
+            inner = ~leaf
+            q = np.concatenate([q[inner], q[inner]])
+            node = np.concatenate([self._left[node[inner]], self._right[node[inner]]])
+
+        if not out_q:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(out_q), np.concatenate(out_p)
+
+    # ---------- narrow phase ----------
+
+    def query(self, centers: np.ndarray, radius: float) -> ContactSet:
+        """
+        Finds every penetration of spheres of ``radius`` at ``centers`` into the obstacles.
+
+        :param centers: Sphere centres of shape (N, 3).
+        :type centers: np.ndarray
+        :param radius: Sphere radius (collision radius of a drone).
+        :type radius: float
+        :rtype: ContactSet
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        q, prim = self.candidates(centers, radius)
+        kind, local = self._kind[prim], self._local[prim]
+        p = centers[q]
+
+        closest = np.empty_like(p)
+        inside_n = np.zeros_like(p)
+        inside_d = np.full(len(p), np.nan)
+
+        m = kind == BOX
+        if m.any():
+            box = self._box_data[local[m]]
+            closest[m] = np.clip(p[m], box[:, :3], box[:, 3:])
+            # Centre inside the box: push out through the nearest face
+            face = np.concatenate([p[m] - box[:, :3], box[:, 3:] - p[m]], axis=1)
+            k = np.argmin(face, axis=1)
+            n = np.zeros((m.sum(), 3))
+            n[np.arange(len(k)), k % 3] = np.where(k < 3, -1.0, 1.0)
+            inside_n[m], inside_d[m] = n, face[np.arange(len(k)), k]
+
+        m = kind == CYLINDER
+        if m.any():
+            cyl = self._cyl_data[local[m]]
+            rel = p[m, :2] - cyl[:, :2]
+            rho = np.linalg.norm(rel, axis=1)
+            scale = np.where(rho > cyl[:, 2], cyl[:, 2] / np.maximum(rho, 1e-12), 1.0)
+            closest[m, :2] = cyl[:, :2] + rel * scale[:, None]
+            closest[m, 2] = np.clip(p[m, 2], cyl[:, 3], cyl[:, 4])
+            side, top, bottom = cyl[:, 2] - rho, cyl[:, 4] - p[m, 2], p[m, 2] - cyl[:, 3]
+            radial = np.c_[rel / np.maximum(rho, 1e-12)[:, None], np.zeros(len(rho))]
+            n = np.where((side <= np.minimum(top, bottom))[:, None], radial,
+                         np.where((top <= bottom)[:, None], [0.0, 0.0, 1.0], [0.0, 0.0, -1.0]))
+            inside_n[m], inside_d[m] = n, np.minimum(side, np.minimum(top, bottom))
+
+        m = kind == TRIANGLE
+        if m.any():
+            tri = self._tri_data[local[m]]
+            closest[m] = _closest_on_triangles(p[m], tri[:, 0], tri[:, 1], tri[:, 2])
+            normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+            normal /= np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-12)
+            side = np.sign(np.einsum("ij,ij->i", p[m] - tri[:, 0], normal))
+            inside_n[m], inside_d[m] = normal * np.where(side == 0, 1.0, side)[:, None], 0.0
+
+        delta = p - closest
+        dist = np.linalg.norm(delta, axis=1)
+        outside = dist > 1e-12
+        normal = np.where(outside[:, None], delta / np.maximum(dist, 1e-12)[:, None], inside_n)
+        depth = np.where(outside, radius - dist, radius + np.nan_to_num(inside_d))
+
+        hit = np.nonzero(depth > 0)[0]
+        hit = hit[np.lexsort((prim[hit], q[hit]))]  # deterministic order: by drone, then primitive
+        return ContactSet(drone=q[hit], primitive=prim[hit], normal=normal[hit], depth=depth[hit])
+
+    def contact_forces(self, states: np.ndarray, radius: float, stiffness: float, damping: float) -> np.ndarray:
+        """
+        Penalty (spring-damper) contact forces in the Earth-fixed frame for packed states.
+
+        :param states: Packed states of shape (N, STATE_SIZE).
+        :param radius: Collision radius of the drones.
+        :param stiffness: Contact stiffness in N/m.
+        :param damping: Contact damping in N s/m (only resists approaching motion).
+        :return: Forces of shape (N, 3).
+        :rtype: np.ndarray
+        """
+        contacts = self.query(states[:, STATE_LAYOUT["position"]], radius)
+        forces = np.zeros((len(states), 3))
+        if not len(contacts):
+            return forces
+
+        sub = states[contacts.drone]
+        R = _get_body_to_inertial_batch(sub[:, STATE_LAYOUT["quaternion"]])
+        v_world = np.einsum("nij,nj->ni", R, sub[:, STATE_LAYOUT["velocity"]])
+        v_n = np.einsum("ij,ij->i", v_world, contacts.normal)
+        magnitude = stiffness * contacts.depth - damping * np.minimum(v_n, 0.0)
+        np.add.at(forces, contacts.drone, np.maximum(magnitude, 0.0)[:, None] * contacts.normal)
+        return forces
+
+
+class ObstacleEffect(EnvironmentEffect):
+    """
+    Feeds penalty contact forces of an ObstacleWorld back into the dynamics.
+    The world can be shared between the environments of all drones.
+    """
+    vectorized = True
+
+    def __init__(self, world: ObstacleWorld, radius: float, stiffness: float = 2000.0, damping: float = 50.0):
+        if not isinstance(world, ObstacleWorld):
+            raise TypeError(f"world must be an ObstacleWorld, got {type(world)}")
+        if radius <= 0:
+            raise ValueError(f"radius must be positive, got {radius}")
+        self.world = world
+        self.radius = radius
+        self.stiffness = stiffness
+        self.damping = damping
+
+    def forces(self, states: np.ndarray) -> np.ndarray:
+        """
+        Body-frame contact forces for packed states of shape (N, STATE_SIZE).
+
+        :rtype: np.ndarray
+        """
+        world = self.world.contact_forces(states, self.radius, self.stiffness, self.damping)
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        return np.einsum("nji,nj->ni", R, world)
+
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        force += self.forces(states)
+
+    def apply(self, state: StateVector) -> Tuple[BodyFixed, BodyFixed]:
+        force = self.forces(state.to_array()[None, :])[0]
+        return BodyFixed.from_Array(force, flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
+
+
+class ObstacleConstraint(StateConstraint):
+    """
+    Hard contact: moves a penetrating drone back onto the obstacle surface and removes
+    the velocity component pointing into the obstacle.
+    """
+    vectorized = True
+
+    def __init__(self, world: ObstacleWorld, radius: float):
+        if not isinstance(world, ObstacleWorld):
+            raise TypeError(f"world must be an ObstacleWorld, got {type(world)}")
+        if radius <= 0:
+            raise ValueError(f"radius must be positive, got {radius}")
+        self.world = world
+        self.radius = radius
+
+    def enforce(self, state: StateVector) -> StateVector:
+        packed = state.to_array()
+        position = packed[STATE_LAYOUT["position"]]
+        contacts = self.world.query(position[None, :], self.radius)
+        if not len(contacts):
+            return state
+
+        R = _get_body_to_inertial_batch(packed[None, STATE_LAYOUT["quaternion"]])[0]
+        v_world = R @ packed[STATE_LAYOUT["velocity"]]
+        for normal, depth in zip(contacts.normal, contacts.depth):
+            position = position + normal * depth
+            v_world = v_world - min(float(v_world @ normal), 0.0) * normal
+
+        state.position.vec[:, 0] = position
+        state.velocity.vec[:, 0] = R.T @ v_world
+        return state
+
+    def enforce_array(self, states: np.ndarray) -> np.ndarray:
+        touched = np.zeros(len(states), dtype=bool)
+        positions = states[:, STATE_LAYOUT["position"]]
+        contacts = self.world.query(positions, self.radius)
+        if not len(contacts):
+            return touched
+
+        touched[contacts.drone] = True
+        rows = np.nonzero(touched)[0]
+        local = np.searchsorted(rows, contacts.drone)
+        R = _get_body_to_inertial_batch(states[rows, STATE_LAYOUT["quaternion"]])
+        v_world = np.einsum("nij,nj->ni", R, states[rows, STATE_LAYOUT["velocity"]])
+
+        shift = np.zeros((len(rows), 3))
+        np.add.at(shift, local, contacts.normal * contacts.depth[:, None])
+        # Contacts are sorted by drone; remove inward velocity one contact per drone at a time, as enforce does
+        rank = np.arange(len(contacts)) - np.searchsorted(contacts.drone, contacts.drone)
+        for r in range(rank.max() + 1):
+            sel = rank == r
+            idx, normal = local[sel], contacts.normal[sel]
+            inward = np.minimum(np.einsum("ij,ij->i", v_world[idx], normal), 0.0)
+            v_world[idx] -= inward[:, None] * normal
+
+        positions[rows] += shift
+        states[rows, STATE_LAYOUT["velocity"]] = np.einsum("nji,nj->ni", R, v_world)
+        return touched
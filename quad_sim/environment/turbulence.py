@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.environment import EnvironmentEffect
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.references.bodyFixed import BodyFixed
+
+_FT = 0.3048
+MODELS = ("dryden", "von_karman")
+
+
+@dataclass(frozen=True)
+class TurbulenceSpec:
+    """
+    Turbulence intensities and scale lengths along the body x, y and z axes.
+
+    :ivar sigma: RMS gust velocities in m/s.
+    :ivar length: Turbulence scale lengths in metres.
+    """
+    sigma: Tuple[float, float, float]
+    length: Tuple[float, float, float]
+
+    def __post_init__(self):
+        if len(self.sigma) != 3 or len(self.length) != 3:
+            raise ValueError("sigma and length must have three components")
+        if min(self.sigma) < 0 or min(self.length) <= 0:
+            raise ValueError("sigma must be non-negative and length positive")
+
+    @classmethod
+    def low_altitude(cls, altitude: float, wind_speed_6m: float) -> "TurbulenceSpec":
+        """
+        MIL-F-8785C low-altitude model (below 1000 ft).
+
+        :param altitude: Height above ground in metres.
+        :type altitude: float
+        :param wind_speed_6m: Mean wind speed at 6 m (20 ft) in m/s.
+        :type wind_speed_6m: float
+        :rtype: TurbulenceSpec
+        """
+        h = max(altitude / _FT, 10.0)
+        k = 0.177 + 0.000823 * h
+        sigma_w = 0.1 * wind_speed_6m
+        sigma_uv = sigma_w / k ** 0.4
+        length_uv = h / k ** 1.2 * _FT
+        return cls(sigma=(sigma_uv, sigma_uv, sigma_w), length=(length_uv, length_uv, h * _FT))
+
+
+def _shaping_filter(model: str, sigma: float, length: float, airspeed: float, longitudinal: bool):
+    """
+    Continuous shaping filter (numerator, denominator in descending powers of s) that turns unit white
+    noise into gusts with the requested spectrum. Von Karman uses the MIL-HDBK-1797 rational approximation.
+    """
+    tau = length / airspeed
+    if model == "dryden":
+        if longitudinal:
+            return sigma * np.sqrt(2 * tau / np.pi) * np.array([1.0]), np.array([tau, 1.0])
+        gain = sigma * np.sqrt(tau / np.pi)
+        return gain * np.array([np.sqrt(3) * tau, 1.0]), np.polymul([tau, 1.0], [tau, 1.0])
+    if longitudinal:
+        gain = sigma * np.sqrt(2 * tau / np.pi)
+        return gain * np.array([0.25 * tau, 1.0]), np.array([0.1987 * tau ** 2, 1.357 * tau, 1.0])
+    gain = sigma * np.sqrt(tau / np.pi)
+    return (gain * np.array([0.3398 * tau ** 2, 2.7478 * tau, 1.0]),
+            np.array([0.1539 * tau ** 3, 1.9754 * tau ** 2, 2.9958 * tau, 1.0]))
+
+
+def _tustin(num: np.ndarray, den: np.ndarray, dt: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bilinear transform of a continuous transfer function; returns (b, a) in powers of z^-1 with a[0] == 1.
+    """
+    n = len(den) - 1
+    num = np.concatenate([np.zeros(n + 1 - len(num)), num])
+    k = 2.0 / dt
+    b, a = np.zeros(n + 1), np.zeros(n + 1)
+    for power in range(n + 1):
+        # s^power -> k^power (1 - z^-1)^power (1 + z^-1)^(n - power)
+        poly = k ** power * np.polymul(np.poly(np.ones(power)), np.poly(-np.ones(n - power)))
+        b += num[n - power] * poly
+        a += den[n - power] * poly
+    return b / a[0], a / a[0]
+
+
+class _BlockFilter:
+    """
+    Discrete IIR filter in state-space form, applied to whole blocks of samples for many channels at once.
+
+    Within a block the output is the FFT convolution of the input with the impulse response plus the free
+    response of the state carried over from the previous block, which is exact and needs no per-sample loop.
+    """
+
+    def __init__(self, b: np.ndarray, a: np.ndarray, block: int):
+        n = len(a) - 1
+        A = np.zeros((n, n))
+        A[0] = -a[1:]
+        A[1:, :-1] = np.eye(n - 1)
+        B = np.zeros(n)
+        B[0] = 1.0
+        C = b[1:] - a[1:] * b[0]
+        D = b[0]
+
+        powers = np.empty((block + 1, n, n))
+        powers[0] = np.eye(n)
+        for k in range(block):
+            powers[k + 1] = A @ powers[k]
+
+        self.impulse = np.concatenate([[D], np.einsum("i,kij,j->k", C, powers[:block - 1], B)])
+        self.free = np.einsum("i,kij->kj", C, powers[:block])  # output of the initial state, (block, n)
+        self.carry = powers[block]  # A^block
+        self.drive = np.einsum("kij,j->ik", powers[block - 1::-1], B)  # A^(block-1-j) B, (n, block)
+        self.block = block
+        self._fft_size = 1 << int(np.ceil(np.log2(2 * block)))
+        self._impulse_f = np.fft.rfft(self.impulse, self._fft_size)
+
+    def run(self, noise: np.ndarray, state: np.ndarray) -> np.ndarray:
+        """
+        Filters a block of shape (block, channels); ``state`` of shape (n, channels) is updated in place.
+        """
+        forced = np.fft.irfft(np.fft.rfft(noise, self._fft_size, axis=0) * self._impulse_f[:, None], self._fft_size, axis=0)
+        out = forced[:self.block] + self.free @ state
+        state[:] = self.carry @ state + self.drive @ noise
+        return out
+
+
+class TurbulenceBank:
+    """
+    Gust velocity generator for a swarm: one independent, seeded stream per drone.
+
+    Noise is drawn ``block`` samples at a time for every stream and filtered per axis across all streams
+    at once. Stream ``i`` only depends on ``seed`` and ``i``, so a drone sees the same turbulence whatever
+    the size of the swarm.
+    """
+
+    def __init__(
+        self,
+        spec: TurbulenceSpec,
+        dt: float,
+        streams: int = 1,
+        model: str = "dryden",
+        airspeed: float = 5.0,
+        seed: int | None = None,
+        block: int = 2048,
+    ):
+        """
+        :param spec: Intensities and scale lengths.
+        :type spec: TurbulenceSpec
+        :param dt: Sample period in seconds (the physics time step).
+        :type dt: float
+        :param streams: Number of independent streams (drones).
+        :type streams: int
+        :param model: "dryden" or "von_karman".
+        :type model: str
+        :param airspeed: Airspeed in m/s used to turn the spatial spectra into time-domain filters.
+            Multicopters hover, so a nominal value (not the instantaneous airspeed) is used.
+        :type airspeed: float
+        """
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+        if dt <= 0 or airspeed <= 0 or streams < 1 or block < 2:
+            raise ValueError("dt and airspeed must be positive, streams >= 1 and block >= 2")
+
+        self.spec = spec
+        self.dt = dt
+        self.streams = streams
+        self.model = model
+        self.block = block
+        self._rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(streams)]
+        # Discrete white noise with one-sided PSD 1 (per rad/s), as assumed by the MIL spectra
+        self._noise_std = np.sqrt(np.pi / dt)
+
+        self._filters = []
+        for axis in range(3):
+            num, den = _shaping_filter(model, spec.sigma[axis], spec.length[axis], airspeed, longitudinal=axis == 0)
+            f = _BlockFilter(*_tustin(num, den, dt), block)
+            self._filters.append((f, np.zeros((len(den) - 1, streams))))
+
+        self._gusts = np.zeros((block, streams, 3))
+        self._block_index = -1
+
+    def _generate(self) -> None:
+        noise = np.stack([rng.standard_normal((self.block, 3)) for rng in self._rngs], axis=1) * self._noise_std
+        for axis, (f, state) in enumerate(self._filters):
+            self._gusts[:, :, axis] = f.run(noise[:, :, axis], state)
+        self._block_index += 1
+
+    def sample(self, tick: int) -> np.ndarray:
+        """
+        Gust velocities of all streams at a physics tick, shape (streams, 3). Ticks must not go backwards
+        by more than the current block.
+
+        :rtype: np.ndarray
+        """
+        index, offset = divmod(tick, self.block)
+        if index < self._block_index:
+            raise ValueError(f"tick {tick} precedes the current turbulence block")
+        while self._block_index < index:
+            self._generate()
+        return self._gusts[offset]
+
+    def effect(self, stream: int | None, drag: Sequence[float] = (0.05, 0.05, 0.1)) -> "TurbulenceEffect":
+        """
+        Builds the effect of one drone reading stream ``stream`` (or of the whole swarm when None).
+
+        :rtype: TurbulenceEffect
+        """
+        return TurbulenceEffect(self, stream, drag)
+
+
+class TurbulenceEffect(EnvironmentEffect):
+    """
+    Gust force on one drone. Gusts are body-axis velocities (x longitudinal, z vertical) and act through the
+    quadratic drag ``drag * v * |v|``; only the change caused by the gust is returned, so the effect
+    composes with a separate still-air drag model.
+
+    With ``stream=None`` the effect serves a whole swarm on the vectorised path: row ``i`` of the packed
+    states reads stream ``i``.
+    """
+    vectorized = True
+
+    def __init__(self, bank: TurbulenceBank, stream: int | None = 0, drag: Sequence[float] = (0.05, 0.05, 0.1)):
+        if not isinstance(bank, TurbulenceBank):
+            raise TypeError(f"bank must be a TurbulenceBank, got {type(bank)}")
+        if stream is not None and not 0 <= stream < bank.streams:
+            raise ValueError(f"stream must be in [0, {bank.streams}), got {stream}")
+        self.bank = bank
+        self.stream = stream
+        self.drag = np.asarray(drag, dtype=np.float64).reshape(3)
+        self.gust = np.zeros(3) if stream is not None else np.zeros((bank.streams, 3))
+
+    def advance(self, time: float) -> None:
+        gusts = self.bank.sample(int(round(time / self.bank.dt)))
+        self.gust = gusts[self.stream] if self.stream is not None else gusts
+
+    def forces(self, states: np.ndarray) -> np.ndarray:
+        """
+        Body-frame gust forces for packed states of shape (N, STATE_SIZE).
+
+        :rtype: np.ndarray
+        """
+        gust = self.gust if self.stream is not None else self.gust[:len(states)]
+        velocity = states[:, STATE_LAYOUT["velocity"]]
+        still, gusty = -velocity, gust - velocity
+        return self.drag * (gusty * np.abs(gusty) - still * np.abs(still))
+
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        force += self.forces(states)
+
+    def apply(self, state: StateVector) -> Tuple[BodyFixed, BodyFixed]:
+        force = self.forces(state.to_array()[None, :])[0]
+        return BodyFixed.from_Array(force, flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from quad_sim.bases.environment import EnvironmentEffect
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch
+from quad_sim.references.bodyFixed import BodyFixed
+
+# The 16 corners of a (t, x, y, z) interpolation cell
+_CORNERS = np.array([(t, x, y, z) for t in (0, 1) for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.intp)
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+
+class WindGrid:
+    """
+    Wind velocity sampled on a regular (t, x, y, z) grid, stored as an array of shape (nt, nx, ny, nz, 3)
+    in the ``EarthFixed`` frame.
+
+    The array is usually a read-only memory map of a ``.npy`` file. It is read in tiles that overlap
+    by one sample, so every interpolation cell lies inside a single tile. The most recently used tiles
+    are kept in an LRU cache, and only that cache has to fit in RAM, not the whole domain.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        origin: Sequence[float],
+        spacing: Sequence[float],
+        dt: float,
+        t0: float = 0.0,
+        tile: Tuple[int, int] = (4, 16),
+        max_tiles: int = 64,
+    ):
+        """
+        :param data: Wind samples of shape (nt, nx, ny, nz, 3).
+        :type data: np.ndarray
+        :param origin: Position of sample (0, 0, 0) in metres.
+        :param spacing: Grid spacing along x, y and z in metres.
+        :param dt: Time between snapshots in seconds.
+        :type dt: float
+        :param t0: Time of the first snapshot in seconds.
+        :type t0: float
+        :param tile: Tile extent in samples along time and along each spatial axis.
+        :param max_tiles: Number of tiles kept in the LRU cache.
+        :type max_tiles: int
+        """
+        if data.ndim != 5 or data.shape[-1] != 3:
+            raise ValueError(f"data must have shape (nt, nx, ny, nz, 3), got {data.shape}")
+        if dt <= 0 or np.any(np.asarray(spacing) <= 0):
+            raise ValueError("dt and spacing must be positive")
+        if min(tile) < 1 or max_tiles < 1:
+            raise ValueError("tile extents and max_tiles must be at least 1")
+
+        self.data = data
+        self.origin = np.asarray(origin, dtype=np.float64).reshape(3)
+        self.inv_spacing = 1.0 / np.asarray(spacing, dtype=np.float64).reshape(3)
+        self.dt = float(dt)
+        self.t0 = float(t0)
+        self.max_tiles = max_tiles
+
+        self._shape = np.array(data.shape[:4], dtype=np.intp)
+        self._tile = np.array([tile[0], tile[1], tile[1], tile[1]], dtype=np.intp)
+        # Largest valid lower cell corner per axis (0 for single-sample axes)
+        self._last = np.maximum(self._shape - 2, 0)
+        self._cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> "WindGrid":
+        """
+        Memory-maps a grid written by ``WindGrid.write``.
+
+        :rtype: WindGrid
+        """
+        with open(_metadata_path(path)) as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), meta["origin"], meta["spacing"], meta["dt"], meta["t0"], **kwargs)
+
+    @staticmethod
+    def write(path: str, wind: np.ndarray, origin: Sequence[float], spacing: Sequence[float], dt: float, t0: float = 0.0) -> None:
+        """
+        Stores a wind grid (e.g. resampled from a CFD export) as ``path`` (.npy) plus a JSON sidecar.
+        """
+        np.save(path, np.asarray(wind, dtype=np.float32))
+        with open(_metadata_path(path), "w") as f:
+            json.dump({"origin": list(map(float, origin)), "spacing": list(map(float, spacing)), "dt": dt, "t0": t0}, f)
+
+    def _get_tile(self, key: tuple) -> np.ndarray:
+        tile = self._cache.get(key)
+        if tile is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return tile
+
+        self.misses += 1
+        lo = np.array(key, dtype=np.intp) * self._tile
+        region = tuple(slice(a, b) for a, b in zip(lo, np.minimum(lo + self._tile + 1, self._shape)))
+        tile = np.ascontiguousarray(self.data[region], dtype=np.float64)
+        self._cache[key] = tile
+        if len(self._cache) > self.max_tiles:
+            self._cache.popitem(last=False)
+        return tile
+
+    def sample(self, points: np.ndarray, time: float) -> np.ndarray:
+        """
+        Interpolates the wind at many points at once (trilinear in space, linear in time).
+        Points and times outside the grid are clamped to its boundary.
+
+        :param points: ``EarthFixed`` positions of shape (N, 3).
+        :type points: np.ndarray
+        :param time: Simulation time in seconds.
+        :type time: float
+        :return: Wind velocities of shape (N, 3).
+        :rtype: np.ndarray
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        coords = np.empty((len(points), 4))
+        coords[:, 0] = (time - self.t0) / self.dt
+        coords[:, 1:] = (points - self.origin) * self.inv_spacing
+        coords = np.clip(coords, 0, self._shape - 1)
+
+        base = np.minimum(np.floor(coords).astype(np.intp), self._last)
+        frac = np.clip(coords - base, 0.0, 1.0)
+        # Weight of every corner: product over the four axes of (1 - f) or f
+        weights = np.prod(np.where(_CORNERS[None], frac[:, None, :], 1.0 - frac[:, None, :]), axis=2)
+
+        keys = base // self._tile
+        out = np.empty((len(points), 3))
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for k, key in enumerate(map(tuple, unique)):
+            rows = np.nonzero(inverse == k)[0]
+            tile = self._get_tile(key)
+            local = base[rows, None, :] - np.array(key) * self._tile + _CORNERS[None]
+            local = np.minimum(local, np.array(tile.shape[:4]) - 1)
+            values = tile[local[..., 0], local[..., 1], local[..., 2], local[..., 3]]
+            out[rows] = np.einsum("mc,mci->mi", weights[rows], values)
+        return out
+
+
+class GriddedWindEffect(EnvironmentEffect):
+    """
+    Aerodynamic force of a spatially and temporally varying wind field.
+
+    The air acts along every body axis through the quadratic drag ``drag * v * |v|``, where ``v`` is the
+    velocity of the air relative to the drone in the ``BodyFixed`` frame. Only the change caused by the
+    wind is returned (the drag in moving air minus the drag in still air), so the effect composes with a
+    separate still-air drag model such as ``DragEffect`` and vanishes where the field is calm.
+    """
+    vectorized = True
+
+    def __init__(self, grid: WindGrid, drag: Sequence[float] = (0.05, 0.05, 0.1)):
+        """
+        :param grid: The wind field.
+        :type grid: WindGrid
+        :param drag: Quadratic drag coefficients along the body x, y and z axes in N/(m/s)^2.
+        """
+        if not isinstance(grid, WindGrid):
+            raise TypeError(f"grid must be a WindGrid, got {type(grid)}")
+        self.grid = grid
+        self.drag = np.asarray(drag, dtype=np.float64).reshape(3)
+        self.time = 0.0
+
+    def advance(self, time: float) -> None:
+        self.time = time
+
+    def forces(self, states: np.ndarray) -> np.ndarray:
+        """
+        Body-frame wind force increments for packed states of shape (N, STATE_SIZE).
+
+        :rtype: np.ndarray
+        """
+        wind = self.grid.sample(states[:, STATE_LAYOUT["position"]], self.time)
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        velocity = states[:, STATE_LAYOUT["velocity"]]
+        still, windy = -velocity, np.einsum("nji,nj->ni", R, wind) - velocity
+        return self.drag * (windy * np.abs(windy) - still * np.abs(still))
+
+    def apply_array(self, states: np.ndarray, force: np.ndarray, moment: np.ndarray) -> None:
+        force += self.forces(states)
+
+    def apply(self, state: StateVector) -> Tuple[BodyFixed, BodyFixed]:
+        force = self.forces(state.to_array()[None, :])[0]
+        return BodyFixed.from_Array(force, flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
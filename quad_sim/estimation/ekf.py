@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.funcs import _get_body_to_inertial_batch, _quat_multiply_batch
+
+GRAVITY = 9.81
+# Error-state layout: position, velocity (EarthFixed), attitude (body-frame rotation vector), accel and gyro biases
+ERROR_LAYOUT = {
+    "position": slice(0, 3),
+    "velocity": slice(3, 6),
+    "attitude": slice(6, 9),
+    "accel_bias": slice(9, 12),
+    "gyro_bias": slice(12, 15),
+}
+ERROR_SIZE = 15
+
+
+def _skew(v: np.ndarray) -> np.ndarray:
+    """
+    Cross-product matrices of shape (N, 3, 3) of vectors of shape (N, 3).
+    """
+    S = np.zeros(v.shape[:-1] + (3, 3))
+    S[..., 0, 1], S[..., 0, 2] = -v[..., 2], v[..., 1]
+    S[..., 1, 0], S[..., 1, 2] = v[..., 2], -v[..., 0]
+    S[..., 2, 0], S[..., 2, 1] = -v[..., 1], v[..., 0]
+    return S
+
+
+def _rotation_quaternion(theta: np.ndarray) -> np.ndarray:
+    """
+    Unit quaternions of rotation vectors of shape (N, 3).
+    """
+    angle = np.linalg.norm(theta, axis=1)
+    half = 0.5 * angle
+    # sin(x/2)/x, with its limit 1/2 at 0
+    scale = np.where(angle > 1e-12, np.sin(half) / np.where(angle > 1e-12, angle, 1.0), 0.5)
+    return np.column_stack([np.cos(half), theta * scale[:, None]])
+
+
+class InertialEKF:
+    """
+    Error-state extended Kalman filter for attitude, position and velocity of N drones.
+
+    The nominal state (position, velocity, attitude quaternion, accelerometer and gyroscope biases) is
+    propagated with IMU readings; the 15-element error state carries the covariance, with the attitude error
+    as a small body-frame rotation. All drones share preallocated (N, ...) arrays:
+
+    - ``predict`` propagates every drone with batched matrix products written into reused buffers,
+    - ``update`` fuses any linearised measurement for a subset of drones with the Joseph-form covariance
+      update, which keeps P symmetric positive definite.
+
+    ``update_gps``, ``update_barometer`` and ``update_magnetometer`` wrap it for the sensors of
+    ``quad_sim.sensors.models``.
+    """
+
+    def __init__(
+        self,
+        n: int = 1,
+        accel_noise: float = 0.05,
+        gyro_noise: float = 0.005,
+        accel_bias_walk: float = 0.001,
+        gyro_bias_walk: float = 1e-4,
+        initial_sigma: Sequence[float] = (1.0, 0.5, 0.1, 0.1, 0.01),
+        gravity: float = GRAVITY,
+    ):
+        """
+        :param n: Number of drones.
+        :type n: int
+        :param accel_noise: Accelerometer white noise density in m/s^2/sqrt(Hz).
+        :param gyro_noise: Gyroscope white noise density in rad/s/sqrt(Hz).
+        :param accel_bias_walk: Accelerometer bias random walk in m/s^2/sqrt(s).
+        :param gyro_bias_walk: Gyroscope bias random walk in rad/s/sqrt(s).
+        :param initial_sigma: Initial standard deviations of the position, velocity, attitude, accelerometer bias
+            and gyroscope bias errors.
+        :param gravity: Gravitational acceleration in m/s^2.
+        """
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+        if len(initial_sigma) != 5:
+            raise ValueError("initial_sigma needs one value per error block")
+
+        self.n = n
+        self.gravity = np.array([0.0, 0.0, -gravity])
+        self._spectral = np.repeat(np.square([0.0, accel_noise, gyro_noise, accel_bias_walk, gyro_bias_walk]), 3)
+        self._initial = np.repeat(np.square(np.asarray(initial_sigma, dtype=np.float64)), 3)
+
+        self.position = np.zeros((n, 3))
+        self.velocity = np.zeros((n, 3))
+        self.quaternion = np.tile([1.0, 0.0, 0.0, 0.0], (n, 1))
+        self.accel_bias = np.zeros((n, 3))
+        self.gyro_bias = np.zeros((n, 3))
+        self.omega = np.zeros((n, 3))
+        self.P = np.zeros((n, ERROR_SIZE, ERROR_SIZE))
+
+        self._F = np.zeros((n, ERROR_SIZE, ERROR_SIZE))
+        self._FP = np.empty((n, ERROR_SIZE, ERROR_SIZE))
+        self._eye = np.eye(ERROR_SIZE)
+        self._packed = np.zeros((1, STATE_SIZE))
+        self.reset()
+
+    def reset(self, states: np.ndarray | None = None, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Re-initialises drones, optionally from packed states (e.g. the true initial states).
+
+        :param states: Packed states of shape (len(rows), STATE_SIZE); level at the origin when omitted.
+        :param rows: The drones to reset; all by default.
+        """
+        if states is None:
+            self.position[rows] = 0.0
+            self.velocity[rows] = 0.0
+            self.quaternion[rows] = [1.0, 0.0, 0.0, 0.0]
+        else:
+            R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+            self.position[rows] = states[:, STATE_LAYOUT["position"]]
+            self.velocity[rows] = np.einsum("nij,nj->ni", R, states[:, STATE_LAYOUT["velocity"]])
+            self.quaternion[rows] = states[:, STATE_LAYOUT["quaternion"]]
+        self.accel_bias[rows] = 0.0
+        self.gyro_bias[rows] = 0.0
+        self.omega[rows] = 0.0
+        self.P[rows] = np.diag(self._initial)
+
+    def predict(self, imu: np.ndarray, dt: float) -> None:
+        """
+        Propagates every drone by ``dt`` with IMU readings.
+
+        :param imu: Readings of shape (N, 6): specific force and angular rate in the body frame.
+        :type imu: np.ndarray
+        :param dt: Time step in seconds.
+        :type dt: float
+        """
+        force = imu[:, 0:3] - self.accel_bias
+        self.omega[:] = imu[:, 3:6] - self.gyro_bias
+        R = _get_body_to_inertial_batch(self.quaternion)
+        accel = np.einsum("nij,nj->ni", R, force) + self.gravity
+
+        self.position += self.velocity * dt + 0.5 * accel * dt * dt
+        self.velocity += accel * dt
+        q = _quat_multiply_batch(self.quaternion, _rotation_quaternion(self.omega * dt))
+        self.quaternion[:] = q / np.linalg.norm(q, axis=1, keepdims=True)
+
+        # First-order transition of the error state; only the non-constant blocks are rewritten
+        F = self._F
+        F[:] = self._eye
+        F[:, 0:3, 3:6] = self._eye[:3, :3] * dt
+        np.matmul(R, _skew(force), out=F[:, 3:6, 6:9])
+        F[:, 3:6, 6:9] *= -dt
+        F[:, 3:6, 9:12] = -R * dt
+        F[:, 6:9, 6:9] -= _skew(self.omega) * dt
+        F[:, 6:9, 12:15] = -self._eye[:3, :3] * dt
+
+        np.matmul(F, self.P, out=self._FP)
+        np.matmul(self._FP, F.transpose(0, 2, 1), out=self.P)
+        diagonal = np.einsum("nii->ni", self.P)
+        diagonal += self._spectral * dt
+
+    def update(self, residual: np.ndarray, H: np.ndarray, noise: np.ndarray, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Fuses a linearised measurement ``z = h(x) + H dx + v`` for some drones and injects the correction.
+
+        :param residual: Innovations ``z - h(x)`` of shape (K, m), one row per updated drone.
+        :param H: Jacobians with respect to the error state, (m, ERROR_SIZE) or (K, m, ERROR_SIZE).
+        :param noise: Measurement noise variances (m,) or covariance (m, m).
+        :param rows: The drones the rows belong to; all by default.
+        """
+        P = self.P[rows]
+        noise = np.diag(noise) if np.ndim(noise) == 1 else np.asarray(noise)
+        H = np.broadcast_to(H, (len(P),) + np.shape(H)[-2:])
+        Ht = H.transpose(0, 2, 1)
+
+        PHt = P @ Ht
+        S = H @ PHt + noise
+        K = np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)  # P H^T S^-1, S symmetric
+        dx = np.einsum("nij,nj->ni", K, residual)
+
+        A = self._eye - K @ H
+        self.P[rows] = A @ P @ A.transpose(0, 2, 1) + K @ noise @ K.transpose(0, 2, 1)
+
+        self.position[rows] += dx[:, ERROR_LAYOUT["position"]]
+        self.velocity[rows] += dx[:, ERROR_LAYOUT["velocity"]]
+        q = _quat_multiply_batch(self.quaternion[rows], _rotation_quaternion(dx[:, ERROR_LAYOUT["attitude"]]))
+        self.quaternion[rows] = q / np.linalg.norm(q, axis=1, keepdims=True)
+        self.accel_bias[rows] += dx[:, ERROR_LAYOUT["accel_bias"]]
+        self.gyro_bias[rows] += dx[:, ERROR_LAYOUT["gyro_bias"]]
+
+    def update_gps(self, fix: np.ndarray, noise: Sequence[float] = (0.25, 0.25, 1.0, 0.01, 0.01, 0.04), rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Fuses GPS fixes: rows of [position, velocity] in the ``EarthFixed`` frame.
+        """
+        H = np.zeros((6, ERROR_SIZE))
+        H[:, 0:6] = np.eye(6)
+        residual = fix - np.concatenate([self.position[rows], self.velocity[rows]], axis=1)
+        self.update(residual, H, np.asarray(noise, dtype=np.float64), rows)
+
+    def update_barometer(self, altitude: np.ndarray, noise: float = 0.01, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Fuses barometric altitudes of shape (K, 1).
+        """
+        H = np.zeros((1, ERROR_SIZE))
+        H[0, 2] = 1.0
+        self.update(altitude - self.position[rows, 2:3], H, np.array([noise]), rows)
+
+    def update_magnetometer(self, field: np.ndarray, reference: Sequence[float], noise: float = 2.5e-5, rows: np.ndarray | slice = slice(None)) -> None:
+        """
+        Fuses body-frame magnetic field readings of shape (K, 3), given the Earth field ``reference``.
+        """
+        R = _get_body_to_inertial_batch(self.quaternion[rows])
+        predicted = np.einsum("nji,j->ni", R, np.asarray(reference, dtype=np.float64))
+        H = np.zeros((len(R), 3, ERROR_SIZE))
+        H[:, :, 6:9] = _skew(predicted)
+        self.update(field - predicted, H, np.full(3, noise), rows)
+
+    def estimate_array(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        The estimates as packed states of shape (N, STATE_SIZE), ready for the array pilots.
+
+        :rtype: np.ndarray
+        """
+        if out is None:
+            out = np.zeros((self.n, STATE_SIZE))
+        R = _get_body_to_inertial_batch(self.quaternion)
+        out[:, STATE_LAYOUT["position"]] = self.position
+        out[:, STATE_LAYOUT["velocity"]] = np.einsum("nji,nj->ni", R, self.velocity)
+        out[:, STATE_LAYOUT["quaternion"]] = self.quaternion
+        out[:, STATE_LAYOUT["omega"]] = self.omega
+        return out
+
+    def estimate(self, row: int = 0) -> StateVector:
+        """
+        The estimate of one drone as a StateVector.
+
+        :rtype: StateVector
+        """
+        self._packed[0] = self.estimate_array()[row]
+        return StateVector.from_array(self._packed[0])
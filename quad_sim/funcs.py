@@ -150,9 +150,57 @@ def _get_inertial_to_body(quaternion_orientation: np.ndarray) -> np.ndarray:
     return _get_body_to_inertial(quaternion_orientation).T
 
 
+def _get_body_to_inertial_batch(quaternions: np.ndarray) -> np.ndarray:
+    """
+    Vectorised version of ``_get_body_to_inertial`` for many orientations at once.
+
+    :param quaternions: Array of shape (N, 4) holding (w, x, y, z) per row.
+    :type quaternions: np.ndarray
+    :return: Array of shape (N, 3, 3) with one body to inertial rotation matrix per row.
+    :rtype: np.ndarray
+    """
+    q = np.asarray(quaternions, dtype=np.float64)
+    if q.ndim != 2 or q.shape[1] != 4:
+        raise ValueError(f"quaternions must have shape (N, 4), got {q.shape}")
+
+    e0, e1, e2, e3 = q.T
+    R = np.empty((q.shape[0], 3, 3), dtype=np.float64)
+    R[:, 0, 0] = e1**2 + e0**2 - e2**2 - e3**2
+    R[:, 0, 1] = 2 * (e1 * e2 - e3 * e0)
+    R[:, 0, 2] = 2 * (e1 * e3 + e2 * e0)
+    R[:, 1, 0] = 2 * (e1 * e2 + e3 * e0)
+    R[:, 1, 1] = e2**2 + e0**2 - e1**2 - e3**2
+    R[:, 1, 2] = 2 * (e2 * e3 - e1 * e0)
+    R[:, 2, 0] = 2 * (e1 * e3 - e2 * e0)
+    R[:, 2, 1] = 2 * (e2 * e3 + e1 * e0)
+    R[:, 2, 2] = e3**2 + e0**2 - e1**2 - e2**2
+    return R
+
+
+def _quat_multiply_batch(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Hamilton products of two arrays of quaternions.
+
+    :param a: Array of shape (N, 4) holding (w, x, y, z) per row.
+    :param b: Array of shape (N, 4) holding (w, x, y, z) per row.
+    :return: Array of shape (N, 4) with the products a * b.
+    :rtype: np.ndarray
+    """
+    aw, ax, ay, az = a.T
+    bw, bx, by, bz = b.T
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=1)
+
+
 def compute_aB(
     mass: int | float, F_B: BodyFixed, omega_B: BodyFixed, vel_B: BodyFixed
 ) -> BodyFixed:
+    from quad_sim.references.bodyFixed import BodyFixed  # deferred: bodyFixed imports this module
+
     # --- mass checks ---
     if not isinstance(mass, (int, float)):
         raise TypeError("mass must be an int or float")
@@ -199,6 +247,8 @@ def compute_aB(
 def compute_alphaB(
     inertia: np.ndarray, M_B: BodyFixed, omega_B: BodyFixed
 ) -> BodyFixed:
+    from quad_sim.references.bodyFixed import BodyFixed  # deferred: bodyFixed imports this module
+
     # --- inertia checks ---
     if not isinstance(inertia, np.ndarray):
         raise TypeError("inertia must be a numpy ndarray")
@@ -240,6 +290,10 @@ def compute_alphaB(
 
 
 def compute_q_rate(quaternion: Quaternion, omega_B: BodyFixed) -> Quaternion:
+    # deferred: both modules import this one
+    from quad_sim.orientation.quaternion import Quaternion
+    from quad_sim.references.bodyFixed import BodyFixed
+
     # --- quaternion checks ---
     quaternion = quaternion.normalized()
 
@@ -266,4 +320,5 @@ def compute_q_rate(quaternion: Quaternion, omega_B: BodyFixed) -> Quaternion:
         dtype=float,
     )
 
-    return Quaternion.unpackArray( 0.5 * (mat @ quaternion.as_np()) )
\ No newline at end of file
+    # A rate is not a unit quaternion, so it must not go through unpackArray (which normalises)
+    return Quaternion(*(0.5 * (mat @ quaternion.as_np())).ravel())
\ No newline at end of file
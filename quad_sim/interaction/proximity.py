@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from quad_sim.bases.drone import DroneBase
+from quad_sim.bases.interaction import InteractionModel
+from quad_sim.bases.state import STATE_LAYOUT
+from quad_sim.funcs import _get_body_to_inertial_batch
+
+# Cell coordinates are packed into 21 bits each, giving exact (collision free) keys for |cell| < 2**20
+_BITS = 21
+_BIAS = 1 << (_BITS - 1)
+_OFFSETS = np.array([(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)], dtype=np.int64)
+
+
+class SpatialHash:
+    """
+    Uniform-grid spatial hash over a set of points, stored in CSR form (points sorted by cell key).
+
+    Building is one vectorised sort, and all-pairs radius queries look up the 27 surrounding cells of every
+    point with ``searchsorted``, so the cost is O(N log N + pairs) rather than O(N^2).
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = float(cell_size)
+        self.points = np.zeros((0, 3))
+        self._cells = np.zeros((0, 3), dtype=np.int64)
+        self._order = np.zeros(0, dtype=np.intp)
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._starts = np.zeros(0, dtype=np.intp)
+        self._counts = np.zeros(0, dtype=np.intp)
+
+    @staticmethod
+    def _key(cells: np.ndarray) -> np.ndarray:
+        c = cells + _BIAS
+        return (c[..., 0] << (2 * _BITS)) | (c[..., 1] << _BITS) | c[..., 2]
+
+    def build(self, points: np.ndarray) -> None:
+        """
+        Rebuilds the hash for a new set of points.
+
+        :param points: Positions of shape (N, 3).
+        :type points: np.ndarray
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f"points must have shape (N, 3), got {points.shape}")
+
+        self.points = points
+        self._cells = np.floor(points / self.cell_size).astype(np.int64)
+        if np.any(np.abs(self._cells) >= _BIAS):
+            raise ValueError("points are too far from the origin for the chosen cell size")
+
+        keys = self._key(self._cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys, self._starts, self._counts = np.unique(keys[self._order], return_index=True, return_counts=True)
+
+    def _lookup(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the occupied cells among ``cells`` and returns (query rows, CSR starts, CSR counts).
+        """
+        keys = self._key(cells)
+        slot = np.searchsorted(self._keys, keys)
+        slot_c = np.minimum(slot, len(self._keys) - 1)
+        hit = (slot < len(self._keys)) & (self._keys[slot_c] == keys)
+        rows = np.nonzero(hit)[0]
+        return rows, self._starts[slot_c[hit]], self._counts[slot_c[hit]]
+
+    def _expand(self, rows, starts, counts) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Expands CSR ranges into flat (query row, point index) candidate pairs.
+        """
+        total = int(counts.sum())
+        base = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.repeat(rows, counts), self._order[base + np.arange(total)]
+
+    def query_pairs(self, radius: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds every unordered pair of points closer than ``radius``.
+
+        :param radius: Query radius, at most the cell size.
+        :type radius: float
+        :return: Index arrays (I, J) with I < J and the matching distances.
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        if radius > self.cell_size:
+            raise ValueError(f"radius ({radius}) must not exceed the cell size ({self.cell_size})")
+        if len(self.points) < 2:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, np.zeros(0)
+
+        I, J = [], []
+        for offset in _OFFSETS:
+            i, j = self._expand(*self._lookup(self._cells + offset))
+            keep = i < j
+            I.append(i[keep])
+            J.append(j[keep])
+        I, J = np.concatenate(I), np.concatenate(J)
+
+        d = np.linalg.norm(self.points[I] - self.points[J], axis=1)
+        close = d < radius
+        return I[close], J[close], d[close]
+
+    def query_ball(self, point: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Returns the indices of all points closer than ``radius`` to ``point``.
+
+        :rtype: np.ndarray
+        """
+        if radius > self.cell_size:
+            raise ValueError(f"radius ({radius}) must not exceed the cell size ({self.cell_size})")
+        if len(self.points) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        point = np.asarray(point, dtype=np.float64).reshape(3)
+        cells = np.floor(point / self.cell_size).astype(np.int64) + _OFFSETS
+        _, j = self._expand(*self._lookup(cells))
+        return j[np.linalg.norm(self.points[j] - point, axis=1) < radius]
+
+
+@dataclass(frozen=True)
+class Contacts:
+    """
+    Propeller tip sphere contacts between pairs of drones (row indices into the packed states).
+    ``depth`` is the deepest sphere overlap of the pair in metres.
+    """
+    i: np.ndarray
+    j: np.ndarray
+    depth: np.ndarray
+
+    def __len__(self):
+        return len(self.i)
+
+
+class SwarmProximity(InteractionModel):
+    """
+    Per-tick neighbour lookup and collision detection for a swarm.
+
+    The broad phase hashes the ``EarthFixed`` positions of all drones; the narrow phase only runs on pairs
+    whose bounding spheres overlap and tests the propeller tip spheres (from ``MotorBase.locate_propeller_tips``)
+    of both drones against each other.
+    """
+
+    def __init__(self, tips: np.ndarray, tip_radius: float, neighbor_radius: float):
+        """
+        :param tips: Body-frame propeller tip positions of shape (K, 3), shared by all drones.
+        :type tips: np.ndarray
+        :param tip_radius: Radius of the sphere around every tip.
+        :type tip_radius: float
+        :param neighbor_radius: Radius of the neighbour (separation) query.
+        :type neighbor_radius: float
+        """
+        tips = np.asarray(tips, dtype=np.float64).reshape(-1, 3)
+        if tip_radius < 0 or neighbor_radius <= 0:
+            raise ValueError("tip_radius must be non-negative and neighbor_radius positive")
+
+        self.tips = tips
+        self.tip_radius = float(tip_radius)
+        self.neighbor_radius = float(neighbor_radius)
+        # Radius of the sphere (around the CG) enclosing every tip sphere of a drone
+        self.bound_radius = float(np.max(np.linalg.norm(tips, axis=1), initial=0.0)) + self.tip_radius
+        self.hash = SpatialHash(max(self.neighbor_radius, 2 * self.bound_radius))
+
+        self.drone_ids: List[str] = []
+        self.pairs = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0))
+        self.contacts = Contacts(np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0))
+
+    @classmethod
+    def from_drone(cls, drone: DroneBase, tip_radius: float, neighbor_radius: float) -> "SwarmProximity":
+        """
+        Builds the model from the motor layout of a representative drone of the swarm.
+
+        :rtype: SwarmProximity
+        """
+        tips = [tip.vec[:, 0] for m in drone.model.motors for tip in m.locate_propeller_tips().values()]
+        return cls(np.array(tips), tip_radius, neighbor_radius)
+
+    def update(self, drone_ids: List[str], states: np.ndarray) -> None:
+        self.drone_ids = list(drone_ids)
+        self.hash.build(states[:, STATE_LAYOUT["position"]])
+
+        I, J, d = self.hash.query_pairs(self.hash.cell_size)
+        near = d < self.neighbor_radius
+        self.pairs = (I[near], J[near], d[near])
+
+        overlap = d < 2 * self.bound_radius
+        self.contacts = self._narrow_phase(states, I[overlap], J[overlap])
+
+    def _narrow_phase(self, states: np.ndarray, I: np.ndarray, J: np.ndarray) -> Contacts:
+        if len(I) == 0 or len(self.tips) == 0:
+            return Contacts(I, J, np.zeros(len(I)))
+
+        involved, inverse = np.unique(np.concatenate([I, J]), return_inverse=True)
+        sub = states[involved]
+        R = _get_body_to_inertial_batch(sub[:, STATE_LAYOUT["quaternion"]])
+        world = sub[:, None, STATE_LAYOUT["position"]] + np.einsum("nij,kj->nki", R, self.tips)
+
+        a, b = world[inverse[: len(I)]], world[inverse[len(I):]]
+        gap = np.linalg.norm(a[:, :, None, :] - b[:, None, :, :], axis=-1).min(axis=(1, 2))
+        depth = 2 * self.tip_radius - gap
+        hit = depth > 0
+        return Contacts(I[hit], J[hit], depth[hit])
+
+    def neighbors_of(self, index: int) -> np.ndarray:
+        """
+        Returns the row indices of the neighbours of a drone found in the last update.
+
+        :rtype: np.ndarray
+        """
+        I, J, _ = self.pairs
+        return np.concatenate([J[I == index], I[J == index]])
@@ -0,0 +1,103 @@
+import math
+
+
+class SimClock:
+    """
+    Deterministic fixed-rate simulation clock.
+
+    Time is derived from an integer tick counter rather than accumulated with ``+= dt``,
+    so two runs with the same rate always see bit-identical timestamps.
+    """
+
+    def __init__(self, rate: float):
+        """
+        :param rate: The base (physics) rate of the clock in Hz.
+        :type rate: float
+        """
+        if not isinstance(rate, (int, float)):
+            raise TypeError(f"rate must be a number, got {type(rate)}")
+        if rate <= 0 or not math.isfinite(rate):
+            raise ValueError(f"rate must be positive and finite, got {rate}")
+
+        self._rate = float(rate)
+        self._tick = 0
+
+    @property
+    def rate(self) -> float:
+        """
+        The base rate of the clock in Hz.
+
+        :rtype: float
+        """
+        return self._rate
+
+    @property
+    def dt(self) -> float:
+        """
+        The base time step of the clock in seconds.
+
+        :rtype: float
+        """
+        return 1.0 / self._rate
+
+    @property
+    def tick(self) -> int:
+        """
+        The number of base ticks elapsed since the clock was started (or reset).
+
+        :rtype: int
+        """
+        return self._tick
+
+    @property
+    def time(self) -> float:
+        """
+        The current simulation time in seconds.
+
+        :rtype: float
+        """
+        return self._tick / self._rate
+
+    def advance(self) -> int:
+        """
+        Advances the clock by one base tick.
+
+        :return: The new tick count.
+        :rtype: int
+        """
+        self._tick += 1
+        return self._tick
+
+    def reset(self) -> None:
+        """
+        Resets the clock back to tick zero.
+        """
+        self._tick = 0
+
+    def ticks_for(self, rate: float) -> int:
+        """
+        Converts a loop rate into the number of base ticks between two executions of that loop.
+
+        :param rate: The loop rate in Hz. Must divide the clock rate evenly.
+        :type rate: float
+        :return: The loop period expressed in base ticks.
+        :rtype: int
+        :raises ValueError: If the rate is faster than the clock or does not divide it evenly.
+        """
+        if not isinstance(rate, (int, float)):
+            raise TypeError(f"rate must be a number, got {type(rate)}")
+        if rate <= 0 or not math.isfinite(rate):
+            raise ValueError(f"rate must be positive and finite, got {rate}")
+        if rate > self._rate * (1 + 1e-9):
+            raise ValueError(f"rate {rate} Hz is faster than the clock rate {self._rate} Hz")
+
+        ratio = self._rate / rate
+        divisor = round(ratio)
+        if not math.isclose(ratio, divisor, rel_tol=1e-9):
+            raise ValueError(
+                f"rate {rate} Hz does not divide the clock rate {self._rate} Hz into a whole number of ticks"
+            )
+        return divisor
+
+    def __str__(self):
+        return f"SimClock at {self._rate} Hz, tick {self._tick} (t = {self.time:.6f} s)"
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+from quad_sim.bases.controller import ControllerBase
+
+if TYPE_CHECKING:
+    from quad_sim.bases.sim import NCopterBase
+
+
+class InputSource(ABC):
+    """
+    An I/O-bound source of controller inputs (gamepad server, network socket, operator console, ...).
+    """
+
+    @abstractmethod
+    async def read(self) -> tuple[dict[str, float], dict[str, float]]:
+        """
+        Fetches the latest controller inputs.
+
+        :return: A tuple of (axis values, switch values) keyed by channel/switch id.
+        :rtype: tuple[dict[str, float], dict[str, float]]
+        """
+        pass
+
+
+class TelemetrySink(ABC):
+    """
+    An I/O-bound consumer of simulation snapshots (network publisher, database writer, ...).
+    """
+
+    @abstractmethod
+    async def publish(self, frame: TelemetryFrame) -> None:
+        """
+        Consumes one telemetry frame.
+
+        :param frame: The snapshot to publish.
+        :type frame: TelemetryFrame
+        """
+        pass
+
+
+@dataclass(frozen=True)
+class TelemetryFrame:
+    """
+    Snapshot of the swarm handed to the telemetry sinks.
+
+    :ivar tick: Physics tick the snapshot was taken at.
+    :ivar time: Simulation time in seconds.
+    :ivar drone_ids: Ids of the drones, in the row order of ``states``.
+    :ivar states: Packed states of shape (N, STATE_SIZE); a copy, so it stays valid while a sink awaits.
+    """
+    tick: int
+    time: float
+    drone_ids: list[str]
+    states: np.ndarray
+
+
+class BufferedController(ControllerBase):
+    """
+    A ControllerBase whose values are filled asynchronously from an InputSource.
+
+    ``get_axis_value`` and ``get_switch_value`` only read the last buffered values, so the
+    physics loop never waits on I/O. The controller reports itself disconnected once its
+    values are older than ``timeout`` seconds (wall clock).
+    """
+
+    def __init__(self, source: InputSource, channels: List[str], switches: List[str] = (), timeout: float = 0.5):
+        if not isinstance(source, InputSource):
+            raise TypeError(f"source must be an InputSource, got {type(source)}")
+        if timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout}")
+
+        self.source = source
+        self.timeout = timeout
+        self.channels = {ch: 0.0 for ch in channels}
+        self.switches = {sw: 0.0 for sw in switches}
+        self._min = {ch: -1.0 for ch in channels}
+        self._max = {ch: 1.0 for ch in channels}
+        self._trim = {ch: 0.0 for ch in channels}
+        self._offset = {ch: 0.0 for ch in channels}
+        self._last_update = -math.inf
+
+    def connect(self) -> bool:
+        return True
+
+    def calibrate(self, min: int | dict, max: int | dict, trim: int | dict, offset: int | dict) -> bool:
+        for store, value in ((self._min, min), (self._max, max), (self._trim, trim), (self._offset, offset)):
+            for ch in store:
+                store[ch] = float(value[ch] if isinstance(value, dict) else value)
+        return all(self._min[ch] < self._trim[ch] < self._max[ch] for ch in self.channels)
+
+    def update(self, axes: dict[str, float], switches: dict[str, float]) -> None:
+        """
+        Stores a new set of raw inputs, mapping each axis onto [-1, 1] around its trim with a dead-zone.
+        """
+        for ch, raw in axes.items():
+            if ch not in self.channels:
+                continue
+            delta = raw - self._trim[ch]
+            if abs(delta) <= self._offset[ch]:
+                self.channels[ch] = 0.0
+                continue
+            span = self._max[ch] - self._trim[ch] if delta > 0 else self._trim[ch] - self._min[ch]
+            self.channels[ch] = max(-1.0, min(1.0, delta / span)) if span > 0 else 0.0
+        for sw, value in switches.items():
+            if sw in self.switches:
+                self.switches[sw] = value
+        self._last_update = time.perf_counter()
+
+    def get_axis_value(self, channel_id: str | List[str]) -> float | dict:
+        if isinstance(channel_id, list):
+            return {ch: self.channels.get(ch, 0.0) for ch in channel_id}
+        return self.channels.get(channel_id, 0.0)
+
+    def get_switch_value(self, switch_id: str | List[str]) -> float | dict:
+        if isinstance(switch_id, list):
+            return {sw: self.switches.get(sw, 0.0) for sw in switch_id}
+        return self.switches.get(switch_id, 0.0)
+
+    def is_connected(self) -> bool:
+        return time.perf_counter() - self._last_update <= self.timeout
+
+
+@dataclass(frozen=True)
+class DriverStats:
+    ticks: int
+    io_ticks: int
+    late_inputs: int
+    failed_inputs: int
+    dropped_frames: int
+    overruns: int
+    wall_time: float
+
+
+class AsyncSimDriver:
+    """
+    Runs an NCopterBase as a coroutine next to its I/O.
+
+    Every ``io_rate`` the driver starts a read on each BufferedController source that is not
+    already in flight and waits for them concurrently for at most ``io_timeout`` seconds.
+    Reads that miss the deadline keep running in the background and are applied on a later
+    I/O tick; until then the controller keeps its previous values. Telemetry frames are pushed
+    into bounded per-sink queues that drop the oldest frame instead of blocking the physics loop.
+    """
+
+    def __init__(
+        self,
+        sim: NCopterBase,
+        sinks: List[TelemetrySink] = (),
+        io_rate: float = 50.0,
+        io_timeout: float = 1e-3,
+        real_time_factor: float = 1.0,
+        queue_size: int = 8,
+    ):
+        if io_timeout < 0:
+            raise ValueError(f"io_timeout must be non-negative, got {io_timeout}")
+        if real_time_factor <= 0:
+            raise ValueError(f"real_time_factor must be positive, got {real_time_factor}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        if not all(isinstance(s, TelemetrySink) for s in sinks):
+            raise TypeError("sinks must be a list of TelemetrySink instances")
+
+        self.sim = sim
+        self.sinks = list(sinks)
+        self.io_divisor = sim.clock.ticks_for(io_rate)
+        self.io_timeout = io_timeout
+        self.real_time_factor = float(real_time_factor)
+        self.queue_size = queue_size
+
+        self._inflight: dict[BufferedController, asyncio.Task] = {}
+        self._queues: list[deque] = [deque(maxlen=queue_size) for _ in self.sinks]
+        self._ready: list[asyncio.Event] = []
+        self._late = self._failed = self._dropped = 0
+
+    @property
+    def controllers(self) -> list[BufferedController]:
+        return [dr.controller for dr in self.sim.entities.values() if isinstance(dr.controller, BufferedController)]
+
+    async def run(self, duration: float) -> DriverStats:
+        """
+        Advances the simulation by ``duration`` simulated seconds.
+
+        :param duration: Simulated duration in seconds.
+        :type duration: float
+        :return: Counters describing how the I/O kept up with the physics loop.
+        :rtype: DriverStats
+        """
+        ticks = int(round(duration / self.sim.clock.dt))
+        budget = 0.0 if math.isinf(self.real_time_factor) else self.sim.clock.dt / self.real_time_factor
+        loop = asyncio.get_running_loop()
+
+        # The counters and queues describe the current run only
+        self._late = self._failed = self._dropped = 0
+        for queue in self._queues:
+            queue.clear()
+        self._ready = [asyncio.Event() for _ in self.sinks]
+        workers = [asyncio.create_task(self._drain(i, sink)) for i, sink in enumerate(self.sinks)]
+        io_ticks = overruns = 0
+        start = loop.time()
+
+        try:
+            for k in range(ticks):
+                if self.sim.clock.tick % self.io_divisor == 0:
+                    io_ticks += 1
+                    await self._poll_inputs()
+                    self.sim.run()
+                    self._emit()
+                else:
+                    self.sim.run()
+
+                if budget > 0.0:
+                    remaining = start + (k + 1) * budget - loop.time()
+                    if remaining < 0.0:
+                        overruns += 1
+                    await asyncio.sleep(max(remaining, 0.0))
+                elif k % self.io_divisor == 0:
+                    await asyncio.sleep(0)
+        finally:
+            pending = workers + list(self._inflight.values())
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._inflight.clear()
+
+        return DriverStats(
+            ticks=ticks,
+            io_ticks=io_ticks,
+            late_inputs=self._late,
+            failed_inputs=self._failed,
+            dropped_frames=self._dropped,
+            overruns=overruns,
+            wall_time=loop.time() - start,
+        )
+
+    async def _poll_inputs(self) -> None:
+        for ctrl in self.controllers:
+            if ctrl not in self._inflight:
+                self._inflight[ctrl] = asyncio.create_task(ctrl.source.read())
+        if not self._inflight:
+            return
+
+        done, pending = await asyncio.wait(self._inflight.values(), timeout=self.io_timeout)
+        self._late += len(pending)
+        for ctrl, task in list(self._inflight.items()):
+            if task not in done:
+                continue
+            del self._inflight[ctrl]
+            if task.exception() is not None:
+                self._failed += 1
+                continue
+            ctrl.update(*task.result())
+
+    def _emit(self) -> None:
+        if not self.sinks:
+            return
+        frame = TelemetryFrame(
+            tick=self.sim.clock.tick,
+            time=self.sim.time,
+            drone_ids=list(self.sim.entities),
+            states=self.sim.pack_states(),
+        )
+        for queue, ready in zip(self._queues, self._ready):
+            if len(queue) == queue.maxlen:
+                self._dropped += 1
+            queue.append(frame)
+            ready.set()
+
+    async def _drain(self, index: int, sink: TelemetrySink) -> None:
+        queue, ready = self._queues[index], self._ready[index]
+        while True:
+            await ready.wait()
+            ready.clear()
+            while queue:
+                await sink.publish(queue.popleft())
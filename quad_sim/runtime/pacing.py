@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PacingStats:
+    """
+    Summary of a paced run. Latencies are the wall-clock duration of a single
+    simulation tick in seconds; ``budget`` is the wall-clock time available per tick.
+    """
+    ticks: int
+    sim_time: float
+    wall_time: float
+    real_time_factor: float
+    budget: float
+    overruns: int
+    resyncs: int
+    max_lag: float
+    latency_mean: float
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+    latency_max: float
+
+    @property
+    def achieved_real_time_factor(self) -> float:
+        return self.sim_time / self.wall_time if self.wall_time > 0 else math.inf
+
+    @property
+    def overrun_ratio(self) -> float:
+        return self.overruns / self.ticks if self.ticks else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.ticks} ticks, {self.sim_time:.3f} s sim in {self.wall_time:.3f} s wall "
+            f"(x{self.achieved_real_time_factor:.2f}, target x{self.real_time_factor})\n"
+            f"latency [ms] mean {1e3 * self.latency_mean:.3f} | p50 {1e3 * self.latency_p50:.3f} | "
+            f"p90 {1e3 * self.latency_p90:.3f} | p99 {1e3 * self.latency_p99:.3f} | max {1e3 * self.latency_max:.3f} "
+            f"(budget {1e3 * self.budget:.3f})\n"
+            f"overruns {self.overruns} ({100 * self.overrun_ratio:.2f} %), resyncs {self.resyncs}, "
+            f"max lag {1e3 * self.max_lag:.3f} ms"
+        )
+
+
+class Pacer:
+    """
+    Holds a target real-time factor for a fixed-step loop.
+
+    Deadlines are computed from the absolute start time (``start + k * budget``) instead of
+    sleeping a fixed amount after every tick, so small sleep errors never accumulate into drift.
+    A tick that finishes after its deadline counts as an overrun; if the loop falls more than
+    ``max_lag`` seconds behind, the deadlines are re-anchored to "now" instead of trying to catch up.
+    """
+
+    def __init__(
+        self,
+        dt: float,
+        real_time_factor: float = 1.0,
+        max_lag: float = 0.1,
+        spin: float = 5e-4,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param dt: Simulated time advanced per tick in seconds.
+        :type dt: float
+        :param real_time_factor: Simulated seconds per wall-clock second. ``math.inf`` runs as fast as possible.
+        :type real_time_factor: float
+        :param max_lag: Lag in seconds after which the schedule is re-anchored instead of caught up.
+        :type max_lag: float
+        :param spin: Final portion of each wait (seconds) that is busy-waited for sub-millisecond accuracy.
+        :type spin: float
+        """
+        if dt <= 0:
+            raise ValueError(f"dt must be positive, got {dt}")
+        if real_time_factor <= 0:
+            raise ValueError(f"real_time_factor must be positive, got {real_time_factor}")
+        if max_lag <= 0:
+            raise ValueError(f"max_lag must be positive, got {max_lag}")
+
+        self.dt = dt
+        self.real_time_factor = float(real_time_factor)
+        self.max_lag = max_lag
+        self.spin = max(spin, 0.0)
+        self._clock = clock
+        self._sleep = sleep
+
+    @property
+    def budget(self) -> float:
+        """
+        Wall-clock time available per tick in seconds (zero when unpaced).
+
+        :rtype: float
+        """
+        if math.isinf(self.real_time_factor):
+            return 0.0
+        return self.dt / self.real_time_factor
+
+    def run(self, step: Callable[[], None], ticks: int) -> PacingStats:
+        """
+        Calls ``step`` ``ticks`` times while holding the target real-time factor.
+
+        :param step: Function advancing the simulation by one tick.
+        :type step: Callable[[], None]
+        :param ticks: Number of ticks to run.
+        :type ticks: int
+        :return: Timing statistics of the run.
+        :rtype: PacingStats
+        """
+        if not isinstance(ticks, int) or ticks < 0:
+            raise ValueError(f"ticks must be a non-negative integer, got {ticks}")
+
+        budget = self.budget
+        paced = budget > 0.0
+        latencies = np.empty(ticks, dtype=np.float64)
+        overruns = resyncs = 0
+        max_lag = 0.0
+
+        now = self._clock
+        start = anchor = now()
+        k = 0  # ticks since the last (re-)anchor
+
+        for i in range(ticks):
+            t0 = now()
+            step()
+            t1 = now()
+            latencies[i] = t1 - t0
+            k += 1
+
+            if not paced:
+                continue
+
+            deadline = anchor + k * budget
+            lag = t1 - deadline
+            if lag > 0.0:
+                overruns += 1
+                max_lag = max(max_lag, lag)
+                if lag > self.max_lag:
+                    anchor, k = t1, 0
+                    resyncs += 1
+                continue
+            self._wait_until(deadline)
+
+        wall = now() - start
+        return self._summarise(latencies, ticks, wall, budget, overruns, resyncs, max_lag)
+
+    def _wait_until(self, deadline: float) -> None:
+        remaining = deadline - self._clock()
+        if remaining > self.spin:
+            self._sleep(remaining - self.spin)
+        while self._clock() < deadline:
+            pass
+
+    def _summarise(self, latencies, ticks, wall, budget, overruns, resyncs, max_lag) -> PacingStats:
+        if ticks:
+            p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+            mean, peak = float(latencies.mean()), float(latencies.max())
+        else:
+            p50 = p90 = p99 = mean = peak = 0.0
+
+        return PacingStats(
+            ticks=ticks,
+            sim_time=ticks * self.dt,
+            wall_time=wall,
+            real_time_factor=self.real_time_factor,
+            budget=budget,
+            overruns=overruns,
+            resyncs=resyncs,
+            max_lag=max_lag,
+            latency_mean=mean,
+            latency_p50=float(p50),
+            latency_p90=float(p90),
+            latency_p99=float(p99),
+            latency_max=peak,
+        )
+
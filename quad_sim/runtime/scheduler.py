@@ -0,0 +1,155 @@
+import math
+from dataclasses import dataclass
+from typing import Callable
+
+from quad_sim.runtime.clock import SimClock
+
+
+@dataclass(frozen=True)
+class LoopRates:
+    """
+    A simple data container for the execution rates (Hz) of each simulation loop.
+    Every rate must divide the physics rate evenly.
+    """
+    physics: float = 2000.0
+    attitude: float = 500.0
+    position: float = 50.0
+    logging: float = 100.0
+
+    def __post_init__(self):
+        for name in ("physics", "attitude", "position", "logging"):
+            value = getattr(self, name)
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{name} rate must be a positive number, got {value}")
+            if value > self.physics:
+                raise ValueError(f"{name} rate ({value} Hz) cannot exceed the physics rate ({self.physics} Hz)")
+
+    @classmethod
+    def uniform(cls, rate: float) -> "LoopRates":
+        """
+        Builds a set of rates where every loop runs on every physics tick.
+
+        :param rate: The shared rate in Hz.
+        :type rate: float
+        :rtype: LoopRates
+        """
+        return cls(physics=rate, attitude=rate, position=rate, logging=rate)
+
+
+@dataclass
+class ScheduledTask:
+    """
+    A callback that runs once every ``divisor`` base ticks, offset by ``phase`` ticks.
+    Tasks due on the same tick run in ascending ``priority``.
+    """
+    name: str
+    callback: Callable[[], None]
+    divisor: int
+    phase: int = 0
+    priority: int = 0
+    calls: int = 0
+
+    def is_due(self, tick: int) -> bool:
+        return tick % self.divisor == self.phase
+
+
+class Scheduler:
+    """
+    Multi-rate scheduler driven by a SimClock.
+
+    The execution order of every tick is precomputed over the hyperperiod (the least common
+    multiple of all task periods), so a tick costs one table lookup plus the tasks that are
+    actually due; slow loops are never visited on ticks where they do not run.
+    """
+
+    def __init__(self, clock: SimClock):
+        if not isinstance(clock, SimClock):
+            raise TypeError(f"clock must be a SimClock, got {type(clock)}")
+
+        self.clock = clock
+        self._tasks: dict[str, ScheduledTask] = {}
+        self._table: list[list[ScheduledTask]] = [[]]
+
+    @property
+    def tasks(self) -> dict[str, ScheduledTask]:
+        return self._tasks
+
+    @property
+    def hyperperiod(self) -> int:
+        """
+        The number of base ticks after which the schedule repeats.
+
+        :rtype: int
+        """
+        return len(self._table)
+
+    def add(self, name: str, callback: Callable[[], None], rate: float, priority: int = 0, phase: int = 0) -> ScheduledTask:
+        """
+        Registers a callback to run at the given rate.
+
+        :param name: Unique name of the task.
+        :type name: str
+        :param callback: Function called (without arguments) whenever the task is due.
+        :type callback: Callable[[], None]
+        :param rate: Execution rate in Hz. Must divide the clock rate evenly.
+        :type rate: float
+        :param priority: Ordering of tasks that are due on the same tick (lowest first).
+        :type priority: int
+        :param phase: Offset in base ticks, used to spread slow loops across different ticks.
+        :type phase: int
+        :return: The registered task.
+        :rtype: ScheduledTask
+        """
+        if not isinstance(name, str):
+            raise TypeError(f"name must be a string, got {type(name)}")
+        if name in self._tasks:
+            raise ValueError(f"Task '{name}' is already scheduled")
+        if not callable(callback):
+            raise TypeError("callback must be callable")
+
+        divisor = self.clock.ticks_for(rate)
+        if not isinstance(phase, int) or not 0 <= phase < divisor:
+            raise ValueError(f"phase must be an integer in [0, {divisor}), got {phase}")
+
+        task = ScheduledTask(name=name, callback=callback, divisor=divisor, phase=phase, priority=priority)
+        self._tasks[name] = task
+        self._rebuild()
+        return task
+
+    def remove(self, name: str) -> None:
+        if name not in self._tasks:
+            raise KeyError(f"Task '{name}' is not scheduled")
+        del self._tasks[name]
+        self._rebuild()
+
+    def due(self, tick: int | None = None) -> list[ScheduledTask]:
+        """
+        Returns the tasks due on the given tick (defaults to the current clock tick), in execution order.
+
+        :rtype: list[ScheduledTask]
+        """
+        if tick is None:
+            tick = self.clock.tick
+        return self._table[tick % len(self._table)]
+
+    def tick(self) -> list[ScheduledTask]:
+        """
+        Runs every task due on the current tick and then advances the clock by one tick.
+
+        :return: The tasks that were executed.
+        :rtype: list[ScheduledTask]
+        """
+        due = self._table[self.clock.tick % len(self._table)]
+        for task in due:
+            task.callback()
+            task.calls += 1
+        self.clock.advance()
+        return due
+
+    def _rebuild(self) -> None:
+        """
+        Precomputes the ordered list of due tasks for every tick of the hyperperiod.
+        """
+        ordered = sorted(self._tasks.values(), key=lambda t: t.priority)
+        period = math.lcm(*(t.divisor for t in ordered)) if ordered else 1
+        self._table = [[t for t in ordered if t.is_due(k)] for k in range(period)]
@@ -0,0 +1,257 @@
+"""
+Shared memory layout (all little-endian, 8-byte aligned):
+
+    header   int64[8]            magic, version, slots, n_drones, n_fields, id_bytes, latest frame, reserved
+    ids      bytes[n_drones, id_bytes]   utf-8 drone ids, zero padded
+    seq      int64[slots]        seqlock counter per slot (odd while the writer is inside the slot)
+    tick     int64[slots]
+    time     float64[slots]
+    states   float64[slots, n_drones, n_fields]
+
+The writer bumps the slot counter to an odd value, writes the slot, then bumps it to the next even
+value and publishes the frame number in the header. A reader that sees the same even counter before
+and after using the slot knows the data was not torn. Because frames rotate through ``slots`` buffers,
+a reader gets ``slots - 1`` writer frames of grace before its view is overwritten.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import List
+
+import numpy as np
+
+from quad_sim.bases.state import STATE_SIZE
+
+_MAGIC = 0x51534853  # "QSHS"
+_VERSION = 1
+_HEADER = 8
+_ID_BYTES = 32
+
+# Blocks created by publishers in this process (their resource tracker registration must be kept)
+_OWNED: set[str] = set()
+
+
+@dataclass(frozen=True)
+class _Layout:
+    slots: int
+    n_drones: int
+    n_fields: int
+
+    @property
+    def ids_offset(self) -> int:
+        return _HEADER * 8
+
+    @property
+    def seq_offset(self) -> int:
+        ids_end = self.ids_offset + self.n_drones * _ID_BYTES
+        return (ids_end + 7) // 8 * 8
+
+    @property
+    def tick_offset(self) -> int:
+        return self.seq_offset + self.slots * 8
+
+    @property
+    def time_offset(self) -> int:
+        return self.tick_offset + self.slots * 8
+
+    @property
+    def states_offset(self) -> int:
+        return self.time_offset + self.slots * 8
+
+    @property
+    def size(self) -> int:
+        return self.states_offset + self.slots * self.n_drones * self.n_fields * 8
+
+
+class _SharedStateBuffer:
+    def _map(self, layout: _Layout) -> None:
+        buf = self._shm.buf
+        self.layout = layout
+        self._header = np.ndarray((_HEADER,), dtype=np.int64, buffer=buf)
+        self._ids = np.ndarray((layout.n_drones, _ID_BYTES), dtype=np.uint8, buffer=buf, offset=layout.ids_offset)
+        self._seq = np.ndarray((layout.slots,), dtype=np.int64, buffer=buf, offset=layout.seq_offset)
+        self._tick = np.ndarray((layout.slots,), dtype=np.int64, buffer=buf, offset=layout.tick_offset)
+        self._time = np.ndarray((layout.slots,), dtype=np.float64, buffer=buf, offset=layout.time_offset)
+        self._states = np.ndarray(
+            (layout.slots, layout.n_drones, layout.n_fields), dtype=np.float64, buffer=buf, offset=layout.states_offset
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def drone_ids(self) -> list[str]:
+        return [bytes(row).rstrip(b"\0").decode("utf-8") for row in self._ids]
+
+    def close(self) -> None:
+        # Drop the numpy views first, otherwise the exported buffer cannot be released
+        self._header = self._ids = self._seq = self._tick = self._time = self._states = None
+        self._shm.close()
+
+
+class SharedStatePublisher(_SharedStateBuffer):
+    """
+    Writer side of the shared memory state ring buffer. Owned by the simulation process.
+    """
+
+    def __init__(self, drone_ids: List[str], name: str | None = None, slots: int = 8):
+        """
+        :param drone_ids: Ids of the published drones, in the row order of the packed states.
+        :type drone_ids: List[str]
+        :param name: Name of the shared memory block (generated when omitted).
+        :type name: str | None
+        :param slots: Number of frames in the ring buffer.
+        :type slots: int
+        """
+        if not all(isinstance(i, str) for i in drone_ids):
+            raise TypeError("drone_ids must be a list of strings")
+        if slots < 2:
+            raise ValueError(f"slots must be at least 2, got {slots}")
+        # Encode before creating the block so a bad id cannot leave an orphaned segment behind
+        encoded = [iD.encode("utf-8") for iD in drone_ids]
+        for iD, raw in zip(drone_ids, encoded):
+            if len(raw) > _ID_BYTES:
+                raise ValueError(f"drone id '{iD}' is longer than {_ID_BYTES} bytes")
+
+        layout = _Layout(slots=slots, n_drones=len(drone_ids), n_fields=STATE_SIZE)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=layout.size)
+        _OWNED.add(self._shm._name)
+        self._map(layout)
+
+        self._header[:] = (_MAGIC, _VERSION, slots, layout.n_drones, layout.n_fields, _ID_BYTES, -1, 0)
+        for row, raw in zip(self._ids, encoded):
+            row[: len(raw)] = np.frombuffer(raw, dtype=np.uint8)
+        self._seq[:] = 0
+        self._frame = -1
+
+    def begin(self, tick: int, time: float) -> np.ndarray:
+        """
+        Opens the next slot for writing.
+
+        :return: Writable (n_drones, STATE_SIZE) view of the slot; fill it and call :meth:`commit`.
+        :rtype: np.ndarray
+        """
+        slot = (self._frame + 1) % self.layout.slots
+        self._seq[slot] += 1  # odd: slot is being written
+        self._tick[slot] = tick
+        self._time[slot] = time
+        return self._states[slot]
+
+    def commit(self) -> None:
+        """
+        Closes the slot opened by :meth:`begin` and makes it the latest frame.
+        """
+        self._frame += 1
+        slot = self._frame % self.layout.slots
+        self._seq[slot] += 1  # even: slot is consistent
+        self._header[6] = self._frame
+
+    def publish(self, tick: int, time: float, states: np.ndarray) -> None:
+        """
+        Copies a packed (n_drones, STATE_SIZE) state array into the next slot.
+        """
+        self.begin(tick, time)[:] = states
+        self.commit()
+
+    def unlink(self) -> None:
+        """
+        Closes and removes the shared memory block. Call once the simulation is finished.
+        """
+        shm = self._shm
+        self.close()
+        shm.unlink()
+        _OWNED.discard(shm._name)
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """
+    A zero-copy view of one published frame. ``states`` aliases the shared memory; check
+    :meth:`SharedStateReader.is_valid` after using it to make sure it was not overwritten meanwhile.
+    """
+    frame: int
+    slot: int
+    seq: int
+    tick: int
+    time: float
+    states: np.ndarray
+
+
+class SharedStateReader(_SharedStateBuffer):
+    """
+    Reader side of the shared memory state ring buffer, used from a visualizer process.
+    """
+
+    def __init__(self, name: str):
+        self._shm = shared_memory.SharedMemory(name=name, create=False)
+        # The block is owned by the publisher; stop this process' resource tracker from unlinking it on exit
+        if self._shm._name not in _OWNED:
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self._shm.buf)
+        if header[0] != _MAGIC or header[1] != _VERSION:
+            del header
+            self._shm.close()
+            raise ValueError(f"Shared memory block '{name}' is not a quad_sim state buffer")
+        layout = _Layout(slots=int(header[2]), n_drones=int(header[3]), n_fields=int(header[4]))
+        del header
+        self._map(layout)
+
+    @property
+    def latest_frame(self) -> int:
+        """
+        Number of the most recently committed frame, -1 if nothing has been published yet.
+
+        :rtype: int
+        """
+        return int(self._header[6])
+
+    def latest(self, retries: int = 16) -> SharedFrame | None:
+        """
+        Returns a zero-copy view of the most recent consistent frame.
+
+        :param retries: How often to retry when the writer is inside the slot.
+        :type retries: int
+        :return: The latest frame, or None if nothing has been published (or the writer kept the slot busy).
+        :rtype: SharedFrame | None
+        """
+        for _ in range(retries):
+            frame = int(self._header[6])
+            if frame < 0:
+                return None
+            slot = frame % self.layout.slots
+            seq = int(self._seq[slot])
+            if seq & 1:
+                continue
+            tick, time = int(self._tick[slot]), float(self._time[slot])
+            if int(self._seq[slot]) == seq:
+                return SharedFrame(frame, slot, seq, tick, time, self._states[slot])
+        return None
+
+    def is_valid(self, frame: SharedFrame) -> bool:
+        """
+        Checks that the slot behind a frame has not been rewritten since it was read.
+
+        :rtype: bool
+        """
+        return int(self._seq[frame.slot]) == frame.seq
+
+    def copy_latest(self, out: np.ndarray | None = None, retries: int = 16) -> SharedFrame | None:
+        """
+        Copies the most recent frame into ``out`` (allocated when omitted) and verifies it was not torn.
+
+        :rtype: SharedFrame | None
+        """
+        for _ in range(retries):
+            frame = self.latest(retries)
+            if frame is None:
+                return None
+            if out is None:
+                out = np.empty_like(frame.states)
+            np.copyto(out, frame.states)
+            if self.is_valid(frame):
+                return SharedFrame(frame.frame, frame.slot, frame.seq, frame.tick, frame.time, out)
+        return None
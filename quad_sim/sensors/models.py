@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from quad_sim.bases.sensor import SensorBase
+from quad_sim.bases.state import STATE_LAYOUT
+from quad_sim.funcs import _get_body_to_inertial_batch
+
+GRAVITY = 9.81
+# Earth field in gauss for the z-up world frame with x pointing north (mid-latitude, northern hemisphere)
+EARTH_FIELD = (0.22, 0.0, -0.42)
+
+
+class Imu(SensorBase):
+    """
+    Accelerometer and gyroscope: [specific force (m/s^2), angular rate (rad/s)] in the body frame.
+
+    The specific force is the body acceleration minus gravity, ``dv/dt + omega x v - R^T g``, so a drone
+    at rest reads +g along body z.
+    """
+    size = 6
+
+    def __init__(
+        self,
+        rate: float = 400.0,
+        n: int = 1,
+        white: float | Sequence[float] = (0.03,) * 3 + (0.002,) * 3,
+        bias_walk: float | Sequence[float] = (0.001,) * 3 + (1e-4,) * 3,
+        bias: float | Sequence[float] = (0.05,) * 3 + (0.005,) * 3,
+        gravity: float = GRAVITY,
+        **kwargs,
+    ):
+        super().__init__(rate, n, white=white, bias_walk=bias_walk, bias=bias, **kwargs)
+        self.gravity = gravity
+
+    def ideal(self, states: np.ndarray) -> np.ndarray:
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        omega = states[:, STATE_LAYOUT["omega"]]
+        force = states[:, STATE_LAYOUT["acceleration"]] + np.cross(omega, states[:, STATE_LAYOUT["velocity"]])
+        force += self.gravity * R[:, 2, :]  # R^T (0, 0, g)
+        return np.concatenate([force, omega], axis=1)
+
+
+class Gps(SensorBase):
+    """
+    Satellite navigation fix: [position (m), velocity (m/s)] in the ``EarthFixed`` frame.
+    """
+    size = 6
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        n: int = 1,
+        latency: float = 0.1,
+        white: float | Sequence[float] = (0.5, 0.5, 1.0, 0.1, 0.1, 0.2),
+        bias_walk: float | Sequence[float] = (0.05, 0.05, 0.1, 0.0, 0.0, 0.0),
+        **kwargs,
+    ):
+        super().__init__(rate, n, latency=latency, white=white, bias_walk=bias_walk, **kwargs)
+
+    def ideal(self, states: np.ndarray) -> np.ndarray:
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        velocity = np.einsum("nij,nj->ni", R, states[:, STATE_LAYOUT["velocity"]])
+        return np.concatenate([states[:, STATE_LAYOUT["position"]], velocity], axis=1)
+
+
+class Barometer(SensorBase):
+    """
+    Barometric altitude (m) above the ``EarthFixed`` origin.
+    """
+    size = 1
+
+    def __init__(
+        self,
+        rate: float = 50.0,
+        n: int = 1,
+        white: float = 0.1,
+        bias_walk: float = 0.02,
+        bias: float = 0.5,
+        quantization: float = 0.01,
+        **kwargs,
+    ):
+        super().__init__(rate, n, white=white, bias_walk=bias_walk, bias=bias, quantization=quantization, **kwargs)
+
+    def ideal(self, states: np.ndarray) -> np.ndarray:
+        return states[:, STATE_LAYOUT["position"]][:, 2:3].copy()
+
+
+class Magnetometer(SensorBase):
+    """
+    Magnetic field (gauss) in the body frame.
+    """
+    size = 3
+
+    def __init__(
+        self,
+        rate: float = 100.0,
+        n: int = 1,
+        field: Sequence[float] = EARTH_FIELD,
+        white: float | Sequence[float] = 0.005,
+        bias: float | Sequence[float] = 0.01,
+        quantization: float | Sequence[float] = 0.001,
+        **kwargs,
+    ):
+        super().__init__(rate, n, white=white, bias=bias, quantization=quantization, **kwargs)
+        self.field = np.asarray(field, dtype=np.float64).reshape(3)
+
+    def ideal(self, states: np.ndarray) -> np.ndarray:
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        return np.einsum("nji,j->ni", R, self.field)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from math import factorial
+from typing import Sequence
+
+import numpy as np
+
+from quad_sim.trajectory.piecewise import Trajectory
+
+
+def allocate_times(waypoints: np.ndarray, speed: float, start: float = 0.0) -> np.ndarray:
+    """
+    Breakpoints that visit the waypoints at a constant average speed (yaw-only moves get 0.1 s).
+
+    :param waypoints: Waypoints of shape (K, dims); the first three columns are x, y, z.
+    :type waypoints: np.ndarray
+    :param speed: Average speed in m/s.
+    :type speed: float
+    :return: Times of shape (K,).
+    :rtype: np.ndarray
+    """
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+    distances = np.linalg.norm(np.diff(np.asarray(waypoints, dtype=np.float64)[:, :3], axis=0), axis=1)
+    return start + np.concatenate([[0.0], np.cumsum(np.maximum(distances / speed, 0.1))])
+
+
+def _derivative_row(tau: float, derivative: int, size: int) -> np.ndarray:
+    row = np.zeros(size)
+    for k in range(derivative, size):
+        row[k] = factorial(k) / factorial(k - derivative) * tau ** (k - derivative)
+    return row
+
+
+def minimum_derivative(
+    waypoints: np.ndarray,
+    times: Sequence[float],
+    order: int = 4,
+    start_derivatives: np.ndarray | None = None,
+    end_derivatives: np.ndarray | None = None,
+) -> Trajectory:
+    """
+    Trajectory through the waypoints that minimises the integral of the squared ``order``-th derivative.
+
+    The optimum is a piecewise polynomial of degree ``2 * order - 1`` whose derivatives up to
+    ``2 * order - 2`` are continuous, so it is found with one linear solve shared by all dimensions
+    (order 1: straight lines, 2: clamped cubic spline, 3: minimum jerk, 4: minimum snap).
+
+    :param waypoints: Waypoints of shape (K, dims), columns x, y, z and optionally yaw (unwrapped here).
+    :type waypoints: np.ndarray
+    :param times: Time of every waypoint, strictly increasing, shape (K,).
+    :param order: Derivative to minimise.
+    :type order: int
+    :param start_derivatives: Derivatives 1 .. order - 1 at the first waypoint, shape (order - 1, dims);
+        zeros (at rest) by default.
+    :param end_derivatives: Same at the last waypoint.
+    :rtype: Trajectory
+    """
+    waypoints = np.array(waypoints, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64).reshape(-1)
+    if waypoints.ndim != 2 or len(waypoints) < 2 or len(times) != len(waypoints):
+        raise ValueError("need at least two waypoints of shape (K, dims) and one time per waypoint")
+    if order < 1:
+        raise ValueError(f"order must be at least 1, got {order}")
+    if waypoints.shape[1] == 4:
+        waypoints[:, 3] = np.unwrap(waypoints[:, 3])
+
+    dims = waypoints.shape[1]
+    segments, size = len(waypoints) - 1, 2 * order
+    durations = np.diff(times)
+    if np.any(durations <= 0):
+        raise ValueError("times must be strictly increasing")
+    start = np.zeros((order - 1, dims)) if start_derivatives is None else np.asarray(start_derivatives, dtype=np.float64)
+    end = np.zeros((order - 1, dims)) if end_derivatives is None else np.asarray(end_derivatives, dtype=np.float64)
+
+    A = np.zeros((segments * size, segments * size))
+    b = np.zeros((segments * size, dims))
+    row = 0
+
+    def constrain(segment: int, tau: float, derivative: int, value: np.ndarray, other: int | None = None) -> None:
+        nonlocal row
+        A[row, segment * size:(segment + 1) * size] = _derivative_row(tau, derivative, size)
+        if other is not None:
+            A[row, other * size:(other + 1) * size] = -_derivative_row(0.0, derivative, size)
+        b[row] = value
+        row += 1
+
+    constrain(0, 0.0, 0, waypoints[0])
+    constrain(segments - 1, durations[-1], 0, waypoints[-1])
+    for d in range(1, order):
+        constrain(0, 0.0, d, start[d - 1])
+        constrain(segments - 1, durations[-1], d, end[d - 1])
+    for i in range(1, segments):
+        constrain(i - 1, durations[i - 1], 0, waypoints[i])
+        constrain(i, 0.0, 0, waypoints[i])
+        for d in range(1, size - 1):
+            constrain(i - 1, durations[i - 1], d, 0.0, other=i)
+
+    coefficients = np.linalg.solve(A, b).reshape(segments, size, dims)
+    return Trajectory(times, coefficients)
+
+
+def minimum_snap(waypoints: np.ndarray, times: Sequence[float], **kwargs) -> Trajectory:
+    """
+    Minimum-snap trajectory (piecewise degree 7), see minimum_derivative.
+
+    :rtype: Trajectory
+    """
+    return minimum_derivative(waypoints, times, order=4, **kwargs)
+
+
+def cubic_spline(waypoints: np.ndarray, times: Sequence[float], **kwargs) -> Trajectory:
+    """
+    Clamped cubic spline (minimum acceleration), see minimum_derivative.
+
+    :rtype: Trajectory
+    """
+    return minimum_derivative(waypoints, times, order=2, **kwargs)
+
+
+def waypoint_path(waypoints: np.ndarray, times: Sequence[float]) -> Trajectory:
+    """
+    Straight lines between the waypoints at constant velocity.
+
+    :rtype: Trajectory
+    """
+    return minimum_derivative(waypoints, times, order=1)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import numpy as np
+
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, Setpoints
+
+_POSITION = [SETPOINT_LAYOUT[k] for k in ("x", "y", "z")]
+_VELOCITY = [SETPOINT_LAYOUT[k] for k in ("vx", "vy", "vz")]
+
+
+class Trajectory:
+    """
+    Piecewise polynomial reference, stored as a table of coefficients in ascending powers of the time since
+    the start of each segment.
+
+    The coefficient tables of all derivatives are built once, so sampling any number of times is a sorted
+    breakpoint lookup (``searchsorted``, O(log S) per time) followed by a vectorised Horner evaluation.
+    Times outside the trajectory are clamped to its ends.
+
+    Dimensions are (x, y, z) or (x, y, z, yaw) in the ``EarthFixed`` frame.
+    """
+
+    def __init__(self, breaks: np.ndarray, coefficients: np.ndarray):
+        """
+        :param breaks: Segment boundaries in seconds, strictly increasing, shape (S + 1,).
+        :type breaks: np.ndarray
+        :param coefficients: Coefficients of shape (S, degree + 1, dims), in ascending powers.
+        :type coefficients: np.ndarray
+        """
+        breaks = np.asarray(breaks, dtype=np.float64).reshape(-1)
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        if coefficients.ndim != 3 or coefficients.shape[0] != len(breaks) - 1 or coefficients.shape[0] < 1:
+            raise ValueError(f"coefficients must have shape (S, degree + 1, dims) with S = len(breaks) - 1, got {coefficients.shape}")
+        if coefficients.shape[2] not in (3, 4):
+            raise ValueError(f"trajectories have 3 (x, y, z) or 4 (x, y, z, yaw) dimensions, got {coefficients.shape[2]}")
+        if np.any(np.diff(breaks) <= 0):
+            raise ValueError("breaks must be strictly increasing")
+
+        self.breaks = breaks
+        # tables[k] holds the coefficients of the k-th derivative
+        self.tables = [coefficients]
+        for _ in range(coefficients.shape[1] - 1):
+            previous = self.tables[-1]
+            self.tables.append(previous[:, 1:] * np.arange(1, previous.shape[1])[None, :, None])
+
+    @property
+    def degree(self) -> int:
+        return self.tables[0].shape[1] - 1
+
+    @property
+    def dims(self) -> int:
+        return self.tables[0].shape[2]
+
+    @property
+    def start(self) -> float:
+        return float(self.breaks[0])
+
+    @property
+    def end(self) -> float:
+        return float(self.breaks[-1])
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def segment(self, times: np.ndarray) -> np.ndarray:
+        """
+        Index of the segment containing each time (clamped to the first and last segment).
+
+        :rtype: np.ndarray
+        """
+        return np.clip(np.searchsorted(self.breaks, times, side="right") - 1, 0, len(self.breaks) - 2)
+
+    def evaluate(self, times: float | np.ndarray, derivative: int = 0) -> np.ndarray:
+        """
+        Samples a derivative of the trajectory.
+
+        :param times: A time or an array of times in seconds.
+        :param derivative: 0 for position, 1 for velocity, 2 for acceleration, ...
+        :type derivative: int
+        :return: Values of shape (*times.shape, dims).
+        :rtype: np.ndarray
+        """
+        times = np.clip(np.asarray(times, dtype=np.float64), self.start, self.end)
+        if derivative > self.degree:
+            return np.zeros(times.shape + (self.dims,))
+        table = self.tables[derivative]
+        index = self.segment(times)
+        tau = (times - self.breaks[index])[..., None]
+        coefficients = table[index]
+        out = coefficients[..., -1, :].copy()
+        for k in range(table.shape[1] - 2, -1, -1):
+            out *= tau
+            out += coefficients[..., k, :]
+        return out
+
+    def to_setpoints(self, times: float | np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Packed setpoints (positions, velocities and, for 4 dimensions, the yaw angle) at many times.
+
+        :param times: A time or an array of N times in seconds.
+        :param out: Optional (N, SETPOINT_SIZE) array to fill in place.
+        :type out: np.ndarray | None
+        :return: Setpoints following SETPOINT_FIELDS, NaN for the fields a trajectory does not set.
+        :rtype: np.ndarray
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        if out is None:
+            out = np.empty((len(times), SETPOINT_SIZE))
+        out.fill(np.nan)
+        position = self.evaluate(times)
+        out[:, _POSITION] = position[:, :3]
+        out[:, _VELOCITY] = self.evaluate(times, 1)[:, :3]
+        if self.dims == 4:
+            out[:, SETPOINT_LAYOUT["yaw_angle"]] = np.angle(np.exp(1j * position[:, 3]))
+        return out
+
+    def setpoints(self, time: float) -> Setpoints:
+        """
+        The Setpoints of one time, for the per-drone API.
+
+        :rtype: Setpoints
+        """
+        return Setpoints.from_array(self.to_setpoints(time)[0])
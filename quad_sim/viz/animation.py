@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterator, List
+
+import h5py
+import numpy as np
+
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE
+from quad_sim.runtime.sharedstate import SharedStateReader
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    One displayable snapshot of the swarm.
+
+    :ivar time: Simulation time of the snapshot in seconds.
+    :ivar states: Packed states of shape (N, STATE_SIZE), one row per drone.
+    """
+    time: float
+    states: np.ndarray
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.states[:, STATE_LAYOUT["position"]]
+
+    @property
+    def quaternions(self) -> np.ndarray:
+        return self.states[:, STATE_LAYOUT["quaternion"]]
+
+
+class FrameSource(ABC):
+    """
+    A stream of frames already decimated to the display rate.
+    """
+
+    @property
+    @abstractmethod
+    def drone_ids(self) -> List[str]:
+        """
+        Ids of the drones, in the row order of every frame.
+        """
+        pass
+
+    @abstractmethod
+    def frames(self) -> Iterator[Frame | None]:
+        """
+        Yields frames in time order. Sources must not hold the full trajectory in memory.
+        Live sources may yield None when no newer frame is available yet.
+        """
+        pass
+
+
+class LogFrameSource(FrameSource):
+    """
+    Streams frames out of an NCopterLogger HDF5 file.
+
+    Only every ``stride``-th logged sample is read (the stride is chosen so the frames arrive at
+    ``display_rate``), and rows are read in blocks of ``block`` frames, so memory use is bounded
+    by the block size regardless of the log length.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        log_rate: float,
+        display_rate: float = 30.0,
+        drones: List[str] | None = None,
+        subsystem: str = "State",
+        position_field: str = "position",
+        quaternion_field: str = "quaternion",
+        block: int = 256,
+        start: int = 0,
+        stop: int | None = None,
+    ):
+        """
+        :param path: Path to the HDF5 log.
+        :type path: str
+        :param log_rate: Rate (Hz) at which the log was written.
+        :type log_rate: float
+        :param display_rate: Target frame rate (Hz) of the animation.
+        :type display_rate: float
+        :param drones: Subset of drone ids to stream (all logged drones when omitted).
+        :type drones: List[str] | None
+        :param subsystem: Logger subsystem that holds the pose fields.
+        :type subsystem: str
+        :param start: First display frame to stream.
+        :type start: int
+        :param stop: Display frame to stop before (end of the log when omitted).
+        :type stop: int | None
+        """
+        if log_rate <= 0 or display_rate <= 0:
+            raise ValueError("log_rate and display_rate must be positive")
+        if block < 1:
+            raise ValueError(f"block must be at least 1, got {block}")
+        if start < 0 or (stop is not None and stop < start):
+            raise ValueError(f"invalid frame range [{start}, {stop})")
+
+        self.path = path
+        self.log_rate = float(log_rate)
+        self.stride = max(1, int(round(log_rate / display_rate)))
+        self.subsystem = subsystem
+        self.fields = (position_field, quaternion_field)
+        self.block = block
+
+        with h5py.File(path, "r") as f:
+            logged = list(f["simulation/drones"].keys())
+            self._ids = list(drones) if drones is not None else logged
+            missing = [iD for iD in self._ids if iD not in logged]
+            if missing:
+                raise KeyError(f"Drones not found in {path}: {missing}")
+            self.length = min(self._group(f, iD)[position_field].shape[0] for iD in self._ids) if self._ids else 0
+
+        total = -(-self.length // self.stride)
+        self.start = min(start, total)
+        self.stop = total if stop is None else min(stop, total)
+
+    @property
+    def drone_ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def frame_count(self) -> int:
+        return self.stop - self.start
+
+    def scan_bounds(self) -> tuple[tuple[float, float], tuple[float, float], tuple[float, float]]:
+        """
+        Streams the positions of the selected frames once and returns their axis-aligned bounds.
+
+        :return: ((xmin, xmax), (ymin, ymax), (zmin, zmax))
+        """
+        lo, hi = np.full(3, np.inf), np.full(3, -np.inf)
+        for frame in self.frames():
+            lo = np.minimum(lo, frame.positions.min(axis=0))
+            hi = np.maximum(hi, frame.positions.max(axis=0))
+        return tuple((float(a), float(b)) for a, b in zip(lo, hi))
+
+    def _group(self, f: h5py.File, iD: str) -> h5py.Group:
+        return f["simulation/drones"][iD][self.subsystem]
+
+    def frames(self) -> Iterator[Frame]:
+        pos_field, quat_field = self.fields
+        span = self.block * self.stride
+        n = len(self._ids)
+        pos_slice, quat_slice = STATE_LAYOUT["position"], STATE_LAYOUT["quaternion"]
+
+        first, last = self.start * self.stride, min(self.stop * self.stride, self.length)
+
+        with h5py.File(self.path, "r") as f:
+            datasets = [(self._group(f, iD)[pos_field], self._group(f, iD)[quat_field]) for iD in self._ids]
+
+            for start in range(first, last, span):
+                stop = min(start + span, last)
+                rows = len(range(start, stop, self.stride))
+                block = np.zeros((rows, n, STATE_SIZE), dtype=np.float64)
+
+                for i, (pos_ds, quat_ds) in enumerate(datasets):
+                    block[:, i, pos_slice] = pos_ds[start:stop:self.stride].reshape(rows, 3)
+                    block[:, i, quat_slice] = quat_ds[start:stop:self.stride].reshape(rows, 4)
+
+                for k in range(rows):
+                    yield Frame(time=(start + k * self.stride) / self.log_rate, states=block[k])
+
+
+class LiveFrameSource(FrameSource):
+    """
+    Streams frames from a running simulation through its shared memory publisher.
+    Each pull returns the latest published frame, so the display naturally decimates to its own rate;
+    frames that have not changed since the previous pull are skipped.
+    """
+
+    def __init__(self, reader: SharedStateReader, max_frames: int | None = None):
+        if not isinstance(reader, SharedStateReader):
+            raise TypeError(f"reader must be a SharedStateReader, got {type(reader)}")
+        self.reader = reader
+        self.max_frames = max_frames
+        self._buffer = np.empty((reader.layout.n_drones, STATE_SIZE), dtype=np.float64)
+
+    @property
+    def drone_ids(self) -> List[str]:
+        return self.reader.drone_ids
+
+    def frames(self) -> Iterator[Frame | None]:
+        last = -1
+        served = 0
+        while self.max_frames is None or served < self.max_frames:
+            frame = self.reader.copy_latest(out=self._buffer)
+            if frame is None or frame.frame == last:
+                yield None  # nothing new, keep the current picture
+                continue
+            last = frame.frame
+            served += 1
+            yield Frame(time=frame.time, states=frame.states)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from quad_sim.viz.animation import LogFrameSource
+from quad_sim.viz.matplotlib_3d import DroneGeometry, SwarmAnimator
+
+# Encoder reading raw RGBA frames on stdin. Placeholders are filled per segment.
+FFMPEG_ENCODE = (
+    "ffmpeg", "-loglevel", "error", "-y",
+    "-f", "rawvideo", "-pix_fmt", "rgba", "-s", "{width}x{height}", "-r", "{fps}", "-i", "-",
+    "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", "{output}",
+)
+# Lossless concatenation of the encoded segments listed in a concat demuxer file.
+FFMPEG_CONCAT = (
+    "ffmpeg", "-loglevel", "error", "-y", "-f", "concat", "-safe", "0", "-i", "{listing}", "-c", "copy", "{output}",
+)
+
+
+@dataclass(frozen=True)
+class SegmentJob:
+    """
+    Everything a worker process needs to render one frame range of one log into one video segment.
+    """
+    log: str
+    output: str
+    start: int
+    stop: int
+    log_rate: float
+    fps: float
+    geometry: DroneGeometry
+    bounds: tuple
+    drones: tuple[str, ...] | None
+    size: tuple[float, float]
+    dpi: int
+    encoder: tuple[str, ...]
+
+
+def render_segment(job: SegmentJob) -> tuple[str, int]:
+    """
+    Renders frames [job.start, job.stop) of a log and pipes them into the encoder.
+
+    Only one block of log rows and one RGBA frame are held in memory at a time. The static part of the
+    figure is drawn once and restored before every frame, so each frame only rasterises the moving artists.
+
+    :param job: The segment to render.
+    :type job: SegmentJob
+    :return: The segment path and the number of frames written.
+    :rtype: tuple[str, int]
+    """
+    source = LogFrameSource(
+        job.log, job.log_rate, display_rate=job.fps,
+        drones=list(job.drones) if job.drones is not None else None,
+        start=job.start, stop=job.stop,
+    )
+
+    fig = Figure(figsize=job.size, dpi=job.dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection="3d")
+    animator = SwarmAnimator(source, job.geometry, bounds=job.bounds, display_rate=job.fps, ax=ax)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+
+    cmd = [arg.format(width=width, height=height, fps=job.fps, output=job.output) for arg in job.encoder]
+    encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    written = 0
+    try:
+        for frame in source.frames():
+            canvas.restore_region(background)
+            for artist in animator.update(frame):
+                ax.draw_artist(artist)
+            encoder.stdin.write(np.asarray(canvas.buffer_rgba()).tobytes())
+            written += 1
+    finally:
+        encoder.stdin.close()
+        code = encoder.wait()
+    if code != 0:
+        raise RuntimeError(f"Encoder exited with code {code} while writing {job.output}")
+    return job.output, written
+
+
+class VideoExporter:
+    """
+    Headless batch renderer turning NCopterLogger files into videos.
+
+    Every log is split into segments of ``segment_frames`` display frames, the segments of all requested
+    logs are spread over a process pool, and the encoded segments of each log are finally concatenated
+    without re-encoding.
+    """
+
+    def __init__(
+        self,
+        geometry: DroneGeometry,
+        log_rate: float,
+        fps: float = 30.0,
+        size: tuple[float, float] = (8.0, 6.0),
+        dpi: int = 100,
+        segment_frames: int = 600,
+        workers: int | None = None,
+        encoder: Sequence[str] = FFMPEG_ENCODE,
+        concat: Sequence[str] = FFMPEG_CONCAT,
+    ):
+        if not isinstance(geometry, DroneGeometry):
+            raise TypeError(f"geometry must be a DroneGeometry, got {type(geometry)}")
+        if segment_frames < 1:
+            raise ValueError(f"segment_frames must be at least 1, got {segment_frames}")
+        if shutil.which(encoder[0]) is None:
+            raise RuntimeError(f"Video encoder '{encoder[0]}' was not found on PATH")
+
+        self.geometry = geometry
+        self.log_rate = log_rate
+        self.fps = fps
+        self.size = size
+        self.dpi = dpi
+        self.segment_frames = segment_frames
+        self.workers = workers or os.cpu_count() or 1
+        self.encoder = tuple(encoder)
+        self.concat = tuple(concat)
+
+    def plan(self, log: str, output: str, workdir: str, drones: List[str] | None = None) -> list[SegmentJob]:
+        """
+        Splits one log into segment jobs. The axes bounds are scanned once so all segments share them.
+
+        :raises ValueError: If the log holds no frames for the selected drones.
+        :rtype: list[SegmentJob]
+        """
+        source = LogFrameSource(log, self.log_rate, display_rate=self.fps, drones=drones)
+        if source.frame_count == 0:
+            raise ValueError(f"{log} has no frames to export")
+        lo_hi = np.array(source.scan_bounds())
+        pad = 0.1 * max(float(np.max(lo_hi[:, 1] - lo_hi[:, 0])), 1.0)
+        bounds = tuple((lo - pad, hi + pad) for lo, hi in lo_hi)
+        ext = os.path.splitext(output)[1] or ".mp4"
+        stem = os.path.splitext(os.path.basename(output))[0]
+
+        return [
+            SegmentJob(
+                log=log,
+                output=os.path.join(workdir, f"{stem}_{start:08d}{ext}"),
+                start=start,
+                stop=min(start + self.segment_frames, source.frame_count),
+                log_rate=self.log_rate,
+                fps=self.fps,
+                geometry=self.geometry,
+                bounds=bounds,
+                drones=tuple(drones) if drones is not None else None,
+                size=self.size,
+                dpi=self.dpi,
+                encoder=self.encoder,
+            )
+            for start in range(0, source.frame_count, self.segment_frames)
+        ]
+
+    def export(self, log: str, output: str, drones: List[str] | None = None) -> str:
+        """
+        Renders a single log to ``output``.
+
+        :rtype: str
+        """
+        return self.export_many([(log, output)], drones=drones)[0]
+
+    def export_many(self, runs: List[tuple[str, str]], drones: List[str] | None = None, pool: Executor | None = None) -> list[str]:
+        """
+        Renders many (log, output) pairs, sharing one process pool across all of their segments.
+
+        :param runs: Pairs of input log path and output video path.
+        :type runs: List[tuple[str, str]]
+        :param pool: Optional executor to use instead of a private process pool.
+        :return: The written video paths.
+        :rtype: list[str]
+        """
+        owns_pool = pool is None
+        if owns_pool:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        workdirs, futures = [], []
+        try:
+            for log, output in runs:
+                workdir = tempfile.mkdtemp(prefix=".segments_", dir=os.path.dirname(os.path.abspath(output)))
+                workdirs.append(workdir)
+                futures.append([pool.submit(render_segment, job) for job in self.plan(log, output, workdir, drones)])
+
+            for (_, output), segments in zip(runs, futures):
+                self._join([f.result()[0] for f in segments], output)
+        finally:
+            if owns_pool:
+                pool.shutdown(cancel_futures=True)
+            for workdir in workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        return [output for _, output in runs]
+
+    def _join(self, segments: list[str], output: str) -> None:
+        if len(segments) == 1:
+            shutil.move(segments[0], output)
+            return
+
+        listing = os.path.join(os.path.dirname(segments[0]), "segments.txt")
+        with open(listing, "w") as f:
+            f.writelines(f"file '{os.path.abspath(s)}'\n" for s in segments)
+        cmd = [arg.format(listing=listing, output=output) for arg in self.concat]
+        subprocess.run(cmd, check=True)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.animation import FuncAnimation
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from quad_sim.bases.motor import MotorBase
+from quad_sim.funcs import _get_body_to_inertial_batch
+from quad_sim.viz.animation import Frame, FrameSource
+
+
+@dataclass(frozen=True)
+class DroneGeometry:
+    """
+    Body-frame drawing geometry of one airframe.
+
+    :ivar arms: Motor hub positions of shape (M, 3); an arm is drawn from the CG to every hub.
+    :ivar tips: Propeller tip positions of shape (K, 3).
+    """
+    arms: np.ndarray
+    tips: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+
+    @classmethod
+    def from_motors(cls, motors: List[MotorBase]) -> "DroneGeometry":
+        """
+        Builds the geometry from the motor layout and the propeller tips reported by
+        ``MotorBase.locate_propeller_tips`` (body-frame positions relative to the CG).
+
+        :param motors: The motors of the airframe.
+        :type motors: List[MotorBase]
+        :rtype: DroneGeometry
+        """
+        if not all(isinstance(m, MotorBase) for m in motors):
+            raise TypeError("motors must be a list of MotorBase instances")
+
+        arms = np.array([m.position.vec[:, 0] for m in motors], dtype=np.float64).reshape(-1, 3)
+        tips = [tip.vec[:, 0] for m in motors for tip in m.locate_propeller_tips().values()]
+        return cls(arms=arms, tips=np.array(tips, dtype=np.float64).reshape(-1, 3))
+
+
+def _to_world(positions: np.ndarray, quaternions: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Transforms body-frame points of shape (P, 3) for N drones at once, returning (N, P, 3).
+    """
+    R = _get_body_to_inertial_batch(quaternions)
+    return positions[:, None, :] + np.einsum("nij,pj->npi", R, points)
+
+
+class SwarmAnimator:
+    """
+    Incremental 3D animation of a swarm on matplotlib axes.
+
+    Artists are created once; every frame only replaces their vertex data (one Line3DCollection for all
+    arms, one scatter for all propeller tips) and the animation blits them, so the cost per frame grows
+    with the number of vertices rather than with the number of drones times the number of artists.
+    The axes limits are fixed up front, which is what makes blitting valid.
+    """
+
+    def __init__(
+        self,
+        source: FrameSource,
+        geometry: DroneGeometry | List[DroneGeometry],
+        bounds: tuple[tuple[float, float], tuple[float, float], tuple[float, float]] | None = None,
+        display_rate: float = 30.0,
+        ax=None,
+    ):
+        """
+        :param source: Stream of frames to display.
+        :type source: FrameSource
+        :param geometry: One geometry shared by all drones, or one per drone in source order.
+        :type geometry: DroneGeometry | List[DroneGeometry]
+        :param bounds: Fixed ((xmin, xmax), (ymin, ymax), (zmin, zmax)); taken from the first frame when omitted.
+        :param display_rate: Redraw rate in Hz.
+        :type display_rate: float
+        """
+        if not isinstance(source, FrameSource):
+            raise TypeError(f"source must be a FrameSource, got {type(source)}")
+        if display_rate <= 0:
+            raise ValueError(f"display_rate must be positive, got {display_rate}")
+
+        n = len(source.drone_ids)
+        geometries = [geometry] * n if isinstance(geometry, DroneGeometry) else list(geometry)
+        if len(geometries) != n:
+            raise ValueError(f"expected {n} geometries, got {len(geometries)}")
+
+        self.source = source
+        self.display_rate = display_rate
+        self.bounds = bounds
+
+        # Group drones sharing a geometry so every group is transformed in one vectorised call
+        self._groups: list[tuple[np.ndarray, DroneGeometry]] = []
+        for geo in {id(g): g for g in geometries}.values():
+            rows = np.array([i for i, g in enumerate(geometries) if g is geo], dtype=np.intp)
+            self._groups.append((rows, geo))
+
+        n_arms = sum(len(rows) * len(geo.arms) for rows, geo in self._groups)
+        n_tips = sum(len(rows) * len(geo.tips) for rows, geo in self._groups)
+        self._segments = np.zeros((n_arms, 2, 3), dtype=np.float64)
+        self._tips = np.zeros((n_tips, 3), dtype=np.float64)
+
+        if ax is None:
+            fig = plt.figure()
+            ax = fig.add_subplot(projection="3d")
+        self.ax = ax
+        self.fig = ax.figure
+
+        self.arms = Line3DCollection(self._segments, colors="tab:blue", linewidths=1.5, animated=True)
+        self.ax.add_collection3d(self.arms)
+        self.props = self.ax.scatter([], [], [], s=4, c="tab:red", depthshade=False, animated=True)
+        self.label = self.ax.text2D(0.02, 0.95, "", transform=self.ax.transAxes, animated=True)
+        self.ax.set_xlabel("x [m]")
+        self.ax.set_ylabel("y [m]")
+        self.ax.set_zlabel("z [m]")
+        self._bounded = False
+        if self.bounds is not None:
+            self._apply_bounds()
+
+    @property
+    def artists(self) -> list:
+        return [self.arms, self.props, self.label]
+
+    def _fit_bounds(self, frame: Frame) -> None:
+        lo, hi = frame.positions.min(axis=0), frame.positions.max(axis=0)
+        pad = 0.25 * max(float(np.max(hi - lo)), 1.0)
+        self.bounds = tuple(zip(lo - pad, hi + pad))
+        self._apply_bounds()
+
+    def _apply_bounds(self) -> None:
+        (x0, x1), (y0, y1), (z0, z1) = self.bounds
+        self.ax.set_xlim(x0, x1)
+        self.ax.set_ylim(y0, y1)
+        self.ax.set_zlim(z0, z1)
+        self._bounded = True
+
+    def update(self, frame: Frame | None) -> list:
+        """
+        Writes one frame into the existing artists.
+
+        :param frame: The frame to draw; None keeps the current picture.
+        :type frame: Frame | None
+        :return: The artists that changed (for blitting).
+        :rtype: list
+        """
+        if frame is None:
+            return self.artists
+        if not self._bounded:
+            self._fit_bounds(frame)
+
+        positions, quaternions = frame.positions, frame.quaternions
+        a = t = 0
+        for rows, geo in self._groups:
+            p, q = positions[rows], quaternions[rows]
+            if len(geo.arms):
+                hubs = _to_world(p, q, geo.arms).reshape(-1, 3)
+                self._segments[a:a + len(hubs), 0] = np.repeat(p, len(geo.arms), axis=0)
+                self._segments[a:a + len(hubs), 1] = hubs
+                a += len(hubs)
+            if len(geo.tips):
+                tips = _to_world(p, q, geo.tips).reshape(-1, 3)
+                self._tips[t:t + len(tips)] = tips
+                t += len(tips)
+
+        self.arms.set_segments(self._segments)
+        self.props._offsets3d = (self._tips[:, 0], self._tips[:, 1], self._tips[:, 2])
+        self.label.set_text(f"t = {frame.time:.2f} s")
+        return self.artists
+
+    def animate(self, blit: bool = True) -> FuncAnimation:
+        """
+        Builds the streaming animation. Keep a reference to the result while it is displayed.
+
+        :rtype: FuncAnimation
+        """
+        return FuncAnimation(
+            self.fig,
+            self.update,
+            frames=self.source.frames,
+            init_func=lambda: self.artists,
+            interval=1000.0 / self.display_rate,
+            blit=blit,
+            cache_frame_data=False,
+        )
+
+    def show(self) -> None:
+        anim = self.animate()  # noqa: F841 -- must stay referenced while the window is open
+        plt.show()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quad_sim.actuation.battery import Battery
+from quad_sim.actuation.motors import MotorBank
+from quad_sim.bases.rigidbody import RigidBody
+from quad_sim.bases.state import StateVector
+from tests.helpers import Dynamics, Environment, frame
+
+
+def test_first_order_lag_slew_and_saturation():
+    bank = MotorBank(frame(4), k_f=1e-7, k_m=2e-9, n=2, tau_up=0.05, tau_down=0.1, slew=[np.inf, np.inf, np.inf, 1e5])
+    bank.set_command([[10000.0, 10000.0, 30000.0, 10000.0], [0.0] * 4])
+    bank.rpm[1] = 8000.0
+    for _ in range(50):
+        bank.advance(0.001)
+    expected = 10000.0 * -np.expm1(-1.0)
+    np.testing.assert_allclose(bank.rpm[0, :2], expected)
+    # Saturated at rpm_max, slew limited to 1e5 RPM/s
+    np.testing.assert_allclose(bank.rpm[0, 2:], [20000.0 * -np.expm1(-1.0), 5000.0])
+    np.testing.assert_allclose(bank.rpm[1], 8000.0 * np.exp(-0.5))
+
+    # The exact step is independent of the step size and stable for dt >> tau
+    coarse = MotorBank(frame(4), k_f=1e-7, k_m=2e-9, tau_up=0.05)
+    coarse.set_command([10000.0] * 4)
+    coarse.advance(0.05)
+    np.testing.assert_allclose(coarse.rpm[0], expected)
+    coarse.advance(1.0)
+    np.testing.assert_allclose(coarse.rpm[0], 10000.0, rtol=1e-6)
+    np.testing.assert_allclose(coarse.wrench_array()[0, 0], 4e-7 * coarse.rpm[0, 0] ** 2)
+
+
+def test_battery_sag_and_drain():
+    battery = Battery(n=2, cells=4, capacity=5.0, resistance=0.05, soc=[1.0, 0.5])
+    np.testing.assert_allclose(battery.voltage, [16.8, 15.2])
+    for _ in range(60):
+        battery.advance(np.array([10.0, 10.0]), 1.0)
+    np.testing.assert_allclose(battery.soc, [1.0 - 600.0 / 18000.0, 0.5 - 600.0 / 18000.0])
+    np.testing.assert_allclose(battery.voltage, battery.open_circuit(battery.soc) - 0.5)
+
+    # A sagging pack caps the reachable speed and is drained by the motors
+    bank = MotorBank(frame(4), k_f=1e-7, k_m=2e-9, n=2, kv=1000.0, battery=Battery(n=2, soc=[1.0, 0.0]))
+    bank.set_command(np.full((2, 4), 20000.0))
+    for _ in range(200):
+        bank.advance(0.01)
+    assert bank.rpm[1].max() <= 1000.0 * 13.08 + 1e-9
+    assert bank.battery.soc[0] < 1.0 and bank.battery.current[0] > 0.0
+    assert bank.rpm[0, 0] == pytest.approx(1000.0 * bank.battery.voltage[0], rel=0.01)
+
+
+def test_dynamics_commands_follow_lag_in_integrator_step():
+    motors = frame(4)
+    bank = MotorBank(motors, k_f=1e-6, k_m=1e-7, n=3, tau_up=0.02)
+    dynamics = Dynamics(RigidBody(1.0, np.eye(3)), motors, actuators=bank, row=1)
+
+    dynamics.set_motor_rpm([5000.0] * 4)
+    assert all(m.rpm == 0.0 for m in motors)
+    dynamics.advance_actuators(0.02)
+    np.testing.assert_allclose(bank.rpm[1], 5000.0 * -np.expm1(-1.0))
+    # The motors pick the speeds up when the next step computes the forces
+    assert all(m.rpm == 0.0 for m in motors)
+    dynamics.compute_forces_and_moments(Environment([]), StateVector())
+    np.testing.assert_allclose([m.rpm for m in motors], 5000.0 * -np.expm1(-1.0))
+    assert not bank.rpm[[0, 2]].any() and not bank.command[[0, 2]].any()
+
+    with pytest.raises(ValueError):
+        Dynamics(RigidBody(1.0, np.eye(3)), motors[:3], actuators=bank)
@@ -0,0 +1,66 @@
+import numpy as np
+
+from quad_sim.actuation.motors import MotorBank
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.environment.aero import DragEffect, GroundEffect, VortexRingEffect
+from quad_sim.references.bodyFixed import BodyFixed
+from tests.helpers import ARMS, Environment, Rotor, hover_states
+
+
+def quad_motors():
+    return [Rotor(f"m{i}", 1, BodyFixed(*p), thrust=2.0) for i, p in enumerate(ARMS)]
+
+
+def test_drag_per_axis():
+    state = StateVector()
+    state.velocity.vec[:, 0] = [2.0, -1.0, 0.5]
+    force, _ = DragEffect(linear=(0.1, 0.2, 0.3), quadratic=(1.0, 1.0, 2.0)).apply(state)
+    assert np.allclose(force.vec[:, 0], [-4.2, 1.2, -0.65])
+
+
+def test_ground_effect_decays_with_height():
+    effect = GroundEffect(quad_motors(), rotor_radius=0.1)
+    thrust = np.zeros((3, 4, 3))
+    thrust[..., 2] = 2.0
+    force, moment = effect.evaluate(hover_states(3, [0.05, 0.1, 10.0]), thrust)
+    expected = 8.0 * (np.minimum(1.0 / (1.0 - (0.1 / (4 * np.array([0.05, 0.1, 10.0]))) ** 2), 1.5) - 1.0)
+    assert np.allclose(force[:, 2], expected)
+    assert np.allclose(moment, 0.0)  # symmetric layout
+
+
+def test_ground_effect_tilt_creates_moment():
+    effect = GroundEffect(quad_motors(), rotor_radius=0.1)
+    states = hover_states(1, 0.1)
+    angle = 0.3
+    states[0, STATE_LAYOUT["quaternion"]] = (np.cos(angle / 2), 0.0, np.sin(angle / 2), 0.0)
+    _, moment = effect.apply(StateVector.from_array(states[0]))
+    assert abs(moment.vec[1, 0]) > 0
+
+
+def test_vortex_ring_loss_peaks_near_hover_induced_velocity():
+    effect = VortexRingEffect(quad_motors(), rotor_radius=0.1, depth=0.3)
+    v_hover = np.sqrt(2.0 / (2 * 1.225 * np.pi * 0.01))
+    states = hover_states(3, 10.0)
+    states[:, STATE_LAYOUT["velocity"]] = [[0, 0, 0], [0, 0, -v_hover], [3 * v_hover, 0, -v_hover]]
+    thrust = np.zeros((3, 4, 3))
+    thrust[..., 2] = 2.0
+    gain = effect.gain(states, thrust)
+    assert np.allclose(gain[1], 0.7)
+    assert np.all(gain[0] > 0.99) and np.all(gain[2] > 0.99)
+
+
+def test_motor_bank_source_serves_each_drone_its_own_thrust():
+    bank = MotorBank(quad_motors(), k_f=1e-7, k_m=2e-9, n=3)
+    bank.rpm[:] = np.array([[3000.0], [5000.0], [0.0]])
+    effect = GroundEffect(bank, rotor_radius=0.1)
+    environment = Environment([effect])
+    assert environment._fused == [effect]
+
+    states = hover_states(3, 0.1)
+    force, _ = environment.apply_effects_array(states)
+    gain = 1.0 / (1.0 - (0.1 / 0.4) ** 2)
+    np.testing.assert_allclose(force[:, 2], 4e-7 * bank.rpm[:, 0] ** 2 * (gain - 1.0))
+
+    # Bound to one row, the effect serves a per-drone environment
+    single, _ = GroundEffect(bank, rotor_radius=0.1, row=1).apply(StateVector.from_array(states[1]))
+    np.testing.assert_allclose(single.vec[2, 0], force[1, 2], rtol=1e-6)
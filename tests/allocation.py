@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from exampleSetup.default.classes import DefaultMotor
+from quad_sim.bases.flightmode import DesaturationPriority
+from quad_sim.control.allocation import MixerAllocator, QPAllocator
+from quad_sim.references.bodyFixed import BodyFixed
+from tests.helpers import frame
+
+K_F, K_M = 1e-7, 2e-9
+
+
+def produced(alloc, rpm):
+    return (alloc.B @ (rpm ** 2).T).T
+
+
+def test_yaw_sign_matches_default_motor():
+    motors = [DefaultMotor(m.iD, m.spin_direction, m.position, kf=K_F, km=K_M) for m in frame(4)]
+    command = np.array([[15.0, 0.1, -0.05, 0.02]])
+    for alloc in (MixerAllocator(motors, K_F, K_M), QPAllocator(motors, K_F, K_M)):
+        wrench = np.zeros(4)
+        for motor, rpm in zip(motors, alloc.allocate_array(command)[0]):
+            motor.set_rpm(rpm)
+            thrust, torque = motor.compute_forces()
+            wrench[0] += thrust.vec[2, 0]
+            wrench[1:] += torque.vec[:, 0] + np.cross(motor.position.vec[:, 0], thrust.vec[:, 0])
+        np.testing.assert_allclose(wrench, command[0], rtol=1e-3, atol=1e-4)  # BodyFixed is float32
+
+
+def test_unsaturated_commands_are_exact():
+    alloc = MixerAllocator(frame(4), K_F, K_M, rpm_max=20000.0)
+    commands = np.array([[20.0, 0.1, -0.2, 0.01], [15.0, 0.0, 0.0, 0.0]])
+    assert np.allclose(produced(alloc, alloc.allocate_array(commands)), commands)
+
+
+def test_attitude_priority_keeps_moments():
+    alloc = MixerAllocator(frame(4), K_F, K_M, rpm_max=20000.0)
+    # Near full throttle with a large roll demand: thrust gives way, the moments stay
+    rpm = alloc.allocate_array(np.array([[158.0, 1.0, 0.0, 0.0]]))
+    out = produced(alloc, rpm)[0]
+    assert np.all(rpm <= 20000.0 + 1e-9)
+    assert np.allclose(out[1:], [1.0, 0.0, 0.0]) and out[0] < 158.0
+
+
+def test_thrust_priority_keeps_thrust():
+    alloc = MixerAllocator(frame(6), K_F, K_M, rpm_max=20000.0, priority=DesaturationPriority.THRUST)
+    rpm = alloc.allocate_array(np.array([[230.0, 2.0, 0.0, 0.5]]))
+    out = produced(alloc, rpm)[0]
+    assert np.isclose(out[0], 230.0)
+    # Moments are scaled uniformly, keeping their direction
+    assert 0 < out[1] < 2.0 and np.isclose(out[3] / out[1], 0.25)
+
+
+def test_batched_matches_single_and_allocate():
+    alloc = MixerAllocator(frame(8), K_F, K_M)
+    rng = np.random.default_rng(0)
+    commands = np.c_[rng.uniform(0, 400, 50), rng.normal(0, 2, (50, 3))]
+    batched = alloc.allocate_array(commands)
+    assert np.allclose(batched[7], alloc.allocate_array(commands[7:8])[0])
+    single = alloc.allocate((BodyFixed(0.0, 0.0, commands[7, 0]), BodyFixed(*commands[7, 1:])))
+    assert np.allclose(single, batched[7], rtol=1e-5)
+
+
+def test_invalid_layout():
+    with pytest.raises(ValueError):
+        MixerAllocator(frame(4)[:2], K_F, K_M)
+
+
+def projected_gradient(alloc, command, iterations=20000):
+    f = -(alloc._G @ command)
+    step = 1.0 / np.linalg.eigvalsh(alloc.H).max()
+    x = np.full(alloc.n_motors, 0.5)
+    for _ in range(iterations):
+        x = np.clip(x - step * (alloc.H @ x + f), alloc.lo, alloc.hi)
+    return x, f
+
+
+@pytest.mark.parametrize("n", [4, 6, 8])
+def test_qp_matches_projected_gradient(n):
+    alloc = QPAllocator(frame(n), K_F, K_M)
+    rng = np.random.default_rng(n)
+    objective = lambda x, f: 0.5 * x @ alloc.H @ x + f @ x
+    for _ in range(20):
+        command = np.r_[rng.uniform(0, 45 * n), rng.normal(0, 2, 3)]
+        x = alloc.solve(command)
+        reference, f = projected_gradient(alloc, command, 5000)
+        assert np.all(x >= alloc.lo - 1e-12) and np.all(x <= alloc.hi + 1e-12)
+        assert objective(x, f) <= objective(reference, f) + 1e-9
+
+
+def test_qp_unsaturated_is_exact_and_warm_start_is_cheap():
+    alloc = QPAllocator(frame(6), K_F, K_M, regularization=1e-9)
+    t = np.linspace(0, 2, 400)
+    commands = np.c_[150 + 30 * np.sin(t), 0.5 * np.sin(3 * t), 0.5 * np.cos(2 * t), 0.2 * np.sin(5 * t)]
+    rpm = alloc.allocate_array(commands)
+    assert np.allclose(produced(alloc, rpm), commands, rtol=1e-4, atol=1e-4)
+    assert alloc.iterations == 1
@@ -0,0 +1,67 @@
+import numpy as np
+
+from exampleSetup.default.classes import GroundPlaneConstraint, MaxVelocityConstraint
+from quad_sim.bases.constraint import StateConstraint
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.environment.obstacles import ObstacleConstraint
+from tests.helpers import Constraints
+from tests.obstacles import sample_world
+
+
+class SpinLimit(StateConstraint):
+    """Scalar-only constraint, served row by row."""
+
+    def enforce(self, state):
+        state.omega.vec[:, 0] = np.clip(state.omega.vec[:, 0], -1.0, 1.0)
+        return state
+
+
+def swarm(n, seed=0):
+    rng = np.random.default_rng(seed)
+    states = np.zeros((n, STATE_SIZE))
+    states[:, STATE_LAYOUT["position"]] = rng.uniform([-1.0, -1.0, 0.0], [12.0, 1.0, 3.0], size=(n, 3))
+    states[:, STATE_LAYOUT["velocity"]] = rng.normal(scale=20.0, size=(n, 3))
+    q = rng.normal(size=(n, 4))
+    states[:, STATE_LAYOUT["quaternion"]] = q / np.linalg.norm(q, axis=1, keepdims=True)
+    states[:, STATE_LAYOUT["omega"]] = rng.normal(scale=1.0, size=(n, 3))
+    return states
+
+
+def test_swarm_pass_matches_per_drone_enforce_and_counts_activations():
+    constraints = Constraints([ObstacleConstraint(sample_world(), 0.3), MaxVelocityConstraint(25.0), SpinLimit()])
+    states = swarm(400)
+    expected = np.array([constraints.enforce_state_constraints(StateVector.from_array(row)).to_array() for row in states])
+
+    before = states.copy()
+    counts = constraints.enforce_state_constraints_array(states)
+    np.testing.assert_allclose(states, expected, rtol=1e-5, atol=1e-4)  # StateVector is float32
+
+    speed = np.linalg.norm(before[:, STATE_LAYOUT["velocity"]], axis=1)
+    assert counts[0] > 0
+    assert counts[2] == np.count_nonzero(np.any(np.abs(before[:, STATE_LAYOUT["omega"]]) > 1.0, axis=1))
+    assert counts[1] >= np.count_nonzero(speed > 25.0) - counts[0]
+
+
+def test_setpoint_pass_skips_unset_fields():
+    constraints = Constraints([GroundPlaneConstraint(0.5)])
+    setpoints = np.full((3, SETPOINT_SIZE), np.nan)
+    setpoints[:2, SETPOINT_LAYOUT["z"]] = [0.0, 2.0]
+    counts = constraints.enforce_setpoint_constraints_array(setpoints)
+    assert counts.tolist() == [1]
+    assert setpoints[0, SETPOINT_LAYOUT["z"]] == 0.5 and setpoints[1, SETPOINT_LAYOUT["z"]] == 2.0
+    assert np.isnan(setpoints[2]).all()
+
+
+def test_fallback_keeps_float64_precision_of_untouched_fields():
+    states = swarm(50, seed=3)
+    states[:, STATE_LAYOUT["omega"]] = np.clip(states[:, STATE_LAYOUT["omega"]], -0.9, 0.9)
+    states[0, STATE_LAYOUT["omega"].start] = 3.0
+    before = states.copy()
+
+    counts = Constraints([SpinLimit()]).enforce_state_constraints_array(states)
+    assert counts.tolist() == [1]
+    np.testing.assert_array_equal(states[1:], before[1:])
+    untouched = np.arange(STATE_SIZE) != STATE_LAYOUT["omega"].start
+    np.testing.assert_array_equal(states[0, untouched], before[0, untouched])
+    assert states[0, STATE_LAYOUT["omega"].start] == 1.0
@@ -0,0 +1,91 @@
+import asyncio
+import math
+
+import numpy as np
+
+from quad_sim.bases.state import STATE_SIZE
+from quad_sim.runtime.clock import SimClock
+from quad_sim.runtime.driver import AsyncSimDriver, BufferedController, InputSource, TelemetrySink
+
+
+class StickSource(InputSource):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def read(self):
+        await asyncio.sleep(self.delay)
+        return {"throttle": 0.5}, {"arm": 1.0}
+
+
+class SlowSink(TelemetrySink):
+    def __init__(self):
+        self.frames = []
+
+    async def publish(self, frame):
+        await asyncio.sleep(0.01)
+        self.frames.append(frame)
+
+
+class FakeDrone:
+    def __init__(self, controller):
+        self.controller = controller
+        self.state = None
+
+
+class FakeSim:
+    """Minimal stand-in exposing the parts of NCopterBase the driver uses."""
+
+    def __init__(self, controller):
+        self.clock = SimClock(1000)
+        self.entities = {"a": FakeDrone(controller)}
+        self.steps = 0
+
+    @property
+    def time(self):
+        return self.clock.time
+
+    def run(self):
+        self.steps += 1
+        self.clock.advance()
+
+    def pack_states(self):
+        # Every row carries the tick it was packed at
+        return np.full((len(self.entities), STATE_SIZE), float(self.clock.tick))
+
+
+def test_buffered_controller_calibration_and_deadzone():
+    ctrl = BufferedController(StickSource(), ["throttle"], ["arm"])
+    assert ctrl.calibrate(min=1000, max=2000, trim=1500, offset=10)
+    ctrl.update({"throttle": 1750}, {"arm": 1.0})
+    assert math.isclose(ctrl.get_axis_value("throttle"), 0.5)
+    ctrl.update({"throttle": 1505}, {})
+    assert ctrl.get_axis_value("throttle") == 0.0
+    assert ctrl.get_switch_value("arm") == 1.0
+    assert ctrl.is_connected()
+
+
+def test_slow_io_never_stalls_physics():
+    ctrl = BufferedController(StickSource(delay=0.05), ["throttle"])
+    sim = FakeSim(ctrl)
+    sink = SlowSink()
+    driver = AsyncSimDriver(sim, [sink], io_rate=100, io_timeout=1e-3, real_time_factor=math.inf)
+
+    stats = asyncio.run(driver.run(0.5))
+
+    assert sim.steps == 500
+    assert stats.io_ticks == 50
+    assert stats.late_inputs > 0
+    assert stats.dropped_frames > 0
+
+    # Every frame holds its own copy of the states of its tick
+    assert sink.frames and all(f.drone_ids == ["a"] and (f.states == f.tick).all() for f in sink.frames)
+
+
+def test_stats_describe_each_run():
+    ctrl = BufferedController(StickSource(delay=0.05), ["throttle"])
+    driver = AsyncSimDriver(FakeSim(ctrl), [SlowSink()], io_rate=100, io_timeout=1e-3, real_time_factor=math.inf)
+
+    first = asyncio.run(driver.run(0.2))
+    second = asyncio.run(driver.run(0.2))
+    assert (second.ticks, second.io_ticks) == (first.ticks, first.io_ticks) == (200, 20)
+    assert second.late_inputs <= second.io_ticks and second.dropped_frames <= second.io_ticks
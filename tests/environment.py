@@ -0,0 +1,97 @@
+import numpy as np
+
+from quad_sim.bases.environment import EnvironmentEffect
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.environment.aero import DragEffect
+from quad_sim.references.bodyFixed import BodyFixed
+from tests.helpers import Environment
+
+
+class ObjectDrag(EnvironmentEffect):
+    """Same model as DragEffect, only through the per-object path."""
+
+    def __init__(self):
+        self.inner = DragEffect(linear=(0.1, 0.2, 0.3), quadratic=(0.5, 0.5, 1.0))
+
+    def apply(self, state):
+        return self.inner.apply(state)
+
+
+class Torque(EnvironmentEffect):
+    def apply(self, state):
+        return BodyFixed(0.0, 0.0, 0.0, flag="force"), BodyFixed(0.0, 0.0, 1.5, flag="moment")
+
+
+def random_states(n):
+    rng = np.random.default_rng(0)
+    states = np.zeros((n, STATE_SIZE))
+    states[:, STATE_LAYOUT["velocity"]] = rng.normal(size=(n, 3))
+    states[:, STATE_LAYOUT["quaternion"]] = (1.0, 0.0, 0.0, 0.0)
+    return states
+
+
+def test_fused_and_fallback_paths_agree():
+    fused = Environment([DragEffect(linear=(0.1, 0.2, 0.3), quadratic=(0.5, 0.5, 1.0)), Torque()])
+    fallback = Environment([ObjectDrag(), Torque()])
+    assert len(fused._fused) == 1 and len(fallback._fused) == 0
+
+    states = random_states(5)
+    f1, m1 = fused.apply_effects_array(states)
+    f1, m1 = f1.copy(), m1.copy()
+    f2, m2 = fallback.apply_effects_array(states)
+    assert np.allclose(f1, f2, atol=1e-6) and np.allclose(m1, m2)
+    assert np.allclose(m1[:, 2], 1.5)
+
+    state = StateVector.from_array(states[0])
+    force, moment = fused.apply_effects(state)
+    assert np.allclose(force.vec[:, 0], f1[0], atol=1e-6)
+    assert np.allclose(moment.vec[:, 0], [0.0, 0.0, 1.5])
+
+
+def test_accumulators_are_reset_between_calls():
+    env = Environment([DragEffect()])
+    states = random_states(3)
+    first = env.apply_effects_array(states)[0].copy()
+    assert np.allclose(env.apply_effects_array(states)[0], first)
+
+
+class Counting(EnvironmentEffect):
+    def __init__(self, dependency):
+        self.dependency = dependency
+        self.calls = 0
+
+    def apply(self, state):
+        self.calls += 1
+        return BodyFixed(0.0, 0.0, float(state.position.vec[2, 0]), flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
+
+
+def test_constant_and_time_effects_are_memoized():
+    constant, timed = Counting("constant"), Counting("time")
+    env = Environment([constant, timed])
+    states = random_states(4)
+    for _ in range(3):
+        env.apply_effects_array(states)
+    assert (constant.calls, timed.calls) == (1, 1)
+
+    env.advance(0.01)
+    env.apply_effects(StateVector())
+    assert (constant.calls, timed.calls) == (1, 2)
+
+    env.invalidate(constant)
+    env.apply_effects(StateVector())
+    assert (constant.calls, timed.calls) == (2, 2)
+
+
+def test_position_effects_recompute_moved_rows_only():
+    effect = Counting("position")
+    env = Environment([effect])
+    states = random_states(4)
+    states[:, 2] = [1.0, 2.0, 3.0, 4.0]
+    env.apply_effects_array(states)
+    assert effect.calls == 4
+
+    states[1, 2] = 5.0
+    states[:, STATE_LAYOUT["velocity"]] += 1.0
+    force, _ = env.apply_effects_array(states)
+    assert effect.calls == 5
+    assert np.allclose(force[:, 2], [1.0, 5.0, 3.0, 4.0])
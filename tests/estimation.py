@@ -0,0 +1,77 @@
+import numpy as np
+
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE
+from quad_sim.estimation.ekf import InertialEKF
+from quad_sim.sensors.models import EARTH_FIELD, Barometer, Gps, Imu, Magnetometer
+
+DT = 1.0 / 400.0
+
+
+def truth(n, time, speed=1.0, yaw_rate=0.2):
+    """Level flight at constant world velocity while yawing at a constant rate."""
+    states = np.zeros((n, STATE_SIZE))
+    yaw = yaw_rate * time + np.linspace(0.0, 1.0, n)
+    world = np.array([speed, 0.5 * speed, 0.0])
+    states[:, STATE_LAYOUT["position"]] = world * time + [0.0, 0.0, 10.0]
+    states[:, STATE_LAYOUT["quaternion"]] = np.c_[np.cos(yaw / 2), np.zeros((n, 2)), np.sin(yaw / 2)]
+    cos, sin = np.cos(yaw), np.sin(yaw)
+    body = np.c_[cos * world[0] + sin * world[1], -sin * world[0] + cos * world[1], np.zeros(n)]
+    states[:, STATE_LAYOUT["velocity"]] = body
+    states[:, STATE_LAYOUT["omega"]] = [0.0, 0.0, yaw_rate]
+    states[:, STATE_LAYOUT["acceleration"]] = -np.cross(states[:, STATE_LAYOUT["omega"]], body)
+    return states
+
+
+def run(n, seconds, seed=0):
+    imu, gps = Imu(n=n, seed=seed), Gps(n=n, latency=0.0, seed=seed + 1)
+    baro, mag = Barometer(n=n, seed=seed + 2), Magnetometer(n=n, seed=seed + 3)
+    ekf = InertialEKF(n)
+    start = truth(n, 0.0)
+    start[:, STATE_LAYOUT["position"]] += [5.0, -5.0, 3.0]
+    ekf.reset(start)
+
+    errors = []
+    for k in range(int(round(seconds / DT))):
+        time = k * DT
+        states = truth(n, time)
+        ekf.predict(imu.measure_array(states, time), DT)
+        fix = gps.measure_array(states, time)
+        if gps.fresh:
+            ekf.update_gps(fix)
+        altitude = baro.measure_array(states, time)
+        if baro.fresh:
+            ekf.update_barometer(altitude)
+        field = mag.measure_array(states, time)
+        if mag.fresh:
+            ekf.update_magnetometer(field, EARTH_FIELD)
+        errors.append(ekf.estimate_array()[:, :STATE_LAYOUT["omega"].stop] - states[:, :STATE_LAYOUT["omega"].stop])
+    return ekf, np.array(errors)
+
+
+def test_converges_on_simulated_sensors():
+    ekf, errors = run(2, 20.0)
+    final = np.abs(errors[-400:]).mean(axis=0)
+    # Position keeps the slowly drifting GPS and barometer biases; velocity beats the raw GPS noise
+    assert final[:, STATE_LAYOUT["position"]].max() < 1.0
+    assert final[:, STATE_LAYOUT["velocity"]].max() < 0.1
+    assert final[:, STATE_LAYOUT["quaternion"]].max() < 0.02
+    # Gyro biases are observable and pulled towards the sensor's turn-on bias
+    assert np.abs(ekf.gyro_bias).max() < 0.05
+
+
+def test_covariance_stays_symmetric_positive_definite():
+    ekf, _ = run(3, 5.0)
+    np.testing.assert_allclose(ekf.P, ekf.P.transpose(0, 2, 1), atol=1e-12)
+    assert np.linalg.eigvalsh(ekf.P).min() > 0.0
+
+
+def test_partial_updates_leave_other_drones_alone():
+    ekf = InertialEKF(3)
+    ekf.reset(truth(3, 0.0))
+    imu = Imu(n=3, seed=0).ideal(truth(3, 0.0))
+    ekf.predict(imu, DT)
+    before = ekf.position.copy(), ekf.P.copy()
+    ekf.update_gps(np.zeros((1, 6)), rows=np.array([1]))
+    np.testing.assert_array_equal(ekf.position[[0, 2]], before[0][[0, 2]])
+    np.testing.assert_array_equal(ekf.P[[0, 2]], before[1][[0, 2]])
+    assert np.trace(ekf.P[1]) < np.trace(before[1][1])
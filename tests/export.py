@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+from quad_sim.viz.export import VideoExporter
+from quad_sim.viz.matplotlib_3d import DroneGeometry
+from tests.helpers import ARMS, write_log
+
+# Stand-ins for ffmpeg: the encoder records its segment name and how many whole RGBA frames it received,
+# the concatenation joins the records in the order of the listing.
+ENCODE = (
+    sys.executable, "-c",
+    "import os, sys\n"
+    "width, height, output = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]\n"
+    "size = len(sys.stdin.buffer.read())\n"
+    "open(output, 'w').write('%s %d %d\\n' % (os.path.basename(output), size // (width * height * 4), size % (width * height * 4)))\n",
+    "{width}", "{height}", "{output}",
+)
+CONCAT = (
+    sys.executable, "-c",
+    "import sys\n"
+    "paths = [line.split(\"'\")[1] for line in open(sys.argv[1])]\n"
+    "open(sys.argv[2], 'w').write(''.join(open(p).read() for p in paths))\n",
+    "{listing}", "{output}",
+)
+
+
+def test_export_renders_segments_in_order(tmp_path):
+    log = write_log(tmp_path / "log.h5", [100, 100])
+    exporter = VideoExporter(
+        DroneGeometry(arms=ARMS), log_rate=100.0, fps=20.0, size=(2.0, 1.5), dpi=40,
+        segment_frames=8, workers=2, encoder=ENCODE, concat=CONCAT,
+    )
+
+    jobs = exporter.plan(log, str(tmp_path / "run.mp4"), str(tmp_path))
+    assert [(job.start, job.stop) for job in jobs] == [(0, 8), (8, 16), (16, 20)]
+
+    output = exporter.export(log, str(tmp_path / "run.mp4"))
+    records = [line.split() for line in open(output).read().splitlines()]
+    assert [name for name, _, _ in records] == ["run_00000000.mp4", "run_00000008.mp4", "run_00000016.mp4"]
+    assert [int(frames) for _, frames, _ in records] == [8, 8, 4]
+    assert all(rest == "0" for _, _, rest in records)
+    # The segment directory is cleaned up
+    assert sorted(os.listdir(tmp_path)) == ["log.h5", "run.mp4"]
+
+
+def test_empty_log_is_rejected(tmp_path):
+    log = write_log(tmp_path / "log.h5", [0])
+    exporter = VideoExporter(DroneGeometry(arms=ARMS), log_rate=100.0, encoder=ENCODE, concat=CONCAT)
+    with pytest.raises(ValueError, match="no frames"):
+        exporter.export(log, str(tmp_path / "run.mp4"))
+    assert os.listdir(tmp_path) == ["log.h5"]
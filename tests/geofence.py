@@ -0,0 +1,89 @@
+import numpy as np
+from matplotlib.path import Path
+
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.environment.geofence import KEEP_IN, Geofence, GeofenceConstraint, GeofenceSetpointConstraint, Zone
+from tests.helpers import Constraints
+
+SQUARE = np.array([[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 4.0]])
+
+
+def random_zones(n, rng):
+    zones = []
+    for center in rng.uniform(0.0, 500.0, size=(n, 2)):
+        angles = np.sort(rng.uniform(0.0, 2 * np.pi, size=rng.integers(3, 9)))
+        radii = rng.uniform(5.0, 20.0, size=len(angles))
+        polygon = center + np.c_[radii * np.cos(angles), radii * np.sin(angles)]
+        z_min = rng.uniform(0.0, 50.0)
+        zones.append(Zone(polygon, z_min, z_min + rng.uniform(10.0, 100.0)))
+    return zones
+
+
+def test_index_matches_brute_force():
+    rng = np.random.default_rng(1)
+    zones = random_zones(300, rng)
+    fence = Geofence(zones)
+    points = np.c_[rng.uniform(-20.0, 520.0, size=(5000, 2)), rng.uniform(0.0, 120.0, size=5000)]
+
+    expected = np.zeros((len(points), len(zones)), dtype=bool)
+    for k, z in enumerate(zones):
+        expected[:, k] = Path(z.polygon).contains_points(points[:, :2]) & (points[:, 2] >= z.z_min) & (points[:, 2] <= z.z_max)
+
+    keep_out, outside = fence.violations(points)
+    np.testing.assert_array_equal(keep_out >= 0, expected.any(axis=1))
+    hit = keep_out >= 0
+    assert expected[np.nonzero(hit)[0], keep_out[hit]].all()
+    assert not outside.any()
+    # The grid only hands a few zones to each point
+    assert len(fence.candidates(points)[0]) < 5 * len(points)
+
+
+def test_state_constraint_pushes_out_through_nearest_face():
+    fence = Geofence([Zone(SQUARE, 0.0, 10.0), Zone(SQUARE + 10.0, 0.0, 3.0)])
+    states = np.zeros((3, STATE_SIZE))
+    states[:, STATE_LAYOUT["quaternion"]] = [1.0, 0.0, 0.0, 0.0]
+    states[:, STATE_LAYOUT["position"]] = [[3.5, 2.0, 5.0], [12.0, 12.0, 2.8], [20.0, 20.0, 1.0]]
+    states[:, STATE_LAYOUT["velocity"]] = [[-1.0, 0.5, 0.0], [0.0, 0.0, -2.0], [1.0, 0.0, 0.0]]
+
+    counts = Constraints([GeofenceConstraint(fence)]).enforce_state_constraints_array(states)
+    assert counts.tolist() == [2]
+    np.testing.assert_allclose(states[:, STATE_LAYOUT["position"]], [[4.0, 2.0, 5.0], [12.0, 12.0, 3.0], [20.0, 20.0, 1.0]], atol=1e-5)
+    np.testing.assert_allclose(states[:, STATE_LAYOUT["velocity"]], [[0.0, 0.5, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], atol=1e-9)
+
+    state = GeofenceConstraint(fence).enforce(StateVector.from_array(np.r_[[1.0, 2.0, 5.0], np.zeros(3), [1.0, 0, 0, 0], np.zeros(9)]))
+    np.testing.assert_allclose(state.position.vec[:, 0], [0.0, 2.0, 5.0], atol=1e-5)
+
+
+def test_keep_in_zone_and_setpoints():
+    fence = Geofence([Zone(SQUARE * 10.0, 0.0, 30.0, kind=KEEP_IN), Zone(SQUARE + 18.0)])
+    setpoints = np.full((3, SETPOINT_SIZE), np.nan)
+    columns = [SETPOINT_LAYOUT[k] for k in ("x", "y", "z")]
+    setpoints[0, columns] = [50.0, 20.0, 10.0]
+    setpoints[1, columns] = [19.0, 20.5, 10.0]
+    setpoints[2, SETPOINT_LAYOUT["vx"]] = 1.0
+
+    moved = GeofenceSetpointConstraint(fence).enforce_array(setpoints)
+    assert moved.tolist() == [True, True, False]
+    np.testing.assert_allclose(setpoints[0, columns], [40.0, 20.0, 10.0], atol=1e-5)
+    np.testing.assert_allclose(setpoints[1, columns], [18.0, 20.5, 10.0], atol=1e-5)
+    assert np.isnan(setpoints[2, columns]).all()
+
+    single = GeofenceSetpointConstraint(fence).enforce(Setpoints(x=5.0, y=5.0, z=-1.0))
+    assert (single.x, single.y) == (5.0, 5.0) and abs(single.z) < 1e-5
+
+
+def test_keep_in_search_finds_the_nearest_zone():
+    rng = np.random.default_rng(3)
+    zones = [Zone(z.polygon, z.z_min, z.z_max, kind=KEEP_IN) for z in random_zones(200, rng)]
+    fence = Geofence(zones)
+    points = np.c_[rng.uniform(-100.0, 600.0, size=(2000, 2)), rng.uniform(-20.0, 160.0, size=2000)]
+    points = points[fence.violations(points)[1]]
+
+    # Brute force over every keep-in zone
+    n, k = len(points), len(fence.keep_in)
+    _, distance = fence._keep_in_targets(np.repeat(points, k, axis=0), np.tile(fence.keep_in, n))
+    nearest = distance.reshape(n, k).min(axis=1)
+
+    moved = np.linalg.norm(fence._enter_keep_in(points) - points, axis=1)
+    np.testing.assert_allclose(moved, nearest, atol=1e-5)
@@ -0,0 +1,121 @@
+"""
+Fixtures shared by several test modules. Holds no tests itself.
+"""
+import h5py
+import numpy as np
+
+from quad_sim.bases.constraint import ConstraintBase
+from quad_sim.bases.dynamics import DynamicsBase
+from quad_sim.bases.environment import EnvironmentBase
+from quad_sim.bases.motor import MotorBase
+from quad_sim.bases.rigidbody import RigidBody
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE
+from quad_sim.control.linear import LinearModel
+from quad_sim.funcs import _get_body_to_inertial_batch
+from quad_sim.references.bodyFixed import BodyFixed
+
+# Hub positions of a plus-shaped quadcopter
+ARMS = np.array([[0.2, 0.0, 0.0], [-0.2, 0.0, 0.0], [0.0, 0.2, 0.0], [0.0, -0.2, 0.0]])
+
+
+class Rotor(MotorBase):
+    """Stub motor producing a fixed thrust along body z and remembering the last speed it was given."""
+
+    def __init__(self, iD, spin_direction, position, thrust=0.0):
+        super().__init__(iD, spin_direction, position)
+        self.thrust = thrust
+        self.rpm = 0.0
+
+    def compute_forces(self):
+        return BodyFixed(0.0, 0.0, self.thrust, flag="force"), BodyFixed(0.0, 0.0, 0.0, flag="moment")
+
+    def set_rpm(self, rpm):
+        self.rpm = rpm
+
+    def _generate_propeller_tips(self):
+        return {}
+
+    def update_theta(self, dt):
+        pass
+
+    def locate_propeller_tips(self):
+        return {}
+
+
+def frame(n):
+    """``n`` rotors on a 0.2 m ring with alternating spin directions, starting half a spacing off the x axis."""
+    angles = 2 * np.pi * (np.arange(n) + 0.5) / n
+    return [Rotor(f"m{i}", 1 if i % 2 else -1, BodyFixed(0.2 * np.cos(a), 0.2 * np.sin(a), 0.0)) for i, a in enumerate(angles)]
+
+
+class Dynamics(DynamicsBase):
+    @property
+    def rotor_rates(self):
+        return {m.iD: m.rpm for m in self.motors}
+
+
+class Environment(EnvironmentBase):
+    pass
+
+
+class Constraints(ConstraintBase):
+    pass
+
+
+def linear_model(mass=1.0, drag=(0.3, 0.3, 0.5)):
+    return LinearModel(RigidBody(mass, np.diag([0.01, 0.01, 0.02])), frame(4), k_f=1.0, k_m=0.02, drag=drag)
+
+
+def hover_states(n, height=0.0):
+    states = np.zeros((n, STATE_SIZE))
+    states[:, STATE_LAYOUT["quaternion"]] = [1.0, 0.0, 0.0, 0.0]
+    states[:, 2] = height
+    return states
+
+
+def simulate(pilot, states, setpoints, seconds, dt, mass, inertia, drag=0.0, gravity=9.81):
+    """
+    Rigid-body quadrotor driven by the [thrust, Mx, My, Mz] commands of a pilot: thrust along body z,
+    linear body-frame drag, diagonal ``inertia`` and no gyroscopic terms.
+    """
+    for _ in range(int(seconds / dt)):
+        wrench = pilot.compute_control_array(states, setpoints)
+        R = _get_body_to_inertial_batch(states[:, STATE_LAYOUT["quaternion"]])
+        body_v = states[:, STATE_LAYOUT["velocity"]]
+        force = -np.asarray(drag) * body_v
+        force[:, 2] += wrench[:, 0]
+        world_v = np.einsum("nij,nj->ni", R, body_v) + (np.einsum("nij,nj->ni", R, force) / mass - [0, 0, gravity]) * dt
+        states[:, STATE_LAYOUT["position"]] += world_v * dt
+        states[:, STATE_LAYOUT["velocity"]] = np.einsum("nji,nj->ni", R, world_v)
+        omega = states[:, STATE_LAYOUT["omega"]]
+        omega += wrench[:, 1:] / inertia * dt
+        w, x, y, z = states[:, STATE_LAYOUT["quaternion"]].T
+        p, q, r = omega.T
+        dq = 0.5 * np.stack([-x * p - y * q - z * r, w * p + y * r - z * q, w * q - x * r + z * p, w * r + x * q - y * p], axis=1)
+        quat = states[:, STATE_LAYOUT["quaternion"]] + dq * dt
+        states[:, STATE_LAYOUT["quaternion"]] = quat / np.linalg.norm(quat, axis=1, keepdims=True)
+    return states
+
+
+def fly(pilot, model, states, setpoints, seconds, dt):
+    """``simulate`` with the mass, inertia, drag and gravity of a ``LinearModel``."""
+    return simulate(pilot, states, setpoints, seconds, dt, model.body.mass, np.diag(model.body.inertia_tensor), model.drag, model.gravity)
+
+
+def write_log(path, lengths):
+    """
+    Writes a log in the NCopterLogger layout where the x position of every drone is its sample index
+    and the y position its drone index, so every frame tells which rows it was read from.
+    """
+    with h5py.File(path, "w") as f:
+        drones = f.create_group("simulation/drones")
+        for i, length in enumerate(lengths):
+            group = drones.create_group(f"d{i}/State")
+            position = np.zeros((length, 3, 1))
+            position[:, 0, 0] = np.arange(length)
+            position[:, 1, 0] = i
+            quaternion = np.zeros((length, 4, 1))
+            quaternion[:, 0, 0] = 1.0
+            group["position"] = position
+            group["quaternion"] = quaternion
+    return str(path)
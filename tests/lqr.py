@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from exampleSetup.default.classes import DefaultMotor
+from quad_sim.bases.rigidbody import RigidBody
+from quad_sim.bases.setpoints import SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_LAYOUT, StateVector
+from quad_sim.control.linear import LinearModel, discretize, expm, solve_dare
+from quad_sim.control.lqr import LQRPilot
+from quad_sim.funcs import _get_body_to_inertial_batch
+from tests.helpers import fly, hover_states, linear_model
+
+DT = 0.005
+
+
+def test_riccati_solution_satisfies_equation():
+    A, B, _, _ = linear_model().linearize()
+    Ad, Bd = discretize(A, B, 0.05)
+    Q, R = np.eye(12), np.eye(4)
+    P = solve_dare(Ad, Bd, Q, R)
+    residual = Ad.T @ P @ Ad - P - Ad.T @ P @ Bd @ np.linalg.solve(R + Bd.T @ P @ Bd, Bd.T @ P @ Ad) + Q
+    assert np.abs(residual).max() < 1e-6 * np.abs(P).max()
+    np.testing.assert_allclose(expm(np.array([[0.0, 1.0], [-1.0, 0.0]])), [[np.cos(1), np.sin(1)], [-np.sin(1), np.cos(1)]], atol=1e-12)
+
+
+def test_forward_flight_trim_tilts_against_drag():
+    m = linear_model()
+    x0, u0 = m.trim(4.0)
+    assert np.abs(m.derivatives(x0, u0)[3:]).max() < 1e-8
+    assert x0[7] > 0.05 and u0.sum() > 9.81
+
+
+def test_gain_table_is_cached_per_airframe(tmp_path, monkeypatch):
+    # Without a directory the table stays in memory
+    assert LQRPilot(linear_model(), DT, speeds=(0.0, 5.0)).cache_path is None
+
+    first = LQRPilot(linear_model(), DT, speeds=(0.0, 5.0), cache_dir=str(tmp_path))
+    assert not first.from_cache and len(list(tmp_path.iterdir())) == 1
+
+    monkeypatch.setattr(LQRPilot, "design", lambda self: pytest.fail("cached table was not used"))
+    second = LQRPilot(linear_model(), DT, speeds=(0.0, 5.0), cache_dir=str(tmp_path))
+    assert second.from_cache
+    np.testing.assert_array_equal(first.gains, second.gains)
+    assert linear_model(mass=1.2).fingerprint() != linear_model().fingerprint()
+
+
+def test_coefficients_are_read_from_the_motors():
+    rotors = linear_model().motors
+    motors = [DefaultMotor(m.iD, m.spin_direction, m.position, kf=2e-6, km=5e-8) for m in rotors]
+    m = LinearModel(RigidBody(1.0, np.diag([0.01, 0.01, 0.02])), motors)
+    np.testing.assert_array_equal(m.k_f, 2e-6)
+    np.testing.assert_array_equal(m.k_m, 5e-8)
+    np.testing.assert_allclose(m.mix[3], -0.025 * np.array([motor.spin_direction for motor in motors]))
+    with pytest.raises(ValueError):
+        LinearModel(RigidBody(1.0, np.eye(3)), rotors)
+
+
+def test_swarm_tracks_position_and_cruise_velocity():
+    m = linear_model()
+    pilot = LQRPilot(m, DT, speeds=(0.0, 2.0, 4.0), cache_dir=None)
+    setpoints = np.full((3, SETPOINT_SIZE), np.nan)
+    Setpoints(x=1.0, y=-1.0, z=2.0, yaw_angle=0.5).to_array(out=setpoints[0])
+    Setpoints(x=0.0, y=0.0, z=0.0).to_array(out=setpoints[1])
+    Setpoints(vx=0.0, vy=3.0, vz=0.0, yaw_angle=np.pi / 2).to_array(out=setpoints[2])
+    states = fly(pilot, m, hover_states(3), setpoints, 6.0, DT)
+
+    np.testing.assert_allclose(states[:2, STATE_LAYOUT["position"]], [[1.0, -1.0, 2.0], [0.0, 0.0, 0.0]], atol=0.05)
+    R = _get_body_to_inertial_batch(states[2:, STATE_LAYOUT["quaternion"]])
+    np.testing.assert_allclose(R[0] @ states[2, STATE_LAYOUT["velocity"]], [0.0, 3.0, 0.0], atol=0.05)
+
+    # The single-drone path gives the same command as the batch
+    single = LQRPilot(m, DT, speeds=(0.0, 2.0, 4.0), cache_dir=None)
+    thrust, torque = single.compute_control(StateVector.from_array(states[0]), Setpoints.from_array(setpoints[0]))
+    expected = pilot.compute_control_array(states[:1], setpoints[:1])[0]
+    np.testing.assert_allclose([thrust.vec[2, 0], *torque.vec[:, 0]], expected, rtol=1e-5, atol=1e-6)
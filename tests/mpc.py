@@ -0,0 +1,62 @@
+import numpy as np
+
+from quad_sim.bases.setpoints import SETPOINT_SIZE, Setpoints
+from quad_sim.bases.state import STATE_LAYOUT
+from quad_sim.control.mpc import MPCPilot
+from tests.helpers import fly, hover_states, linear_model
+
+DT = 0.005
+HOVER = 9.81 / 4
+
+
+def projected_gradient(pilot, g, iterations=20000):
+    U = np.zeros_like(g)
+    for _ in range(iterations):
+        U = np.clip(U - (U @ pilot.H + g) * pilot._step, pilot.lower, pilot.upper)
+    return U
+
+
+def test_constrained_solve_matches_reference():
+    pilot = MPCPilot(linear_model(), DT, thrust_max=1.5 * HOVER, horizon=10, tol=1e-9, max_iter=5000, n=3)
+    g = np.random.default_rng(0).normal(scale=50.0, size=(3, pilot.H.shape[0]))
+    U = pilot.solve(g)
+    assert pilot.iterations[-1] > 0
+    np.testing.assert_allclose(U, projected_gradient(pilot, g), atol=1e-4)
+    assert np.all(U >= pilot.lower - 1e-12) and np.all(U <= pilot.upper + 1e-12)
+
+
+def test_unconstrained_ticks_skip_the_iterative_solver():
+    pilot = MPCPilot(linear_model(), DT, thrust_max=10.0)
+    setpoints = np.full((1, SETPOINT_SIZE), np.nan)
+    Setpoints(x=0.01, y=0.0, z=0.0).to_array(out=setpoints[0])
+    pilot.compute_control_array(hover_states(1), setpoints)
+    assert pilot.iterations[-1] == 0 and pilot.stats()["count"] == 1
+
+
+def test_saturated_swarm_reaches_targets_within_rotor_limits():
+    m = linear_model()
+    pilot = MPCPilot(m, DT, thrust_max=1.6 * HOVER, thrust_min=0.3 * HOVER, n=2, history=5000)
+    setpoints = np.full((2, SETPOINT_SIZE), np.nan)
+    Setpoints(x=2.0, y=-1.0, z=1.5, yaw_angle=0.4).to_array(out=setpoints[0])
+    Setpoints(vx=1.0, vy=0.0, vz=0.0, z=0.0).to_array(out=setpoints[1])
+    states = fly(pilot, m, hover_states(2), setpoints, 6.0, DT)
+
+    np.testing.assert_allclose(states[0, STATE_LAYOUT["position"]], [2.0, -1.0, 1.5], atol=0.05)
+    assert abs(states[1, STATE_LAYOUT["velocity"]][0] - 1.0) < 0.05
+    thrusts = pilot.trim + pilot.solution[:, :4]
+    assert np.all(thrusts <= 1.6 * HOVER + 1e-9) and np.all(thrusts >= 0.3 * HOVER - 1e-9)
+    assert max(pilot.iterations) > 0 and pilot.stats()["mean"] < 0.01
+
+
+def test_warm_start_saves_iterations():
+    m = linear_model()
+    setpoints = np.full((1, SETPOINT_SIZE), np.nan)
+    Setpoints(x=3.0, y=0.0, z=0.0).to_array(out=setpoints[0])
+
+    warm = MPCPilot(m, DT, thrust_max=1.3 * HOVER)
+    fly(warm, m, hover_states(1), setpoints, 0.5, DT)
+
+    cold = MPCPilot(m, DT, thrust_max=1.3 * HOVER)
+    cold.solve = lambda g, rows=slice(None), solve=cold.solve: (cold.reset(), solve(g, rows))[1]
+    fly(cold, m, hover_states(1), setpoints, 0.5, DT)
+    assert warm.stats()["iterations"] < cold.stats()["iterations"]
@@ -0,0 +1,50 @@
+import numpy as np
+
+from quad_sim.bases.state import StateVector
+from quad_sim.environment.obstacles import ObstacleConstraint, ObstacleEffect, ObstacleWorld
+
+
+def sample_world():
+    world = ObstacleWorld()
+    world.add_box([0.0, 0.0, 0.0], [1.0, 1.0, 1.0])
+    world.add_cylinder((5.0, 0.0), 0.5, 0.0, 3.0)
+    world.add_mesh(np.array([[10.0, -1.0, 0.0], [12.0, -1.0, 0.0], [10.0, 1.0, 0.0]]), np.array([[0, 1, 2]]))
+    return world
+
+
+def test_query_primitives():
+    centers = np.array([[0.5, 0.5, 1.1], [0.5, 0.5, 0.5], [5.6, 0.0, 1.0], [10.5, 0.0, 0.1], [20.0, 20.0, 20.0]])
+    contacts = sample_world().query(centers, 0.2)
+    assert contacts.drone.tolist() == [0, 1, 2, 3]
+    assert np.allclose(contacts.depth, [0.1, 0.7, 0.1, 0.1])
+    assert np.allclose(contacts.normal, [[0, 0, 1], [-1, 0, 0], [1, 0, 0], [0, 0, 1]])
+
+
+def test_bvh_matches_brute_force():
+    rng = np.random.default_rng(0)
+    world = ObstacleWorld(leaf_size=2)
+    lo = rng.uniform(-50, 50, size=(500, 3))
+    hi = lo + rng.uniform(0.1, 2.0, size=(500, 3))
+    for a, b in zip(lo, hi):
+        world.add_box(a, b)
+    points = rng.uniform(-50, 50, size=(2000, 3))
+
+    contacts = world.query(points, 1.0)
+    gap = np.linalg.norm(np.clip(points[:, None], lo[None], hi[None]) - points[:, None], axis=-1)
+    i, j = np.nonzero(gap < 1.0)
+    assert set(zip(contacts.drone.tolist(), contacts.primitive.tolist())) == set(zip(i.tolist(), j.tolist()))
+
+
+def test_effect_and_constraint():
+    world = sample_world()
+    state = StateVector()
+    state.position.vec[:, 0] = [0.5, 0.5, 1.1]
+    state.velocity.vec[:, 0] = [0.0, 0.0, -1.0]
+
+    force, moment = ObstacleEffect(world, 0.2, stiffness=2000.0, damping=50.0).apply(state)
+    assert np.allclose(force.vec[:, 0], [0.0, 0.0, 250.0])
+    assert np.allclose(moment.vec, 0.0)
+
+    state = ObstacleConstraint(world, 0.2).enforce(state)
+    assert np.allclose(state.position.vec[:, 0], [0.5, 0.5, 1.2])
+    assert np.allclose(state.velocity.vec, 0.0)
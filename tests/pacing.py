@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from quad_sim.runtime.pacing import Pacer
+
+
+class FakeTime:
+    """Deterministic stand-in for perf_counter/sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_unpaced_runs_every_tick():
+    calls = []
+    stats = Pacer(0.002, math.inf).run(lambda: calls.append(1), 100)
+    assert len(calls) == 100
+    assert stats.budget == 0.0
+    assert stats.overruns == 0
+
+
+def test_real_time_pacing_has_no_drift():
+    t = FakeTime()
+    pacer = Pacer(0.002, 1.0, spin=0.0, clock=t.clock, sleep=t.sleep)
+
+    def step():
+        t.now += 0.0005  # work takes a quarter of the budget
+
+    stats = pacer.run(step, 500)
+    assert stats.overruns == 0
+    assert stats.wall_time == pytest.approx(1.0)
+    assert stats.latency_p99 == pytest.approx(0.0005)
+
+
+def test_overruns_and_resync():
+    t = FakeTime()
+    pacer = Pacer(0.002, 10.0, max_lag=0.01, spin=0.0, clock=t.clock, sleep=t.sleep)
+
+    def step():
+        t.now += 0.001  # five times the 0.2 ms budget
+
+    stats = pacer.run(step, 100)
+    assert stats.overruns == 100
+    assert stats.resyncs > 0
+    assert stats.max_lag <= 0.01 + 0.001
+
+
+def test_invalid_pacer_arguments():
+    with pytest.raises(ValueError):
+        Pacer(0.0)
+    with pytest.raises(ValueError):
+        Pacer(0.002, real_time_factor=0.0)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from exampleSetup.default.classes import (
+    DefaultAllocator, DefaultConstraints, DefaultController, DefaultDrone, DefaultDynamics,
+    DefaultEnvironment, DefaultIntegrator, DefaultMotor, DefaultPilot,
+)
+from quad_sim.bases.rigidbody import RigidBody
+from quad_sim.bases.state import STATE_SIZE, StateVector
+from quad_sim.interaction.proximity import SpatialHash, SwarmProximity
+from quad_sim.references.bodyFixed import BodyFixed
+
+
+def brute_force_pairs(points, radius):
+    d = np.linalg.norm(points[:, None] - points[None], axis=-1)
+    i, j = np.nonzero(np.triu(d < radius, 1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+def test_query_pairs_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-20, 20, size=(800, 3))
+    h = SpatialHash(cell_size=2.0)
+    h.build(points)
+    I, J, d = h.query_pairs(1.5)
+    assert set(zip(I.tolist(), J.tolist())) == brute_force_pairs(points, 1.5)
+    assert np.allclose(d, np.linalg.norm(points[I] - points[J], axis=1))
+
+
+def test_query_ball():
+    points = np.array([[0.0, 0.0, 0.0], [0.5, 0.0, 0.0], [3.0, 0.0, 0.0], [-0.9, -0.1, 0.0]])
+    h = SpatialHash(cell_size=1.0)
+    h.build(points)
+    assert sorted(h.query_ball([0.0, 0.0, 0.0], 1.0).tolist()) == [0, 1, 3]
+
+
+def test_radius_larger_than_cell_is_rejected():
+    h = SpatialHash(cell_size=1.0)
+    h.build(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        h.query_pairs(2.0)
+
+
+def test_tip_sphere_narrow_phase():
+    tips = np.array([[0.1, 0.0, 0.0], [-0.1, 0.0, 0.0]])
+    model = SwarmProximity(tips, tip_radius=0.02, neighbor_radius=5.0)
+
+    states = np.zeros((3, STATE_SIZE))
+    states[:, 6] = 1.0  # identity quaternions
+    states[1, 0] = 0.23  # tips 0.03 m apart -> overlapping spheres
+    states[2, 0] = 1.0  # neighbour, but no contact
+
+    model.update(["a", "b", "c"], states)
+    assert sorted(model.neighbors_of(0).tolist()) == [1, 2]
+    assert list(zip(model.contacts.i, model.contacts.j)) == [(0, 1)]
+    assert model.contacts.depth[0] == pytest.approx(0.01)
+
+
+def test_from_default_drone():
+    hubs = [(0.2, 0.0, 0.0), (-0.2, 0.0, 0.0), (0.0, 0.2, 0.0), (0.0, -0.2, 0.0)]
+    motors = [DefaultMotor(f"m{i}", 1 if i % 2 else -1, BodyFixed(*hub), propLength=0.1, nProps=2) for i, hub in enumerate(hubs)]
+    drone = DefaultDrone(
+        "a", StateVector(), DefaultPilot(), DefaultDynamics(RigidBody(1.0, np.eye(3)), motors), DefaultAllocator(),
+        DefaultController(), DefaultIntegrator(0.01), DefaultEnvironment(), DefaultConstraints(),
+    )
+    model = SwarmProximity.from_drone(drone, tip_radius=0.02, neighbor_radius=5.0)
+    assert model.tips.shape == (8, 3)
+    assert model.bound_radius == pytest.approx(0.32, rel=1e-6)
+
+    # Outermost tips of two drones side by side along x, 0.03 m apart
+    states = np.zeros((2, STATE_SIZE))
+    states[:, 6] = 1.0
+    states[1, 0] = 0.63
+    model.update(["a", "b"], states)
+    assert list(zip(model.contacts.i, model.contacts.j)) == [(0, 1)]
+    assert model.contacts.depth[0] == pytest.approx(0.01, abs=1e-6)
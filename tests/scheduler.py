@@ -0,0 +1,98 @@
+import pytest
+
+from quad_sim.runtime.clock import SimClock
+from quad_sim.runtime.scheduler import LoopRates, Scheduler
+
+# ---------------------------------------------------------------------------
+# SimClock
+# ---------------------------------------------------------------------------
+
+
+def test_clock_time_is_derived_from_ticks():
+    clock = SimClock(2000)
+    for _ in range(2000):
+        clock.advance()
+    assert clock.tick == 2000
+    assert clock.time == 1.0
+
+
+def test_clock_invalid_rate():
+    with pytest.raises(ValueError):
+        SimClock(0)
+    with pytest.raises(TypeError):
+        SimClock("fast")
+
+
+def test_clock_ticks_for():
+    clock = SimClock(2000)
+    assert clock.ticks_for(500) == 4
+    assert clock.ticks_for(50) == 40
+    with pytest.raises(ValueError):
+        clock.ticks_for(300)  # does not divide 2 kHz evenly
+    with pytest.raises(ValueError):
+        clock.ticks_for(4000)  # faster than the clock
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+
+def test_multi_rate_call_counts():
+    rates = LoopRates()
+    clock = SimClock(rates.physics)
+    scheduler = Scheduler(clock)
+    counts = {"physics": 0, "attitude": 0, "position": 0, "logging": 0}
+
+    def counter(name):
+        def _inc():
+            counts[name] += 1
+        return _inc
+
+    for name in counts:
+        scheduler.add(name, counter(name), getattr(rates, name))
+
+    for _ in range(2000):
+        scheduler.tick()
+
+    assert counts == {"physics": 2000, "attitude": 500, "position": 50, "logging": 100}
+    assert scheduler.hyperperiod == 40
+
+
+def test_priority_order_within_a_tick():
+    scheduler = Scheduler(SimClock(100))
+    order = []
+    scheduler.add("physics", lambda: order.append("physics"), 100, priority=2)
+    scheduler.add("position", lambda: order.append("position"), 10, priority=0)
+    scheduler.add("attitude", lambda: order.append("attitude"), 50, priority=1)
+
+    scheduler.tick()
+    assert order == ["position", "attitude", "physics"]
+
+    order.clear()
+    scheduler.tick()
+    assert order == ["physics"]
+
+
+def test_phase_offsets_slow_loop():
+    scheduler = Scheduler(SimClock(100))
+    ticks = []
+    scheduler.add("slow", lambda: ticks.append(scheduler.clock.tick), 25, phase=2)
+    for _ in range(12):
+        scheduler.tick()
+    assert ticks == [2, 6, 10]
+
+
+def test_duplicate_and_missing_tasks():
+    scheduler = Scheduler(SimClock(100))
+    scheduler.add("a", lambda: None, 10)
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: None, 10)
+    with pytest.raises(KeyError):
+        scheduler.remove("b")
+
+
+def test_loop_rates_validation():
+    with pytest.raises(ValueError):
+        LoopRates(physics=100, attitude=500)
+    assert LoopRates.uniform(100).logging == 100
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.sensors.models import Barometer, Gps, Imu, Magnetometer
+
+
+def rest_states(n):
+    states = np.zeros((n, STATE_SIZE))
+    states[:, STATE_LAYOUT["quaternion"]] = [1.0, 0.0, 0.0, 0.0]
+    return states
+
+
+def test_ideal_measurements():
+    states = rest_states(2)
+    # Second drone rolled by 90 degrees: body z points along world -y
+    states[1, STATE_LAYOUT["quaternion"]] = [np.cos(np.pi / 4), np.sin(np.pi / 4), 0.0, 0.0]
+    imu = Imu(n=2).ideal(states)
+    np.testing.assert_allclose(imu[0], [0, 0, 9.81, 0, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(imu[1, :3], [0, 9.81, 0], atol=1e-12)
+    mag = Magnetometer(n=2).ideal(states)
+    np.testing.assert_allclose(mag[1], [0.22, -0.42, 0.0], atol=1e-12)
+
+
+def test_noise_statistics_and_stream_independence():
+    baro = Barometer(rate=100.0, n=200, white=0.1, bias=0.0, bias_walk=0.0, quantization=0.0, seed=3)
+    states = rest_states(200)
+    samples = np.array([baro.measure_array(states, k / 100.0)[:, 0].copy() for k in range(500)])
+    assert samples.std() == pytest.approx(0.1, rel=0.02)
+
+    # Drone 5 sees the same noise whatever the swarm size
+    small = Barometer(rate=100.0, n=10, white=0.1, bias=0.0, bias_walk=0.0, quantization=0.0, seed=3)
+    np.testing.assert_array_equal([small.measure_array(states[:10], k / 100.0)[5, 0] for k in range(500)], samples[:, 5])
+
+    walk = Barometer(rate=100.0, n=500, white=0.0, bias=0.0, bias_walk=0.2, quantization=0.0, seed=1)
+    for k in range(400):
+        walk.measure_array(rest_states(500), k / 100.0)
+    assert walk.bias.std() == pytest.approx(0.2 * np.sqrt(4.0), rel=0.1)
+
+
+def test_rate_latency_and_quantization():
+    gps = Gps(rate=10.0, latency=0.2, white=0.0, bias_walk=0.0)
+    state = StateVector()
+    readings = []
+    for k in range(60):
+        state.position.vec[:, 0] = [k * 0.01, 0.0, 0.0]
+        readings.append((gps.measure(state, k * 0.01).copy(), gps.fresh))
+    fresh = [k for k, (_, f) in enumerate(readings) if f]
+    assert fresh == [0, 10, 20, 30, 40, 50]
+    assert np.isnan(readings[10][0]).all()
+    # Two samples of latency: at t = 0.4 the fix taken at t = 0.2 arrives, and is held until the next one
+    assert readings[40][0][0] == pytest.approx(0.2, abs=1e-6) and readings[45][0][0] == readings[40][0][0]
+
+    baro = Barometer(white=0.0, bias=0.0, bias_walk=0.0, quantization=0.25)
+    states = rest_states(1)
+    states[0, 2] = 1.1
+    assert baro.measure_array(states, 0.0)[0, 0] == 1.0
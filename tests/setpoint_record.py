@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from quad_sim.bases.constraint import SetpointConstraint
+from quad_sim.bases.drone import DroneBase
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT, SETPOINT_SIZE, SetpointRecord, Setpoints
+from tests.helpers import Constraints
+
+
+class Floor(SetpointConstraint):
+    def enforce(self, setpoints):
+        if setpoints.z is not None and setpoints.z < 0.0:
+            setpoints.z = 0.0
+        return setpoints
+
+
+def test_record_mirrors_setpoints():
+    record = SetpointRecord().load(Setpoints(x=1.0, yaw_rate=0.5, custom="a"))
+    assert record.x == 1.0 and record.y is None and record.extra == {"custom": "a"}
+    record.update(x=None, thrustz=12.0)
+    assert not record.is_set("x") and record.is_set("thrustz")
+    back = record.to_setpoints()
+    assert back.x is None and back.thrustz == 12.0 and back.yaw_rate == 0.5 and back.custom == "a"
+    np.testing.assert_array_equal(record.to_array(), back.to_array())
+
+    # Loading keeps the storage of the record and does not alias the source
+    values, extra = record.values, record.extra
+    other = SetpointRecord().update(z=1.0, other=3.0)
+    assert record.load(other).values is values and record.extra is extra
+    assert record.z == 1.0 and record.extra == {"other": 3.0} and record.extra is not other.extra
+    assert record.load(record).extra == {"other": 3.0}
+    with pytest.raises(ValueError):
+        SetpointRecord(np.zeros(3))
+
+
+def test_records_can_view_a_swarm_array():
+    swarm = np.full((3, SETPOINT_SIZE), np.nan)
+    records = [SetpointRecord(row) for row in swarm]
+    records[1].z = 2.0
+    assert swarm[1, SETPOINT_LAYOUT["z"]] == 2.0
+    records[1].clear()
+    assert np.isnan(swarm).all()
+
+
+def test_update_setpoints_reuses_the_record():
+    record = SetpointRecord()
+    drone = SimpleNamespace(target=record, constraints=Constraints([Floor()]))
+
+    drone.get_setpoints = lambda: drone.target.clear().update(x=1.0, z=-3.0)
+    DroneBase.update_setpoints(drone)
+    assert drone.target is record and record.x == 1.0 and record.z == 0.0
+
+    # Pydantic setpoints are copied into the same record
+    drone.get_setpoints = lambda: Setpoints(vz=1.0)
+    DroneBase.update_setpoints(drone)
+    assert drone.target is record and record.vz == 1.0 and record.x is None
+
+
+def test_custom_setpoints_as_attributes():
+    record = SetpointRecord().load(Setpoints(custom=1.0))
+    assert record.custom == 1.0
+
+    class Gimbal(SetpointConstraint):
+        def enforce(self, setpoints):
+            setpoints.gimbal_pitch = -0.5
+            setpoints.custom += 1.0
+            return setpoints
+
+    assert Constraints([Gimbal()]).enforce_setpoint_constraints(record) is record
+    assert record.extra == {"custom": 2.0, "gimbal_pitch": -0.5}
+    assert record.to_setpoints().gimbal_pitch == -0.5
+    with pytest.raises(AttributeError):
+        record.missing
+    record.clear()
+    assert not hasattr(record, "custom")
@@ -0,0 +1,69 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from quad_sim.bases.state import STATE_SIZE, StateVector
+from quad_sim.runtime.sharedstate import _OWNED, SharedStatePublisher, SharedStateReader
+
+
+@pytest.fixture
+def publisher():
+    pub = SharedStatePublisher(["drone_A", "drone_B"], slots=4)
+    yield pub
+    pub.unlink()
+
+
+def test_state_vector_pack_roundtrip():
+    arr = np.arange(STATE_SIZE, dtype=np.float64)
+    arr[6:10] = (1.0, 0.0, 0.0, 0.0)
+    assert np.allclose(StateVector.from_array(arr).to_array(), arr)
+
+
+def test_reader_sees_latest_frame(publisher):
+    reader = SharedStateReader(publisher.name)
+    assert reader.latest() is None
+    assert reader.drone_ids == ["drone_A", "drone_B"]
+
+    for tick in range(1, 4):
+        publisher.publish(tick, tick * 0.01, np.full((2, STATE_SIZE), float(tick)))
+
+    frame = reader.latest()
+    assert frame.tick == 3
+    assert np.all(frame.states == 3.0)
+    reader.close()
+
+
+def test_zero_copy_view_is_invalidated_when_slot_is_reused(publisher):
+    reader = SharedStateReader(publisher.name)
+    publisher.publish(1, 0.01, np.zeros((2, STATE_SIZE)))
+    frame = reader.latest()
+    assert reader.is_valid(frame)
+
+    for tick in range(2, 6):  # wraps the four slot ring once
+        publisher.publish(tick, tick * 0.01, np.ones((2, STATE_SIZE)))
+    assert not reader.is_valid(frame)
+
+    del frame
+    reader.close()
+
+
+def test_torn_slot_is_skipped(publisher):
+    reader = SharedStateReader(publisher.name)
+    publisher.publish(1, 0.01, np.zeros((2, STATE_SIZE)))
+    publisher.begin(2, 0.02)  # writer still inside the next slot
+    frame = reader.latest()
+    assert frame.tick == 1
+    publisher.commit()
+    assert reader.latest().tick == 2
+    del frame
+    reader.close()
+
+
+def test_long_drone_id_leaves_no_segment_behind():
+    name = f"quad_sim_test_{uuid.uuid4().hex[:8]}"
+    with pytest.raises(ValueError):
+        SharedStatePublisher(["drone_A", "x" * 100], name=name)
+    assert not _OWNED
+    with pytest.raises(FileNotFoundError):
+        SharedStateReader(name)
@@ -0,0 +1,155 @@
+import numpy as np
+
+from quad_sim.actuation.motors import MotorBank
+from quad_sim.bases.allocator import AllocatorBase
+from quad_sim.bases.configuration import BuildableConfig
+from quad_sim.bases.controller import ControllerBase
+from quad_sim.bases.drone import DroneBase
+from quad_sim.bases.dynamics import RigidBody
+from quad_sim.bases.integrator import IntegratorBase
+from quad_sim.bases.interaction import InteractionModel
+from quad_sim.bases.pilot import PilotBase
+from quad_sim.bases.setpoints import Setpoints
+from quad_sim.bases.sim import NCopterBase
+from quad_sim.bases.state import StateVector
+from quad_sim.references.bodyFixed import BodyFixed
+from quad_sim.runtime.scheduler import LoopRates
+from quad_sim.runtime.sharedstate import SharedStatePublisher, SharedStateReader
+from quad_sim.utils.decorators import topLevel
+from tests.helpers import Constraints, Dynamics, Environment, Rotor, frame
+
+
+class Hover(AllocatorBase):
+    def allocate(self, thrust_torques):
+        return [5000.0] * 4
+
+
+class Sticks(ControllerBase):
+    def connect(self):
+        return True
+
+    def calibrate(self, *args):
+        return True
+
+    def get_axis_value(self, channel_id):
+        return 0.0
+
+    def get_switch_value(self, switch_id):
+        return 0.0
+
+    def is_connected(self):
+        return True
+
+
+class Idle(PilotBase):
+    def compute_control(self, state, target):
+        return BodyFixed(0.0, 0.0, 0.0), BodyFixed(0.0, 0.0, 0.0)
+
+
+class Frozen(IntegratorBase):
+    """Keeps the rigid body still; only the rotor dynamics move."""
+
+    def integrate(self, acc, alpha, q_rate, state):
+        return state
+
+
+class Drone(DroneBase):
+    def get_setpoints(self):
+        return self.target.clear().update(z=1.0)
+
+
+@topLevel()
+class DroneConfig(BuildableConfig):
+    def __init__(self, iD, dt=0.01, dynamics=None):
+        super().__init__(Drone)
+        self.iD, self.dt, self.dynamics = iD, dt, dynamics
+
+    def construct(self):
+        dynamics = self.dynamics or Dynamics(RigidBody(1.0, np.eye(3)), [Rotor(f"m{i}", 1, BodyFixed(0.1, 0.0, 0.0)) for i in range(4)])
+        return Drone(self.iD, StateVector(), Idle(), dynamics, Hover(), Sticks(), Frozen(self.dt), Environment([]), Constraints([]))
+
+
+class Counter(InteractionModel):
+    def __init__(self):
+        self.calls = 0
+
+    def update(self, drone_ids, states):
+        self.calls += 1
+
+
+def test_detaching_publisher_keeps_interaction_running():
+    sim = NCopterBase([DroneConfig("a"), DroneConfig("b")], rates=LoopRates(100, 100, 100, 100))
+    publisher = SharedStatePublisher(list(sim.entities), slots=4)
+    try:
+        counter = Counter()
+        sim.attach_interaction(counter)
+        sim.attach_publisher(publisher, 100)
+        sim.run()
+        sim.detach_publisher()
+        for _ in range(3):
+            sim.run()
+        assert sim.interaction is counter and counter.calls == 4
+        reader = SharedStateReader(publisher.name)
+        assert reader.latest().frame == 0  # nothing published after detaching
+        reader.close()
+
+        sim.detach_interaction()
+        sim.run()
+        assert sim.interaction is None and counter.calls == 4
+    finally:
+        publisher.unlink()
+
+
+def test_swarm_actuators_advance_once_per_physics_tick():
+    motors = {iD: frame(4) for iD in "ab"}
+    bank = MotorBank(motors["a"], k_f=1e-7, k_m=2e-9, n=2, tau_up=0.05)
+    configs = [
+        DroneConfig(iD, dynamics=Dynamics(RigidBody(1.0, np.eye(3)), m, actuators=bank, row=row))
+        for row, (iD, m) in enumerate(motors.items())
+    ]
+    sim = NCopterBase(configs, rates=LoopRates(100, 100, 100, 100))
+
+    calls = []
+    advance = bank.advance
+    bank.advance = lambda dt, rows=slice(None): calls.append(rows) or advance(dt, rows)
+    lag = lambda ticks: 5000.0 * -np.expm1(-ticks * 0.01 / 0.05)
+
+    # Without the hook every integrator step advances its own row
+    sim.run()
+    assert calls == [slice(0, 1), slice(1, 2)]
+    np.testing.assert_allclose(bank.rpm, lag(1))
+
+    sim.attach_actuators(bank)
+    assert bank.batched and sim.actuators is bank
+    calls.clear()
+    for _ in range(3):
+        sim.run()
+    assert calls == [slice(None)] * 3
+    np.testing.assert_allclose(bank.rpm, lag(4))
+    # The motors see the speeds the last step started from
+    for m in motors.values():
+        np.testing.assert_allclose([r.rpm for r in m], lag(3))
+
+    sim.detach_actuators()
+    assert not bank.batched and sim.actuators is None
+
+
+def test_loops_run_at_their_own_rates():
+    rates = LoopRates(physics=500, attitude=250, position=50, logging=100)
+    sim = NCopterBase([DroneConfig("a", dt=0.002), DroneConfig("b", dt=0.002)], rates=rates)
+    assert sim.scheduler.hyperperiod == 10
+
+    calls = []
+    for drone in sim.entities.values():
+        for name in ("update_setpoints", "update_control", "update_physics"):
+            method = getattr(drone, name)
+            setattr(drone, name, lambda method=method, call=(drone.iD, name): calls.append(call) or method())
+
+    sim.run()
+    # Within a tick the slower loops feed the faster ones
+    assert [name for iD, name in calls if iD == "a"] == ["update_setpoints", "update_control", "update_physics"]
+
+    for _ in range(sim.scheduler.hyperperiod - 1):
+        sim.run()
+    for iD in "ab":
+        assert [calls.count((iD, name)) for name in ("update_setpoints", "update_control", "update_physics")] == [1, 5, 10]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from quad_sim.bases.setpoints import SETPOINT_LAYOUT
+from quad_sim.trajectory.generators import allocate_times, cubic_spline, minimum_snap, waypoint_path
+from quad_sim.trajectory.piecewise import Trajectory
+
+WAYPOINTS = np.array([
+    [0.0, 0.0, 1.0, 0.0],
+    [2.0, 1.0, 1.5, 1.0],
+    [3.0, -1.0, 2.0, 3.0],
+    [0.0, -2.0, 1.0, -2.5],
+])
+
+
+def test_minimum_snap_passes_waypoints_smoothly():
+    times = allocate_times(WAYPOINTS, speed=1.5)
+    traj = minimum_snap(WAYPOINTS, times)
+    assert traj.degree == 7
+
+    np.testing.assert_allclose(traj.evaluate(times)[:, :3], WAYPOINTS[:, :3], atol=1e-9)
+    # Yaw is unwrapped before fitting, so the last waypoint is reached the short way round
+    assert traj.evaluate(times[-1])[3] == pytest.approx(-2.5 + 2 * np.pi)
+    for d in range(1, 4):
+        np.testing.assert_allclose(traj.evaluate(times[[0, -1]], d), 0.0, atol=1e-9)
+    eps = 1e-7
+    for d in range(0, 7):
+        before, after = traj.evaluate(times[1:-1] - eps, d), traj.evaluate(times[1:-1] + eps, d)
+        np.testing.assert_allclose(before, after, atol=1e-3 * (1 + np.abs(before).max()))
+
+
+def test_batch_sampling_matches_per_segment_polynomials():
+    traj = cubic_spline(WAYPOINTS[:, :3], [0.0, 1.0, 2.5, 4.0])
+    t = np.linspace(-1.0, 5.0, 301)
+    values = traj.evaluate(t, 1)
+    for k, ti in enumerate(np.clip(t, 0.0, 4.0)):
+        s = min(np.searchsorted(traj.breaks, ti, side="right") - 1, 2)
+        poly = np.polynomial.polynomial.polyder(traj.tables[0][s], axis=0)
+        np.testing.assert_allclose(values[k], np.polynomial.polynomial.polyval(ti - traj.breaks[s], poly).T, atol=1e-9)
+    assert traj.evaluate(np.zeros((2, 5))).shape == (2, 5, 3)
+
+
+def test_waypoint_path_and_setpoints():
+    traj = waypoint_path(WAYPOINTS, [0.0, 1.0, 2.0, 4.0])
+    np.testing.assert_allclose(traj.evaluate(0.5, 1)[:3], WAYPOINTS[1, :3] - WAYPOINTS[0, :3])
+    assert np.all(traj.evaluate([0.2, 3.0], 2) == 0.0)
+
+    packed = traj.to_setpoints(np.array([0.5, 3.0]))
+    np.testing.assert_allclose(packed[0, [SETPOINT_LAYOUT[k] for k in ("x", "y", "z")]], [1.0, 0.5, 1.25])
+    assert packed[0, SETPOINT_LAYOUT["yaw_angle"]] == pytest.approx(0.5)
+    assert np.isnan(packed[:, SETPOINT_LAYOUT["thrustz"]]).all()
+    assert traj.setpoints(0.5).vx == pytest.approx(2.0)
+
+    with pytest.raises(ValueError):
+        Trajectory([0.0, 1.0, 1.0], np.zeros((2, 2, 3)))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from quad_sim.bases.state import StateVector
+from quad_sim.environment.turbulence import MODELS, TurbulenceBank, TurbulenceSpec, _BlockFilter, _shaping_filter, _tustin
+
+SPEC = TurbulenceSpec(sigma=(1.0, 1.0, 0.5), length=(30.0, 30.0, 10.0))
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("longitudinal", [True, False])
+def test_block_filter_matches_recursion(model, longitudinal):
+    b, a = _tustin(*_shaping_filter(model, 1.0, 30.0, 5.0, longitudinal), 0.01)
+    f = _BlockFilter(b, a, 64)
+    x = np.random.default_rng(1).standard_normal((256, 2))
+    state = np.zeros((len(a) - 1, 2))
+    y = np.concatenate([f.run(x[i:i + 64], state) for i in range(0, 256, 64)])
+
+    expected = np.zeros_like(x)
+    for n in range(len(x)):
+        expected[n] = sum(b[k] * x[n - k] for k in range(len(b)) if n >= k)
+        expected[n] -= sum(a[k] * expected[n - k] for k in range(1, len(a)) if n >= k)
+    assert np.allclose(y, expected, atol=1e-8)
+
+
+def test_gust_intensity():
+    bank = TurbulenceBank(SPEC, dt=0.01, streams=50, seed=3)
+    gusts = np.array([bank.sample(k) for k in range(20000)])
+    assert np.allclose(gusts[2000:].std(axis=(0, 1)), SPEC.sigma, rtol=0.1)
+
+
+def test_streams_are_reproducible_and_independent():
+    small = TurbulenceBank(SPEC, dt=0.01, streams=2, seed=7, block=128)
+    large = TurbulenceBank(SPEC, dt=0.01, streams=5, seed=7, block=128)
+    assert np.allclose(small.sample(300)[1], large.sample(300)[1])
+    assert not np.allclose(large.sample(300)[0], large.sample(300)[1])
+    with pytest.raises(ValueError):
+        large.sample(0)
+
+
+def test_effect_returns_gust_increment():
+    bank = TurbulenceBank(SPEC, dt=0.01, streams=1, seed=0)
+    effect = bank.effect(0, drag=(1.0, 1.0, 1.0))
+    effect.advance(0.5)
+    force, _ = effect.apply(StateVector())
+    assert np.allclose(force.vec[:, 0], effect.gust * np.abs(effect.gust), atol=1e-6)
@@ -0,0 +1,117 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import h5py
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from exampleSetup.default.classes import DefaultMotor
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE
+from quad_sim.references.bodyFixed import BodyFixed
+from quad_sim.viz.animation import Frame, FrameSource, LogFrameSource
+from quad_sim.viz.matplotlib_3d import DroneGeometry, SwarmAnimator
+from tests.helpers import ARMS, write_log
+
+
+class Frames(FrameSource):
+    def __init__(self, frames, n):
+        self._frames = frames
+        self._ids = [f"d{i}" for i in range(n)]
+
+    @property
+    def drone_ids(self):
+        return self._ids
+
+    def frames(self):
+        yield from self._frames
+
+
+def frame(positions, time=0.0):
+    states = np.zeros((len(positions), STATE_SIZE))
+    states[:, STATE_LAYOUT["position"]] = positions
+    states[:, STATE_LAYOUT["quaternion"]] = (1.0, 0.0, 0.0, 0.0)
+    return Frame(time=time, states=states)
+
+
+def test_log_source_decimates_and_reads_in_blocks(tmp_path, monkeypatch):
+    log = write_log(tmp_path / "log.h5", [50, 47])
+    source = LogFrameSource(log, log_rate=100.0, display_rate=25.0, block=3, start=2, stop=9)
+    assert source.stride == 4 and source.length == 47 and source.frame_count == 7
+
+    reads = []
+    getitem = h5py.Dataset.__getitem__
+
+    def recording(self, key):
+        out = getitem(self, key)
+        reads.append(len(out))
+        return out
+
+    monkeypatch.setattr(h5py.Dataset, "__getitem__", recording)
+    frames = list(source.frames())
+
+    samples = np.arange(8, 36, 4)
+    np.testing.assert_array_equal([f.positions[0, 0] for f in frames], samples)
+    np.testing.assert_array_equal([f.time for f in frames], samples / 100.0)
+    np.testing.assert_array_equal(frames[0].positions[:, 1], [0.0, 1.0])
+    # Blocks of 3 frames: 3 + 3 + 1, one read per drone and field each
+    assert reads == [3] * 4 + [3] * 4 + [1] * 4
+
+    # The range is clamped to the log, and a subset of drones keeps its order
+    tail = LogFrameSource(log, log_rate=100.0, display_rate=25.0, drones=["d1"], start=10)
+    assert tail.drone_ids == ["d1"] and tail.frame_count == 2
+    assert [f.positions[0, 0] for f in tail.frames()] == [40.0, 44.0]
+    with pytest.raises(KeyError):
+        LogFrameSource(log, log_rate=100.0, drones=["d7"])
+
+
+def test_blit_update_writes_into_the_existing_artists():
+    tips = np.array([[0.3, 0.0, 0.0], [-0.3, 0.0, 0.0]])
+    positions = np.array([[0.0, 0.0, 1.0], [2.0, 1.0, 1.0], [4.0, -1.0, 2.0]])
+    source = Frames([frame(positions, 0.0), frame(positions + 1.0, 0.5)], n=3)
+    animator = SwarmAnimator(source, DroneGeometry(arms=ARMS, tips=tips))
+    ax, canvas = animator.ax, animator.fig.canvas
+    artists = animator.artists
+    children = len(ax.get_children())
+
+    frames = list(source.frames())
+    assert animator.update(frames[0]) == artists
+    # The first frame fixes the limits, which stay put afterwards
+    limits = ax.get_xlim()
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(animator.fig.bbox)
+    canvas.restore_region(background)
+    changed = animator.update(frames[1])
+    for artist in changed:
+        ax.draw_artist(artist)
+    canvas.blit(animator.fig.bbox)
+
+    assert all(a is b for a, b in zip(changed, artists)) and len(ax.get_children()) == children
+    assert ax.get_xlim() == limits
+    segments = np.asarray(animator.arms._segments3d)
+    np.testing.assert_allclose(segments[:, 0], np.repeat(positions + 1.0, len(ARMS), axis=0))
+    np.testing.assert_allclose(segments[:, 1], ((positions + 1.0)[:, None, :] + ARMS[None]).reshape(-1, 3))
+    np.testing.assert_allclose(np.column_stack(animator.props._offsets3d), ((positions + 1.0)[:, None, :] + tips[None]).reshape(-1, 3))
+    assert animator.label.get_text() == "t = 0.50 s"
+
+    # An empty pull keeps the picture
+    assert animator.update(None) == artists
+    np.testing.assert_array_equal(np.asarray(animator.arms._segments3d), segments)
+    plt.close(animator.fig)
+
+
+def test_geometry_from_default_motors():
+    motors = [DefaultMotor(f"m{i}", 1 if i % 2 else -1, BodyFixed(*arm), propLength=0.1, nProps=2) for i, arm in enumerate(ARMS)]
+    geometry = DroneGeometry.from_motors(motors)
+    np.testing.assert_allclose(geometry.arms, ARMS)
+    # Two tips per motor, one propeller length either side of the hub
+    tips = geometry.tips.reshape(4, 2, 3)
+    np.testing.assert_allclose(tips.mean(axis=1), ARMS, atol=1e-7)
+    np.testing.assert_allclose(np.linalg.norm(tips - ARMS[:, None], axis=2), 0.1, rtol=1e-6)
+
+    animator = SwarmAnimator(Frames([frame(np.zeros((2, 3)))], n=2), geometry)
+    animator.update(frame(np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 1.0]])))
+    assert np.column_stack(animator.props._offsets3d).shape == (16, 3)
+    plt.close(animator.fig)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from quad_sim.bases.state import STATE_LAYOUT, STATE_SIZE, StateVector
+from quad_sim.environment.aero import DragEffect
+from quad_sim.environment.wind import GriddedWindEffect, WindGrid
+
+
+def linear_field(shape, spacing, dt):
+    t, x, y, z = np.meshgrid(*(np.arange(n) for n in shape), indexing="ij")
+    wind = np.stack([2.0 * x * spacing + t * dt, -y * spacing, 0.5 * z * spacing + 3.0], axis=-1)
+    return wind.astype(np.float32)
+
+
+def exact(points, time):
+    return np.stack([2.0 * points[:, 0] + time, -points[:, 1], 0.5 * points[:, 2] + 3.0], axis=-1)
+
+
+def test_interpolation_is_exact_for_linear_fields(tmp_path):
+    path = str(tmp_path / "wind.npy")
+    WindGrid.write(path, linear_field((5, 40, 30, 20), 0.5, 0.1), origin=(0, 0, 0), spacing=(0.5, 0.5, 0.5), dt=0.1)
+    grid = WindGrid.open(path, tile=(2, 8), max_tiles=4)
+    assert isinstance(grid.data, np.memmap)
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform([0, 0, 0], [19.5, 14.5, 9.5], size=(500, 3))
+    assert np.allclose(grid.sample(points, 0.23), exact(points, 0.23), atol=1e-4)
+    assert len(grid._cache) <= 4
+
+    # Outside the domain the field is clamped to the boundary
+    assert np.allclose(grid.sample(np.array([[-5.0, 0.0, 0.0]]), 10.0), exact(np.zeros((1, 3)), 0.4), atol=1e-4)
+
+
+def test_tile_cache_reuse():
+    grid = WindGrid(linear_field((2, 10, 10, 10), 1.0, 1.0), (0, 0, 0), (1, 1, 1), dt=1.0, tile=(1, 4))
+    points = np.array([[1.0, 1.0, 1.0], [1.5, 1.5, 1.5]])
+    grid.sample(points, 0.0)
+    grid.sample(points, 0.5)
+    assert (grid.misses, grid.hits) == (1, 1)
+
+
+def test_effect_returns_the_wind_increment_over_still_air():
+    wind = np.zeros((1, 2, 2, 2, 3), dtype=np.float32)
+    wind[..., 0] = 4.0
+    effect = GriddedWindEffect(WindGrid(wind, (0, 0, 0), (1, 1, 1), dt=1.0), drag=(0.1, 0.1, 0.1))
+    state = StateVector()
+    state.velocity.vec[:, 0] = [1.0, 0.0, 2.0]
+    effect.advance(0.5)
+    force, _ = effect.apply(state)
+    # Relative air (3, 0, -2) minus still air (-1, 0, -2)
+    assert np.allclose(force.vec[:, 0], [1.0, 0.0, 0.0])
+
+    # Combined with still-air drag the total is the drag of the relative air, counted once
+    states = np.zeros((2, STATE_SIZE))
+    states[:, STATE_LAYOUT["quaternion"]] = (1.0, 0.0, 0.0, 0.0)
+    states[:, STATE_LAYOUT["velocity"]] = [[1.0, 0.0, 2.0], [0.0, 0.0, 0.0]]
+    total = effect.forces(states) + DragEffect(quadratic=(0.1, 0.1, 0.1)).forces(states)
+    assert np.allclose(total, [[0.9, 0.0, -0.4], [1.6, 0.0, 0.0]])
+
+    # In calm air the field adds nothing
+    calm = GriddedWindEffect(WindGrid(np.zeros_like(wind), (0, 0, 0), (1, 1, 1), dt=1.0), drag=(0.1, 0.1, 0.1))
+    assert np.allclose(calm.forces(states), 0.0)